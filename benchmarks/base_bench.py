@@ -0,0 +1,163 @@
+# benchmarks/base_bench.py
+
+"""
+Code file for shared benchmark helpers. All benchmark scripts should use
+these helpers to build synthetic trees and configs, so the numbers they
+print stay comparable between runs.
+"""
+
+# Default libs
+import argparse, os, tempfile, time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+# Deps from this project
+from gitree.objects.app_context import AppContext
+from gitree.objects.config import Config
+
+
+def build_tree(root: Path, depth: int, dirs_per_dir: int, files_per_dir: int) -> int:
+    """
+    Build a synthetic directory tree under root.
+
+    Args:
+        root (Path): Existing directory to build the tree in
+        depth (int): Number of directory levels below root
+        dirs_per_dir (int): Sub-directories created in every directory
+        files_per_dir (int): Files created in every directory
+
+    Returns:
+        int: The number of entries (files and dirs) created
+    """
+
+    created = 0
+    for i in range(files_per_dir):
+        (root / f"file_{i}.txt").write_text("x")
+        created += 1
+
+    if depth == 0:
+        return created
+
+    for i in range(dirs_per_dir):
+        sub = root / f"dir_{i}"
+        sub.mkdir()
+        created += 1 + build_tree(sub, depth - 1, dirs_per_dir, files_per_dir)
+
+    return created
+
+
+@contextmanager
+def temp_tree(depth: int, dirs_per_dir: int, files_per_dir: int) -> Iterator[tuple[Path, int]]:
+    """
+    Build a synthetic tree in a temporary directory and chdir into it, since
+    the tool resolves the paths in the config against the working directory.
+
+    Yields:
+        tuple[Path, int]: The tree root and the number of entries in it
+    """
+
+    old_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp).resolve()
+        entries = build_tree(root, depth, dirs_per_dir, files_per_dir)
+        os.chdir(root)
+        try:
+            yield root, entries
+        finally:
+            os.chdir(old_cwd)
+
+
+def make_config(ctx: AppContext, **overrides: Any) -> Config:
+    """
+    Build a Config object the same way ParsingService does, using the given
+    overrides as the CLI values. User config is disabled.
+    """
+
+    cli = {"paths": ["."], "no_config": True}
+    cli.update(overrides)
+    return Config(ctx, argparse.Namespace(**cli))
+
+
+def timed(fn: Callable[[], Any], repeat: int = 3) -> tuple[float, Any]:
+    """
+    Run fn a few times and return the best wall time in ms with the last result.
+    """
+
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best, result
+
+
+class SyscallCounter:
+    """
+    Counting shim around the os functions the tool uses to hit the disk.
+
+    NOTE: this counts calls made through the os module, which is what
+    pathlib and os.path use. Stats done internally by os.DirEntry are not
+    visible here, but those only happen on filesystems that do not report
+    the file type while listing.
+    """
+
+    FUNCTIONS = ("stat", "lstat", "scandir", "listdir", "readlink")
+
+
+    def __init__(self) -> None:
+        self.counts: dict[str, int] = {name: 0 for name in self.FUNCTIONS}
+        self._originals: dict[str, Callable[..., Any]] = {}
+
+
+    def __enter__(self) -> "SyscallCounter":
+        for name in self.FUNCTIONS:
+            original = getattr(os, name)
+            self._originals[name] = original
+            setattr(os, name, self._wrap(name, original))
+        return self
+
+
+    def __exit__(self, *exc: Any) -> None:
+        for name, original in self._originals.items():
+            setattr(os, name, original)
+
+
+    def _wrap(self, name: str, original: Callable[..., Any]) -> Callable[..., Any]:
+        def counted(*args: Any, **kwargs: Any) -> Any:
+            self.counts[name] += 1
+            return original(*args, **kwargs)
+        return counted
+
+
+    @property
+    def stats(self) -> int:
+        return self.counts["stat"] + self.counts["lstat"]
+
+
+class ListingLatency:
+    """
+    Local stand-in for a high-latency filesystem (network mounts, FUSE, cold
+    caches). Every os.scandir call sleeps for the given time before listing.
+    """
+
+    def __init__(self, latency_ms: float) -> None:
+        self.latency = latency_ms / 1000
+        self._original: Callable[..., Any] | None = None
+
+
+    def __enter__(self) -> "ListingLatency":
+        self._original = original = os.scandir
+        latency = self.latency
+
+        def slow_scandir(*args: Any, **kwargs: Any) -> Any:
+            time.sleep(latency)
+            return original(*args, **kwargs)
+
+        os.scandir = slow_scandir
+        return self
+
+
+    def __exit__(self, *exc: Any) -> None:
+        os.scandir = self._original
@@ -0,0 +1,95 @@
+# benchmarks/bench_gitignore.py
+
+"""
+Benchmark for the .gitignore scope stack of GitIgnoreMatcher.
+
+Builds trees with more and more sibling packages, each with its own .gitignore,
+and reports how many .gitignore scopes every lookup has to scan and the time per
+entry. With the scope stack both stay flat as the number of packages grows. The
+"unscoped" rows disable popping, which is how the matcher behaved before, to
+show the difference.
+
+Run from the repo root with: python -m benchmarks.bench_gitignore [packages ...]
+"""
+
+# Default libs
+import os, sys, time, tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+# Deps from this project
+from benchmarks.base_bench import make_config, timed
+from gitree.objects.app_context import AppContext
+from gitree.services.items_selection_service import ItemsSelectionService
+from gitree.utilities.gitignore_utility import GitIgnoreMatcher
+
+
+GITIGNORE = "*.log\nbuild/\n__pycache__/\n!keep.log\n"
+
+
+def build_packages(root: Path, packages: int) -> int:
+    """
+    Create sibling packages, each with a .gitignore, sources and ignored files.
+    Returns the number of entries created.
+    """
+    entries = 0
+    for i in range(packages):
+        pkg = root / f"pkg{i:04d}"
+        (pkg / "src").mkdir(parents=True)
+        (pkg / "build").mkdir()
+        (pkg / ".gitignore").write_text(GITIGNORE)
+        for name in ("a.py", "b.py", "debug.log", "keep.log"):
+            (pkg / "src" / name).write_text("x")
+        (pkg / "build" / "out.o").write_text("x")
+        entries += 10
+    return entries
+
+
+@contextmanager
+def scan_counter():
+    """
+    Count the lookups and the .gitignore scopes active during each of them.
+    """
+    stats = {"lookups": 0, "scopes": 0}
+    original = GitIgnoreMatcher.excluded
+
+    def excluded(self, real_path, is_dir):
+        stats["lookups"] += 1
+        stats["scopes"] += len(self)
+        return original(self, real_path, is_dir)
+
+    with mock.patch.object(GitIgnoreMatcher, "excluded", excluded):
+        yield stats
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [50, 100, 200, 400]
+    ctx = AppContext()
+    cwd = os.getcwd()
+
+    print(f"{'packages':>8} {'mode':>9} {'scopes/lookup':>14} {'us/entry':>9}")
+    for packages in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            entries = build_packages(Path(tmp), packages)
+            os.chdir(tmp)
+            try:
+                config = make_config(ctx, no_max_entries=True, no_max_items=True)
+                run = lambda: ItemsSelectionService.resolve_items(ctx, config, time.time())
+
+                for mode in ("scoped", "unscoped"):
+                    pop = GitIgnoreMatcher.pop if mode == "scoped" else lambda self: None
+                    with mock.patch.object(GitIgnoreMatcher, "pop", pop):
+                        with scan_counter() as stats:
+                            run()
+                        elapsed_ms, _ = timed(run)
+
+                    per_lookup = stats["scopes"] / max(stats["lookups"], 1)
+                    per_entry = elapsed_ms * 1000 / entries
+                    print(f"{packages:>8} {mode:>9} {per_lookup:>14.2f} {per_entry:>9.1f}")
+            finally:
+                os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# benchmarks/bench_memory.py
+
+"""
+Benchmark for the memory used by the resolved tree.
+
+Builds the same synthetic tree in memory, once as the nested
+{"self": Path, "children": [...]} dicts the services used to get, as
+TreeNode/DirNode objects and as a FlatTree, and reports the memory each of
+them holds.
+No files are created, so any size can be measured.
+
+Run from the repo root with: python -m benchmarks.bench_memory [entries]
+"""
+
+# Default libs
+import sys, time, tracemalloc
+from pathlib import Path
+
+# Deps from this project
+from gitree.objects.flat_tree import FlatTree
+from gitree.objects.tree_node import TreeNode, DirNode, FLAG_DIR
+
+
+ROOT = "/home/user/projects/some-project"
+FILES_PER_DIR = 20
+DIRS_PER_DIR = 5
+
+
+def build_dicts(entries: int) -> dict:
+    """
+    Build a tree of about the given number of entries as nested dicts of Paths.
+    """
+    root = {"self": Path(ROOT), "children": []}
+    queue, count = [root], 1
+    while queue and count < entries:
+        node = queue.pop(0)
+        for i in range(FILES_PER_DIR):
+            node["children"].append(node["self"] / f"module_{i}.py")
+        for i in range(DIRS_PER_DIR):
+            child = {"self": node["self"] / f"package_{i}", "children": []}
+            node["children"].append(child)
+            queue.append(child)
+        count += FILES_PER_DIR + DIRS_PER_DIR
+    return root
+
+
+def build_nodes(entries: int) -> DirNode:
+    """
+    Build the same tree as build_dicts with TreeNode/DirNode objects.
+    """
+    root = DirNode(ROOT, None)
+    queue, count = [root], 1
+    while queue and count < entries:
+        node = queue.pop(0)
+        for i in range(FILES_PER_DIR):
+            node.children.append(TreeNode(f"module_{i}.py", node))
+        for i in range(DIRS_PER_DIR):
+            child = DirNode(f"package_{i}", node)
+            node.children.append(child)
+            queue.append(child)
+        count += FILES_PER_DIR + DIRS_PER_DIR
+    return root
+
+
+def build_flat(entries: int) -> FlatTree:
+    """
+    Build a tree of the same shape as build_dicts into a FlatTree. The entries
+    are added in pre-order, like the walk does, so the tree is cut short depth
+    first instead of breadth first.
+    """
+    tree = FlatTree()
+    stack, count = [(tree.add(ROOT, -1, FLAG_DIR), 0)], 1
+    while stack:
+        index, next_dir = stack.pop()
+        if next_dir == 0:
+            for i in range(FILES_PER_DIR):
+                tree.add(f"module_{i}.py", index, 0)
+            count += FILES_PER_DIR
+        if next_dir == DIRS_PER_DIR or count >= entries:
+            tree.close(index)
+            continue
+        stack.append((index, next_dir + 1))
+        stack.append((tree.add(f"package_{next_dir}", index, FLAG_DIR), 0))
+        count += 1
+    while stack:
+        tree.close(stack.pop()[0])
+    return tree.finish()
+
+
+def measure(build, entries: int) -> tuple[float, float]:
+    """
+    Returns the memory held by the built tree in MB, and the time to build it in ms.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    tree = build(entries)
+    elapsed = (time.perf_counter() - start) * 1000
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tree
+    return current / 1024 / 1024, elapsed
+
+
+def main() -> None:
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print(f"entries: {entries}")
+    results = {}
+    for name, build in (("dict+Path", build_dicts), ("TreeNode", build_nodes),
+        ("FlatTree", build_flat)):
+        results[name], elapsed = measure(build, entries)
+        print(f"{name:>10}: {results[name]:8.1f} MB | {elapsed:8.1f} ms to build")
+
+    for name in ("TreeNode", "FlatTree"):
+        print(f"{name:>10}: {results['dict+Path'] / results[name]:.1f}x less memory than dict+Path")
+
+
+if __name__ == "__main__":
+    main()
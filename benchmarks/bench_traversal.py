@@ -0,0 +1,50 @@
+# benchmarks/bench_traversal.py
+
+"""
+Benchmark for the traversal done by ItemsSelectionService.
+
+Counts the stat calls made while selecting items from a synthetic tree.
+The walk should stay at or below one stat per entry; anything above that
+means a per-entry is_dir()/is_file()/resolve() call crept back in.
+
+Run from the repo root with: python -m benchmarks.bench_traversal [depth] [dirs] [files]
+"""
+
+# Default libs
+import sys, time
+
+# Deps from this project
+from benchmarks.base_bench import SyscallCounter, make_config, temp_tree, timed
+from gitree.objects.app_context import AppContext
+from gitree.services.items_selection_service import ItemsSelectionService
+
+
+def main() -> None:
+    depth, dirs_per_dir, files_per_dir = (int(v) for v in (sys.argv[1:] or [4, 6, 12]))
+
+    with temp_tree(depth, dirs_per_dir, files_per_dir) as (root, entries):
+        ctx = AppContext()
+        config = make_config(ctx, no_max_entries=True, no_max_items=True,
+            max_depth=depth + 1, gitignore_depth=depth + 1)
+
+        def run():
+            return ItemsSelectionService.resolve_items(ctx, config, time.time())
+
+        with SyscallCounter() as counter:
+            run()
+
+        elapsed, _ = timed(run)
+
+    print(f"entries:          {entries}")
+    print(f"best time:        {elapsed:.1f} ms")
+    print(f"scandir calls:    {counter.counts['scandir']}")
+    print(f"stat/lstat calls: {counter.stats}")
+    print(f"stats per entry:  {counter.stats / entries:.3f}")
+
+    if counter.stats > entries:
+        print("REGRESSION: more than one stat per entry")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,3 +9,27 @@ SPACE  = "   "
 EMPTY_DIR_EMOJI = "📁"
 NORMAL_DIR_EMOJI = "📂"
 FILE_EMOJI = "📄"
+
+# tree walk events
+ENTER_DIR = "enter"
+FILE_ITEM = "file"
+LEAVE_DIR = "leave"
+
+# listing cache
+LISTING_CACHE_MAX_ENTRIES = 1_000_000
+
+# asyncio listing backend, dirs listed at the same time if --jobs is not given
+ASYNC_LISTING_JOBS = 16
+
+# output buffer, bytes held in memory before they are written out or spilled to disk
+OUTPUT_HIGH_WATER = 1 << 20
+
+# export, files read at the same time if --jobs is not given, and the most bytes
+# the reads in flight may hold (every read counts as the --max-file-size cap)
+EXPORT_READ_JOBS = 8
+EXPORT_READ_BUDGET = 64 << 20
+
+# export, files of this many bytes or more are memory-mapped instead of read,
+# and the text of a file is decoded this many bytes at a time
+MMAP_READ_THRESHOLD = 256 << 10
+CONTENT_DECODE_CHUNK = 1 << 20
@@ -21,13 +21,16 @@ from .services.copy_service import CopyService
 # from .services.zipping_service import ZippingService
 from .objects.app_context import AppContext
 from .objects.config import Config
-from .utilities.logging_utility import Logger
+from .utilities.logging_utility import Logger, OutputBuffer
 from .services.interactive_selection_service import InteractiveSelectionService
 
 
-def flush_buffers(ctx: AppContext, config: Config):
+def flush_buffers(ctx: AppContext, config: Config, streamed: bool = False):
     """ 
     Handle flushing the buffers. 
+
+    Args:
+        streamed (bool): Whether the output was already streamed to the terminal
     """
 
     # print the export only if not in no_printing and buffer not empty
@@ -36,7 +39,7 @@ def flush_buffers(ctx: AppContext, config: Config):
 
     # print the log if verbose mode
     if config.verbose:
-        if not config.no_printing and not ctx.output_buffer.empty(): 
+        if not config.no_printing and (streamed or not ctx.output_buffer.empty()): 
             print()
         print("LOG:")
         ctx.logger.flush()
@@ -63,14 +66,38 @@ def main() -> None:
         f"Left ParsingService at: {round((time.time()-start_time)*1000, 2)} ms")
 
 
+    # The drawn output is only read back for --copy and --export,
+    # else it is written straight through to stdout as it is drawn
+    if not (config.copy or config.export or config.no_printing):
+        ctx.output_buffer = OutputBuffer(replay=False)
+
+
     # if general options used, they are executed here
     # Handles for --version, --config-user, --no-config
     GeneralOptionsService.handle_args(ctx, config)
 
 
+    # If the tree is only printed, stream it while the items are being selected
+    if DrawingService.can_stream(config):
+        DrawingService.stream(ctx, config, 
+            ItemsSelectionService.iter_items(ctx, config, start_time))
+        ctx.logger.log(Logger.INFO, 
+            f"Left streaming ItemsSelectionService and DrawingService at: "
+            f"{round((time.time()-start_time)*1000, 2)} ms")
+
+        ctx.logger.log(Logger.INFO, 
+            f"Total time for this run: {round((time.time()-start_time)*1000, 2)} ms")
+        flush_buffers(ctx, config, streamed=True)
+        return
+
+
     # This service returns all the items to include resolved in a dict
     # Hover over ItemsSelectionService to check the format which it returns
-    resolved_root = ItemsSelectionService.resolve_items(ctx, config, start_time)
+    # NOTE: only the interactive selection edits the tree, else the flat one is used
+    if config.interactive:
+        resolved_root = ItemsSelectionService.resolve_items(ctx, config, start_time)
+    else:
+        resolved_root = ItemsSelectionService.resolve_flat_items(ctx, config, start_time)
     ctx.logger.log(Logger.INFO, 
         f"Left ItemsSelectionService at: {round((time.time()-start_time)*1000, 2)} ms")
 
@@ -100,11 +100,19 @@ class Config:
 
             # Listing options
             "format": "tree",
+            "compact": False,
             "max_items": 20,
             "max_entries": 40,
             "max_depth": 5,
+            "jobs": None,       # Not given, listing and export each have a default
+            "backend": "scandir",
+            "cache": False,
+            "source": "disk",
+            "untracked": False,
             "gitignore_depth": 5,
             "hidden_items": False,
+            "follow_symlinks": False,
+            "one_file_system": False,
             "exclude": [],
             "exclude_depth": 5,
             "include": [],
@@ -124,6 +132,7 @@ class Config:
             "no_files": False,
             "no_max_items": False,
             "no_max_entries": False,
+            "no_cache": False,
 
             # Inner tool control (not to be given to the user)
             "no_printing": False  
@@ -138,6 +147,23 @@ class Config:
         return path
 
 
+    @staticmethod
+    def _get_user_cache_dir() -> Path:
+        """
+        Return the per-user dir of the gitree caches, outside of the working tree
+        so a checkout can never provide them
+        """
+
+        if platform.system() == "Windows":
+            base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+        else:
+            base = os.environ.get("XDG_CACHE_HOME") or ""
+            if not os.path.isabs(base):
+                base = Path.home() / ".cache"
+
+        return Path(base, "gitree")
+
+
     @staticmethod
     def create_default_config(ctx: AppContext) -> None:
         """
@@ -0,0 +1,54 @@
+# gitree/objects/entry_budget.py
+
+"""
+Code file for housing EntryBudget class.
+"""
+
+
+class EntryBudget:
+    """
+    The --max-entries limit, shared by the whole items selection walk.
+
+    - Every entry added to the output takes one from the budget. Once it is
+      exhausted the walk stops: no more dirs are listed and no more .gitignore
+      files are loaded, however big the rest of the tree is.
+    """
+
+    __slots__ = ("limit", "used")
+
+    def __init__(self, limit: int | None, used: int = 0) -> None:
+        """
+        Args:
+            limit (int | None): Max number of entries, None for no limit
+            used (int): Entries already taken, e.g. the root of the walk
+        """
+
+        self.limit = limit
+        self.used = used
+
+
+    @property
+    def remaining(self) -> int | None:
+        """ Number of entries left, None if there is no limit """
+        return None if self.limit is None else max(self.limit - self.used, 0)
+
+
+    @property
+    def exhausted(self) -> bool:
+        """ True if no more entries can be added """
+        return self.limit is not None and self.used >= self.limit
+
+
+    def take(self) -> bool:
+        """
+        Take one entry from the budget.
+
+        Returns:
+            bool: True if the entry can be added, False if the budget is exhausted
+        """
+
+        if self.exhausted:
+            return False
+
+        self.used += 1
+        return True
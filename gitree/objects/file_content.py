@@ -0,0 +1,95 @@
+# gitree/objects/file_content.py
+
+"""
+Code file for housing FileContent class.
+"""
+
+# Default libs
+import codecs, io, mmap
+from typing import Iterator
+
+# Deps from this project
+from ..constants.constant import CONTENT_DECODE_CHUNK
+
+
+class FileContent:
+    """
+    The content of a file read for the export, kept as the raw bytes until it is
+    written out.
+
+    - Holds the bytes read from the file, a read-only mmap of it, or the
+      placeholder text that replaces it (binary, too large, unreadable).
+    - Decodes as UTF-8 dropping the invalid bytes, with universal newlines, the
+      same as Path.read_text(errors="ignore"). iter_text() decodes it chunk by
+      chunk, so a big file is never held as one string.
+    """
+
+    __slots__ = ("_data", "_placeholder")
+
+    def __init__(self, data: bytes | mmap.mmap | None = None,
+        placeholder: str | None = None) -> None:
+        """
+        Args:
+            data (bytes | mmap.mmap | None): The content of the file
+            placeholder (str | None): The text written instead of the content
+        """
+
+        self._data = data
+        self._placeholder = placeholder
+
+
+    def iter_text(self, strip_newlines: bool = False) -> Iterator[str]:
+        """
+        Decode the content chunk by chunk, and close it once done.
+
+        Args:
+            strip_newlines (bool): Whether to leave out the newlines at the end
+
+        Returns:
+            Iterator[str]: The decoded text, in pieces
+        """
+
+        if self._placeholder is not None:
+            yield self._placeholder
+            return
+
+        decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder("utf-8")(errors="ignore"), translate=True)
+        held = ""       # Newlines that are only written if more text follows
+
+        try:
+            for start in range(0, len(self._data), CONTENT_DECODE_CHUNK):
+                final = start + CONTENT_DECODE_CHUNK >= len(self._data)
+                piece = decoder.decode(self._data[start:start + CONTENT_DECODE_CHUNK], final)
+
+                if not strip_newlines:
+                    yield piece
+                    continue
+
+                stripped = piece.rstrip("\n")
+                if stripped:
+                    yield held + stripped
+                    held = piece[len(stripped):]
+                else:
+                    held += piece
+
+        finally:
+            self.close()
+
+
+    def text(self) -> str:
+        """
+        Get the whole decoded content as one string.
+        """
+
+        return "".join(self.iter_text())
+
+
+    def close(self) -> None:
+        """
+        Release the mmap of the file, if it was mapped.
+        """
+
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = None
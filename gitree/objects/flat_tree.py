@@ -0,0 +1,174 @@
+# gitree/objects/flat_tree.py
+
+"""
+Code file for housing FlatTree class.
+"""
+
+# Default libs
+import os
+from array import array
+from pathlib import Path
+from typing import Iterator
+
+# Deps from this project
+from ..constants.constant import ENTER_DIR, FILE_ITEM, LEAVE_DIR
+from .tree_node import FLAG_DIR
+
+
+class FlatTree:
+    """
+    The resolved tree stored as parallel arrays, for trees with millions of entries.
+
+    - Every entry is an index, in the same pre-order as the walk: a dir comes
+      before its items, and its items before its next sibling. The arrays hold
+      the parent index, the end of the subtree and the flags of each entry, and
+      where its name is in one string pool. Repeated names, like __init__.py,
+      are only stored once.
+    - Everything is iterated in order without recursion, so there is no limit
+      on the depth of the tree.
+    """
+
+    def __init__(self) -> None:
+        self.parents = array("q")       # Index of the parent dir, -1 for the root
+        self.ends = array("q")          # Index after the last entry of the subtree
+        self.flags = array("B")         # TreeNode flags
+        self.name_offsets = array("Q")
+        self.name_lengths = array("I")
+
+        self.pool = ""
+        self._pool_parts: list[str] = []
+        self._pool_size = 0
+        self._interned: dict[str, int] = {}
+
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+
+    def add(self, name: str, parent: int, flags: int) -> int:
+        """
+        Add an entry after all the entries added so far.
+
+        Args:
+            name (str): Name of the entry, or the full path for the root
+            parent (int): Index of the parent dir, -1 for the root
+            flags (int): TreeNode flags of the entry
+
+        Returns:
+            int: The index of the entry
+        """
+
+        offset = self._interned.get(name)
+        if offset is None:
+            offset = self._interned[name] = self._pool_size
+            self._pool_parts.append(name)
+            self._pool_size += len(name)
+
+        index = len(self.parents)
+        self.parents.append(parent)
+        self.ends.append(index + 1)
+        self.flags.append(flags)
+        self.name_offsets.append(offset)
+        self.name_lengths.append(len(name))
+        return index
+
+
+    def close(self, index: int) -> None:
+        """
+        Mark the end of a dir, once all its entries were added.
+        """
+
+        self.ends[index] = len(self.parents)
+
+
+    def finish(self) -> "FlatTree":
+        """
+        Join the names into the string pool, once all the entries were added.
+        """
+
+        self.pool = "".join(self._pool_parts)
+        self._pool_parts = []
+        self._interned = {}
+        return self
+
+
+    def name(self, index: int) -> str:
+        offset = self.name_offsets[index]
+        return self.pool[offset:offset + self.name_lengths[index]]
+
+
+    def is_dir(self, index: int) -> bool:
+        return bool(self.flags[index] & FLAG_DIR)
+
+
+    def path(self, index: int) -> Path:
+        """
+        Build the full path of an entry from its parents.
+        """
+
+        names = []
+        while index != -1:
+            names.append(self.name(index))
+            index = self.parents[index]
+
+        return Path(os.path.join(*reversed(names)))
+
+
+    def get(self, key: str, default=None):
+        """
+        Read the root like a resolved tree dict. Only "self" is supported, the
+        items are read with iter_files() and events().
+        """
+
+        if key == "self":
+            return self.path(0) if len(self) else None
+        return default
+
+
+    def iter_files(self) -> Iterator[Path]:
+        """
+        Yield the paths of all the files, in pre-order.
+        """
+
+        dir_paths: dict[int, str] = {}
+        for index in range(len(self)):
+            parent = self.parents[index]
+            path = os.path.join(dir_paths[parent], self.name(index)) if parent != -1 \
+                else self.name(index)
+
+            if self.flags[index] & FLAG_DIR:
+                dir_paths[index] = path
+            else:
+                yield Path(path)
+
+
+    def events(self) -> Iterator[tuple[str, Path, bool | None, int]]:
+        """
+        Yield the tree as the (event, path, last, flags) tuples of
+        ItemsSelectionService.iter_items, with every "last" known.
+        """
+
+        dir_paths: dict[int, str] = {}
+        open_dirs: list[int] = []
+
+        for index in range(len(self)):
+            while open_dirs and self.ends[open_dirs[-1]] <= index:
+                closed = open_dirs.pop()
+                yield LEAVE_DIR, Path(dir_paths.pop(closed)), None, self.flags[closed]
+
+            parent = self.parents[index]
+            flags = self.flags[index]
+            path = os.path.join(dir_paths[parent], self.name(index)) if parent != -1 \
+                else self.name(index)
+
+            if flags & FLAG_DIR:
+                last = parent == -1 or self.ends[index] == self.ends[parent]
+                dir_paths[index] = path
+                open_dirs.append(index)
+                yield ENTER_DIR, Path(path), last, flags
+            else:
+                yield FILE_ITEM, Path(path), None, flags
+
+        while open_dirs:
+            closed = open_dirs.pop()
+            yield LEAVE_DIR, Path(dir_paths.pop(closed)), None, self.flags[closed]
@@ -0,0 +1,327 @@
+# gitree/objects/git_index.py
+
+"""
+Code file for housing GitIndex and IndexEntry classes.
+"""
+
+# Default libs
+import hashlib, json, operator, os, struct, time
+from bisect import bisect_left
+from pathlib import Path
+
+# Deps from this project
+from ..utilities.git_utility import find_git_dir, config_value
+
+
+# Kinds of the entries of a git index, from their mode
+KIND_FILE = 0
+KIND_SYMLINK = 1
+KIND_GITLINK = 2        # A submodule, shown as an empty dir
+KIND_DIR = 3            # Not stored in the index, implied by the paths under it
+
+_MODE_TYPE = 0o170000
+_MODE_SYMLINK = 0o120000
+_MODE_GITLINK = 0o160000
+
+# Flags of an index entry
+_FLAG_EXTENDED = 0x4000
+_FLAG_STAGE = 0x3000
+_FLAG_NAME_LENGTH = 0x0FFF
+_XFLAG_SKIP_WORKTREE = 0x4000
+
+_U16 = struct.Struct(">H")
+_U32 = struct.Struct(">I")
+
+# Format version of the parsed index cache file
+_CACHE_VERSION = 2
+
+# An index changed less than this long ago may change again within the same
+# mtime tick without it showing, so it is not cached
+_RACY_NS = 2_000_000_000
+
+
+class IndexEntry:
+    """
+    An entry of a dir as listed from a GitIndex. Answers the same calls as the
+    os.DirEntry objects of a disk listing.
+    """
+
+    __slots__ = ("name", "path", "kind")
+
+    def __init__(self, name: str, path: str, kind: int) -> None:
+        self.name = name
+        self.path = path
+        self.kind = kind
+
+
+    def is_dir(self) -> bool:
+        return self.kind in (KIND_DIR, KIND_GITLINK)
+
+
+    def is_file(self) -> bool:
+        return self.kind == KIND_FILE
+
+
+    def is_symlink(self) -> bool:
+        return self.kind == KIND_SYMLINK
+
+
+    def __fspath__(self) -> str:
+        return self.path
+
+
+class GitIndex:
+    """
+    The tracked files of a git checkout, read straight from its index file,
+    without running git.
+
+    - Supports index versions 2, 3 and 4, with SHA-1 or SHA-256 object names.
+      Only the entries checked out in the worktree are kept: conflict stages
+      other than 0 and skip-worktree (sparse checkout) entries are left out.
+    - The paths are kept sorted like git sorts them, so the entries of a dir are
+      one range of the list, and its subdirs are skipped with a binary search.
+      Listing a dir costs O(entries in it * log n), whatever the size of the index.
+    """
+
+    def __init__(self, worktree: Path, paths: list[str], modes: list[int]) -> None:
+        """
+        Args:
+            worktree (Path): The top dir of the checkout, the paths are relative to it
+            paths (list[str]): The POSIX paths of the entries, in git order
+            modes (list[int]): The git mode of every path
+        """
+
+        self.worktree = worktree
+        self.paths = paths
+        self.modes = modes
+
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+
+    @staticmethod
+    def find(path: Path, cache_dir: Path | None = None) -> "GitIndex | None":
+        """
+        Read the index of the git checkout the given path is in.
+
+        Args:
+            path (Path): A resolved path in the checkout
+            cache_dir (Path | None): A dir to keep the parsed index in, so it is
+                only parsed again once the index changed. Every index has its own
+                file in it, named after the path of the index
+
+        Returns:
+            GitIndex | None: The index, None if the path is not in a checkout or
+                the checkout has no index yet
+
+        Raises:
+            ValueError: If the index file is not valid or its version is not supported
+        """
+
+        found = find_git_dir(path)
+        if found is None:
+            return None
+
+        worktree, git_dir = found
+        index_path = git_dir / "index"
+        try:
+            st = os.stat(index_path)
+        except OSError:
+            return None
+
+        key = [os.fspath(index_path), st.st_size, st.st_mtime_ns]
+        cache_path = cache_dir / ("index-" + hashlib.sha1(
+            key[0].encode("utf-8", "surrogateescape")).hexdigest()[:16] + ".json") \
+            if cache_dir else None
+        cached = GitIndex._load_cache(cache_path, key) if cache_path else None
+        if cached is not None:
+            return GitIndex(worktree, *cached)
+
+        object_format = config_value(git_dir, "extensions", "objectformat", include_global=False)
+        hash_size = 32 if (object_format or "").lower() == "sha256" else 20
+        with open(index_path, "rb") as f:
+            paths, modes = GitIndex._parse(f.read(), hash_size)
+
+        # The index is sorted by bytes, which only differs from str order for
+        # paths that are not valid UTF-8
+        if any(map(operator.gt, paths, paths[1:])):
+            order = sorted(range(len(paths)), key=paths.__getitem__)
+            paths, modes = [paths[i] for i in order], [modes[i] for i in order]
+
+        if cache_path and st.st_mtime_ns <= time.time_ns() - _RACY_NS:
+            GitIndex._store_cache(cache_path, key, paths, modes)
+        return GitIndex(worktree, paths, modes)
+
+
+    def children(self, rel: str) -> list[tuple[str, int]] | None:
+        """
+        List a dir of the checkout from the index.
+
+        Args:
+            rel (str): POSIX path of the dir relative to the worktree, "" for the top
+
+        Returns:
+            list[tuple[str, int]] | None: The (name, kind) of every entry in the dir,
+                in git order. None if the dir is a submodule, since its files are
+                not in this index
+        """
+
+        paths = self.paths
+        prefix = rel + "/" if rel else ""
+
+        # A submodule is an entry of its own, it sorts before the paths under it
+        if prefix:
+            j = bisect_left(paths, rel)
+            if j < len(paths) and paths[j] == rel and \
+                self.modes[j] & _MODE_TYPE == _MODE_GITLINK:
+                return None
+
+        i = bisect_left(paths, prefix)
+
+        out: list[tuple[str, int]] = []
+        while i < len(paths) and paths[i].startswith(prefix):
+            name, sep, _ = paths[i][len(prefix):].partition("/")
+            if not sep:
+                mode_type = self.modes[i] & _MODE_TYPE
+                out.append((name, KIND_SYMLINK if mode_type == _MODE_SYMLINK else
+                    KIND_GITLINK if mode_type == _MODE_GITLINK else KIND_FILE))
+                i += 1
+            else:
+                # Skip everything under the subdir, "0" is the char right after "/"
+                out.append((name, KIND_DIR))
+                i = bisect_left(paths, prefix + name + "0", i)
+
+        return out
+
+
+    @staticmethod
+    def _parse(data: bytes, hash_size: int) -> tuple[list[str], list[int]]:
+        """
+        Parse the entries of an index file.
+
+        Args:
+            data (bytes): The contents of the index file
+            hash_size (int): Size of an object name, 20 for SHA-1 and 32 for SHA-256
+
+        Returns:
+            list[str]: The paths of the entries, in the order of the file
+            list[int]: The mode of every entry
+        """
+
+        if len(data) < 12 or data[:4] != b"DIRC":
+            raise ValueError("not a git index file")
+
+        version, count = _U32.unpack_from(data, 4)[0], _U32.unpack_from(data, 8)[0]
+        if version not in (2, 3, 4):
+            raise ValueError(f"unsupported git index version {version}")
+
+        # The mode and the flags of an entry, read in one call
+        unpack_entry = struct.Struct(f">24xI{12 + hash_size}xH").unpack_from
+        name_offset = 42 + hash_size
+        names: list[bytes] = []
+        modes: list[int] = []
+        pos = 12
+        previous = b""
+
+        try:
+            for _ in range(count):
+                mode, flags = unpack_entry(data, pos)
+                name_start = pos + name_offset
+                skip = flags & _FLAG_STAGE
+
+                if flags & _FLAG_EXTENDED:
+                    skip |= _U16.unpack_from(data, name_start)[0] & _XFLAG_SKIP_WORKTREE
+                    name_start += 2
+
+                if version == 4:
+                    # The path is the previous one with its last n bytes replaced
+                    strip, name_start = _read_varint(data, name_start)
+                    end = data.index(b"\0", name_start)
+                    name = previous = previous[:len(previous) - strip] + data[name_start:end]
+                    pos = end + 1
+                else:
+                    length = flags & _FLAG_NAME_LENGTH
+                    end = name_start + length if length < _FLAG_NAME_LENGTH \
+                        else data.index(b"\0", name_start)
+                    name = data[name_start:end]
+                    pos += (end - pos + 8) & ~7      # 1 to 8 NUL bytes of padding
+
+                if not skip:
+                    names.append(name)
+                    modes.append(mode)
+
+        except (struct.error, ValueError, IndexError):
+            raise ValueError("truncated git index file")
+
+        # Paths never contain NUL, so they are all decoded at once
+        paths = b"\0".join(names).decode("utf-8", "surrogateescape").split("\0") \
+            if names else []
+        return paths, modes
+
+
+    @staticmethod
+    def _load_cache(cache_path: Path, key: list) -> tuple[list[str], list[int]] | None:
+        """
+        Read the parsed index from the cache file, if it was stored for the same
+        index file, size and mtime. A file that can not be read or does not hold
+        a valid index gives None, so the index is parsed again.
+        """
+
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError, RecursionError):
+            return None
+
+        if not isinstance(data, dict) or data.get("version") != _CACHE_VERSION \
+            or data.get("key") != key:
+            return None
+
+        paths, modes = data.get("paths"), data.get("modes")
+        if not isinstance(paths, str) or not isinstance(modes, list):
+            return None
+
+        paths = paths.split("\0") if paths else []
+        if len(paths) != len(modes) or any(map(operator.gt, paths, paths[1:])) \
+            or not all(type(mode) is int and 0 <= mode < 1 << 32 for mode in modes):
+            return None
+
+        return paths, modes
+
+
+    @staticmethod
+    def _store_cache(cache_path: Path, key: list, paths: list[str], modes: list[int]) -> None:
+        """
+        Write the parsed index to the cache file. Errors are ignored, the cache is
+        only a speedup.
+        """
+
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": _CACHE_VERSION, "key": key, "paths": "\0".join(paths),
+                    "modes": modes}, f, separators=(",", ":"))
+            os.replace(tmp_path, cache_path)
+        except (OSError, ValueError):
+            pass
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    """
+    Read a variable length int of an index v4 entry, as encoded by git's varint.c.
+
+    Returns:
+        int: The value
+        int: The position after it
+    """
+
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, pos
@@ -5,26 +5,41 @@ Code file for housing GitIgnore class
 """
 
 # Default libs
+import re
 from pathlib import Path
-from typing import Iterable
 
 # Dependencies
-import pathspec
+from pathspec.util import lookup_pattern
 
 # Deps from this project
 from ..objects.app_context import AppContext
 from ..objects.config import Config
+from ..utilities.gitignore_cache_utility import GitIgnoreCache
 
 
 class GitIgnore:
     """
-    Minimal gitignore loader/matcher.
-
-    - Create an object passing roots to it, and it's ready to be used.
-    - excluded(path) tells if path is ignored by any root's combined patterns.
+    Minimal gitignore loader/matcher for a single .gitignore file.
+
+    - Create an object passing the .gitignore path to it, and it's ready to be used.
+    - All the patterns of the file are compiled into one regex, so matching a path
+      against the whole file is a single regex call.
+    - match(rel) follows git's "last matching pattern wins" rule.
+    - The compiled regex comes from a GitIgnoreCache, so a file with the same
+      contents as one seen before is not compiled again.
+    - Also loads the files with the same syntax that git reads besides the
+      .gitignore files (.git/info/exclude, core.excludesFile), given their root.
     """
 
-    def __init__(self, ctx: AppContext, config: Config, gitignore_path: Path) -> None:
+    # Pattern class used to translate gitignore lines into regexes
+    _PATTERN = lookup_pattern("gitwildmatch")
+
+    # Used when no cache is given, compiled rules are only kept in memory
+    _MEMORY_CACHE = GitIgnoreCache()
+
+
+    def __init__(self, ctx: AppContext, config: Config, gitignore_path: Path,
+        cache: GitIgnoreCache | None = None, root: Path | None = None) -> None:
         """
         Initialize the gitignore matcher for a single directory by loading patterns
         from the provided .gitignore file.
@@ -33,6 +48,11 @@ class GitIgnore:
             ctx (AppContext): The application context
             config (Config): The application configuration
             gitignore_path (Path): Path to the .gitignore file to load patterns from
+            cache (GitIgnoreCache | None): The cache of compiled rules, also stored
+                on disk. Only kept in memory if not given
+            root (Path | None): The resolved dir the rules are relative to. The dir of
+                the file if not given, the top of the checkout for info/exclude and
+                the global excludes file
         """
 
         # Bind app context and config with the object
@@ -43,187 +63,104 @@ class GitIgnore:
         self.enabled = not config.no_gitignore
         self.gitignore_depth = config.gitignore_depth
 
-        # Setup specs for gitignore
-        self._specs: list[tuple[Path, pathspec.PathSpec]]
-        self._load_spec_from_gitignore(gitignore_path)
+        # Setup the compiled rules for gitignore
+        self.root: Path
+        self._regex: re.Pattern | None
+        self._ignores: list[bool]
+        self._load_spec_from_gitignore(gitignore_path, cache or GitIgnore._MEMORY_CACHE, root)
 
 
-    def excluded(self, item_path: Path) -> bool:
+    def match(self, rel: str) -> bool | None:
         """
-        Determine whether the given path is excluded by the loaded gitignore patterns.
+        Match a path relative to the dir of this .gitignore against its rules.
 
         Args:
-            item_path (Path): The path to check for exclusion
+            rel (str): POSIX path relative to self.root, with a trailing "/" for dirs
 
         Returns:
-            bool: True if the path is ignored/excluded, otherwise False
+            bool | None: True if the last matching rule ignores the path, False if
+                it is a negated ("!") rule, None if no rule matches
         """
-        if not self.enabled:
-            return False
-
-        p = item_path.resolve(strict=False)
-
-        for root, spec in self._specs:
-            try:
-                rel = p.relative_to(root).as_posix()
-            except ValueError:
-                continue
+        if self._regex is None:
+            return None
 
-            if spec.match_file(rel):
-                return True
-            if p.is_dir() and spec.match_file(rel + "/"):
-                return True
+        m = self._regex.match(rel)
+        if m is None:
+            return None
 
-        return False
+        # Rules are compiled last-first, so the matching group is the last matching rule
+        return self._ignores[int(m.lastgroup[1:])]
 
 
-    def _load_from_roots(self, roots: Iterable[Path]) -> None:
+    def excluded(self, real_path: str, is_dir: bool) -> bool:
         """
-        Load and combine gitignore patterns from all .gitignore files under the given roots.
+        Determine whether the given path is excluded by the loaded gitignore patterns.
 
         Args:
-            roots (Iterable[Path]): Root directories to scan for .gitignore files
-        """
-        # Clears the specs if already present
-        self._specs = []
-
-        for root in self._norm_roots(roots):
-            pats = self._collect_patterns(root)
-            self._specs.append((root, pathspec.PathSpec.from_lines("gitwildmatch", pats)))
+            real_path (str): The resolved POSIX path to check for exclusion
+            is_dir (bool): Whether the path is a dir
 
-
-    def _load_spec_from_gitignore(self, gitignore_path: Path) -> None:
-        """
-        Load gitignore patterns from a single .gitignore file and create a PathSpec
-        rooted at its parent directory.
-
-        Args:
-            gitignore_path (Path): Path to the .gitignore file to load
+        Returns:
+            bool: True if the path is ignored/excluded, otherwise False
         """
-        self._specs = []
-
-        gi = Path(gitignore_path).resolve(strict=False)
-        root = gi.parent
-
-        patterns: list[str] = []
-        try:
-            lines = gi.read_text(encoding="utf-8", errors="ignore").splitlines()
-        except Exception:
-            lines = []
-
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
+        if not self.enabled:
+            return False
 
-            neg = line.startswith("!")
-            pat = line[1:] if neg else line
-            pat = pat.lstrip("/")
-            patterns.append(("!" + pat) if neg else pat)
+        root = self.root.as_posix().rstrip("/") + "/"
+        if not real_path.startswith(root):
+            return False
 
-        self._specs.append((root, pathspec.PathSpec.from_lines("gitwildmatch", patterns)))
+        rel = real_path[len(root):]
+        return bool(self.match(rel + "/" if is_dir else rel))
 
 
-    def _norm_roots(self, roots: Iterable[Path]) -> list[Path]:
+    def _load_spec_from_gitignore(self, gitignore_path: Path, cache: GitIgnoreCache,
+        root: Path | None = None) -> None:
         """
-        Normalize root paths into unique directory Paths.
+        Load gitignore patterns from a single .gitignore file and compile them into
+        one regex rooted at its parent directory, or at the given root.
 
         Args:
-            roots (Iterable[Path]): Root paths to normalize
-
-        Returns:
-            list[Path]: A de-duplicated list of resolved directory roots
-        """
-        out: list[Path] = []
-        for r in roots:
-            rr = Path(r).resolve(strict=False)
-            rr = rr if rr.is_dir() else rr.parent
-            if rr not in out:
-                out.append(rr)
-        return out
-    
-
-    def _within_depth(self, root: Path, dirpath: Path) -> bool:
+            gitignore_path (Path): Path to the .gitignore file to load
+            cache (GitIgnoreCache): The cache of compiled rules
+            root (Path | None): The dir the rules are relative to, if not the file's dir
         """
-        Check whether a directory is within the configured gitignore traversal depth
-        relative to the given root.
+        # NOTE: with a root given, the path is known to be resolved already
+        gi = Path(gitignore_path) if root is not None else \
+            Path(gitignore_path).resolve(strict=False)
+        self.root = root if root is not None else gi.parent
+        self._regex, self._ignores = cache.load(gi, GitIgnore._translate)
 
-        Args:
-            root (Path): The root directory used as the depth baseline
-            dirpath (Path): The directory path to test
 
-        Returns:
-            bool: True if dirpath is within depth, otherwise False
+    @staticmethod
+    def _translate(lines: list[str]) -> tuple[str | None, list[bool]]:
         """
-        if self.gitignore_depth is None:
-            return True
-        try:
-            return len(dirpath.relative_to(root).parts) <= self.gitignore_depth
-        except Exception:
-            return False
-        
-
-    def _collect_patterns(self, root: Path) -> list[str]:
-        """
-        Collect gitignore patterns from all .gitignore files under the root, prefixing
-        patterns by their relative directory to emulate nested .gitignore behavior.
+        Translate gitignore lines into the source of a single regex. Each rule becomes
+        a named alternative, ordered last rule first, so the first alternative that
+        matches is the rule git would apply.
 
         Args:
-            root (Path): Root directory to scan
+            lines (list[str]): Raw lines of a .gitignore file
 
         Returns:
-            list[str]: Combined list of patterns collected under the root
+            str | None: The regex source, None if there are no rules
+            list[bool]: Whether each rule ignores (False for "!" rules), by group number
         """
-        patterns: list[str] = []
+        ignores: list[bool] = []
+        alternatives: list[str] = []
 
-        for d in self._walk_dirs(root):
-            gi = d / ".gitignore"
-            if not gi.is_file():
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
                 continue
 
-            rel_dir = d.relative_to(root).as_posix()
-            prefix = "" if rel_dir == "." else rel_dir + "/"
-
-            try:
-                lines = gi.read_text(encoding="utf-8", errors="ignore").splitlines()
-            except Exception:
+            regex, include = GitIgnore._PATTERN.pattern_to_regex(line)
+            if include is None:
                 continue
 
-            for line in lines:
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue
-
-                neg = line.startswith("!")
-                pat = line[1:] if neg else line
-                pat = prefix + pat.lstrip("/")
-                patterns.append(("!" + pat) if neg else pat)
-
-        return patterns
-    
-
-    def _walk_dirs(self, root: Path) -> Iterable[Path]:
-        """
-        Walk directories under the root using a stack-based traversal, respecting the
-        configured depth and skipping symlinks.
-
-        Args:
-            root (Path): Root directory to traverse
-
-        Returns:
-            Iterable[Path]: Directories discovered during traversal, including root
-        """
-        stack = [root]
-        while stack:
-            d = stack.pop()
-            yield d
+            # Named groups would clash between rules, they are not needed here
+            regex = re.sub(r"\(\?P<[^>]+>", "(?:", regex)
+            alternatives.append(f"(?P<r{len(ignores)}>{regex})")
+            ignores.append(include)
 
-            if not self._within_depth(root, d):
-                continue
-
-            try:
-                for c in d.iterdir():
-                    if c.is_dir() and not c.is_symlink():
-                        stack.append(c)
-            except PermissionError:
-                continue
+        return ("|".join(reversed(alternatives)) if alternatives else None), ignores
@@ -0,0 +1,208 @@
+# gitree/objects/glob_matcher.py
+
+"""
+Code file for housing GlobMatcher and GlobCursor classes.
+"""
+
+# Default libs
+import os, re, fnmatch
+from pathlib import Path
+
+
+# Marker for a "**" path component
+_RECURSIVE = object()
+
+
+class GlobMatcher:
+    """
+    Glob patterns compiled into one matcher that is evaluated during a walk.
+
+    - Every pattern is split into path components, and a cursor keeps the set of
+      (pattern, component) positions that can still match under the current dir.
+      Moving the cursor to a child is one step for all the patterns at once, so
+      any number of patterns costs a single walk.
+    - Follows glob.glob(recursive=True, include_hidden=True): "**" matches any
+      number of dirs, and a trailing "/" only matches dirs.
+    """
+
+    def __init__(self, patterns: list[str], base_path: Path) -> None:
+        """
+        Args:
+            patterns (list[str]): The glob patterns, relative to base_path or absolute
+            base_path (Path): The dir relative patterns are resolved from
+        """
+
+        self.patterns = patterns
+        self.bases: list[Path] = []
+        self.matched: set[int] = set()
+        self._components: list[tuple] = []
+        self._dirs_only: list[bool] = []
+
+        for pattern in patterns:
+            self._compile(pattern, base_path)
+
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+
+    def cursor(self, path: Path, pattern: int | None = None) -> "GlobCursor":
+        """
+        Get a cursor pointing at the given dir. Costs O(depth) once; moving
+        the cursor down afterwards costs one step per child.
+
+        Args:
+            path (Path): The dir to point at, usually the root of a walk
+            pattern (int | None): The index of the only pattern to match, None
+                for all of them
+
+        Returns:
+            GlobCursor: The cursor for the dir
+        """
+
+        patterns = range(len(self._components)) if pattern is None else (pattern,)
+        cursor = GlobCursor(self, self._closure((p, 0) for p in patterns),
+            matched=False, covered=False)
+        for part in path.parts:
+            cursor = cursor.child(part, is_dir=True)
+        return cursor
+
+
+    def unmatched(self) -> list[str]:
+        """
+        Get the patterns that did not match anything during the walk.
+        """
+
+        return [pattern for p, pattern in enumerate(self.patterns) if p not in self.matched]
+
+
+    def _compile(self, pattern: str, base_path: Path) -> None:
+        """
+        Split a pattern into its literal base dir and its components.
+
+        Args:
+            pattern (str): The glob pattern
+            base_path (Path): The dir relative patterns are resolved from
+        """
+
+        parts = Path(pattern).parts
+        literal = 0
+        while literal < len(parts) and not _has_magic(parts[literal]):
+            literal += 1
+
+        # The literal part is resolved like any given path, the rest is matched
+        base = (base_path / Path(*parts[:literal])).resolve(strict=False) \
+            if literal else base_path.resolve(strict=False)
+        self.bases.append(base)
+
+        components: list = [os.path.normcase(part) for part in base.parts]
+        for part in parts[literal:]:
+            if part == "**":
+                components.append(_RECURSIVE)
+            elif _has_magic(part):
+                components.append(re.compile(fnmatch.translate(os.path.normcase(part))).match)
+            else:
+                components.append(os.path.normcase(part))
+
+        self._components.append(tuple(components))
+        self._dirs_only.append(pattern.endswith(("/", os.sep)))
+
+
+    def _closure(self, states) -> frozenset[tuple[int, int]]:
+        """
+        Add the positions reachable by letting a "**" match zero dirs.
+        """
+
+        result: set[tuple[int, int]] = set()
+        stack = list(states)
+        while stack:
+            state = stack.pop()
+            if state in result:
+                continue
+
+            result.add(state)
+            p, i = state
+            if i < len(self._components[p]) and self._components[p][i] is _RECURSIVE:
+                stack.append((p, i + 1))
+
+        return frozenset(result)
+
+
+class GlobCursor:
+    """
+    A position of a walk in a GlobMatcher, moved down one entry at a time.
+    """
+
+    __slots__ = ("matcher", "states", "matched", "covered")
+
+    def __init__(self, matcher: GlobMatcher, states: frozenset[tuple[int, int]],
+        matched: bool, covered: bool) -> None:
+        """
+        Args:
+            matcher (GlobMatcher): The matcher this cursor walks
+            states (frozenset): The (pattern, component) positions at this path
+            matched (bool): Whether this exact path matches a pattern
+            covered (bool): Whether this path or one of its parents matches a pattern
+        """
+
+        self.matcher = matcher
+        self.states = states
+        self.matched = matched
+        self.covered = covered
+
+
+    @property
+    def alive(self) -> bool:
+        """ True if a path under this dir can still match a pattern """
+        components = self.matcher._components
+        return any(i < len(components[p]) for p, i in self.states)
+
+
+    def child(self, name: str, is_dir: bool) -> "GlobCursor":
+        """
+        Move the cursor to a child of the current dir.
+
+        Args:
+            name (str): Name of the child entry
+            is_dir (bool): Whether the child is a dir
+
+        Returns:
+            GlobCursor: The cursor for the child
+        """
+
+        if not self.states:
+            return GlobCursor(self.matcher, self.states, False, self.covered)
+
+        components = self.matcher._components
+        name = os.path.normcase(name)
+        moved: list[tuple[int, int]] = []
+
+        for p, i in self.states:
+            comps = components[p]
+            if i >= len(comps):
+                continue
+
+            comp = comps[i]
+            if comp is _RECURSIVE:
+                # "**" goes down into dirs, and also takes files if it is the last one
+                if is_dir or i == len(comps) - 1:
+                    moved.append((p, i))
+            elif isinstance(comp, str):
+                if comp == name:
+                    moved.append((p, i + 1))
+            elif comp(name):
+                moved.append((p, i + 1))
+
+        states = self.matcher._closure(moved)
+        matched = False
+        for p, i in states:
+            if i == len(components[p]) and (is_dir or not self.matcher._dirs_only[p]):
+                self.matcher.matched.add(p)
+                matched = True
+
+        return GlobCursor(self.matcher, states if is_dir else frozenset(), matched,
+            self.covered or matched)
+
+
+def _has_magic(part: str) -> bool:
+    return any(c in part for c in "*?[")
@@ -0,0 +1,124 @@
+# gitree/objects/path_trie.py
+
+"""
+Code file for housing PathTrie and TrieCursor classes.
+"""
+
+# Default libs
+import os
+from pathlib import Path
+from typing import Iterable
+
+
+class _TrieNode:
+    """
+    A single path component in the trie.
+    """
+
+    __slots__ = ("children", "terminal")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.terminal = False
+
+
+class PathTrie:
+    """
+    Path-component trie over a set of paths.
+
+    - Build it once from the paths, then get a cursor for the dir a walk
+      starts from and move it down with child(name).
+    - Every lookup on a cursor is O(1), so checking an entry against
+      thousands of paths costs the same as checking it against one.
+    """
+
+    def __init__(self, paths: Iterable[Path] = ()) -> None:
+        """
+        Args:
+            paths (Iterable[Path]): The paths to index
+        """
+
+        self._root = _TrieNode()
+        for path in paths:
+            self.add(path)
+
+
+    def add(self, path: Path) -> None:
+        """
+        Add a path to the trie.
+
+        Args:
+            path (Path): The path to add
+        """
+
+        node = self._root
+        for part in path.parts:
+            node = node.children.setdefault(os.path.normcase(part), _TrieNode())
+        node.terminal = True
+
+
+    def cursor(self, path: Path) -> "TrieCursor":
+        """
+        Get a cursor pointing at the given path. Costs O(depth) once; moving
+        the cursor down afterwards is O(1) per step.
+
+        Args:
+            path (Path): The path to point at, usually the root of a walk
+
+        Returns:
+            TrieCursor: The cursor for the path
+        """
+
+        cursor = TrieCursor(self._root, self._root.terminal)
+        for part in path.parts:
+            cursor = cursor.child(part)
+        return cursor
+
+
+class TrieCursor:
+    """
+    A position in a PathTrie, moved down one path component at a time.
+    """
+
+    __slots__ = ("node", "covered")
+
+    def __init__(self, node: _TrieNode | None, covered: bool) -> None:
+        """
+        Args:
+            node (_TrieNode | None): The trie node of this path, None if the path
+                is not a prefix of any indexed path
+            covered (bool): Whether this path or one of its parents is indexed
+        """
+
+        self.node = node
+        self.covered = covered
+
+
+    def child(self, name: str) -> "TrieCursor":
+        """
+        Move the cursor to a child of the current path.
+
+        Args:
+            name (str): Name of the child entry
+
+        Returns:
+            TrieCursor: The cursor for the child path
+        """
+
+        if self.node is None:
+            return TrieCursor(None, self.covered)
+
+        node = self.node.children.get(os.path.normcase(name))
+        return TrieCursor(node, self.covered or (node is not None and node.terminal))
+
+
+    @property
+    def exact(self) -> bool:
+        """ True if this exact path is indexed """
+        return self.node is not None and self.node.terminal
+
+
+    @property
+    def has_descendants(self) -> bool:
+        """ True if this path or any path under it is indexed """
+        return self.node is not None
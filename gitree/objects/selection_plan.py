@@ -0,0 +1,166 @@
+# gitree/objects/selection_plan.py
+
+"""
+Code file for housing SelectionPlan and PlanCursor classes.
+"""
+
+# Default libs
+import os
+from pathlib import Path
+
+# Deps from this project
+from .config import Config
+from .glob_matcher import GlobMatcher, GlobCursor
+from .path_trie import PathTrie, TrieCursor
+
+
+class SelectionPlan:
+    """
+    Everything the items selection walk needs, resolved once per run.
+
+    - Holds the pre-resolved roots, includes and excludes indexed in PathTrie
+      objects, the glob patterns compiled in GlobMatcher objects, plus the
+      listing limits from the config.
+    - The walker only does in-memory lookups on it, it never has to go
+      back to the config, resolve a path or expand a glob again.
+    """
+
+    def __init__(self, config: Config, given_paths: list[Path], root_globs: GlobMatcher,
+        include_paths: list[Path], include_globs: GlobMatcher,
+        exclude_paths: list[Path], exclude_globs: GlobMatcher) -> None:
+        """
+        Args:
+            config (Config): The application configuration
+            given_paths (list[Path]): Resolved root paths given as plain paths
+            root_globs (GlobMatcher): Root paths given as glob patterns
+            include_paths (list[Path]): Resolved --include paths
+            include_globs (GlobMatcher): --include glob patterns
+            exclude_paths (list[Path]): Resolved --exclude paths
+            exclude_globs (GlobMatcher): --exclude glob patterns
+        """
+
+        # The walk starts from the common parent of all the roots
+        # NOTE: for glob patterns that is the literal dir before the first wildcard,
+        # the walk moves it down to the common parent of the matches with move_root
+        self.root_paths = given_paths + root_globs.bases
+        self.root_dir = Path(os.path.commonpath(self.root_paths))
+
+        self.given_paths = given_paths
+        self.include_paths = include_paths
+        self.exclude_paths = exclude_paths
+        self.root_globs = root_globs
+        self.include_globs = include_globs
+        self.exclude_globs = exclude_globs
+
+
+        # Index the paths once, so checking an entry against them is O(1)
+        # NOTE: the root dir counts as a root, so everything under it is "selected"
+        self.roots = PathTrie(given_paths + [self.root_dir])
+        self.selected = PathTrie(given_paths + [self.root_dir] + include_paths)
+        self.excluded = PathTrie(exclude_paths)
+        self.given = PathTrie(given_paths)
+
+
+        # Listing limits, None means the limit is disabled
+        self.max_depth: int = config.max_depth
+        self.max_items: int | None = None if config.no_max_items else config.max_items
+        self.max_entries: int | None = None if config.no_max_entries else config.max_entries
+        self.gitignore_depth: int = config.gitignore_depth
+        self.no_gitignore: bool = config.no_gitignore
+        self.hidden_items: bool = config.hidden_items
+        self.follow_symlinks: bool = config.follow_symlinks
+        self.one_file_system: bool = config.one_file_system
+        self.no_files: bool = config.no_files
+        self.files_first: bool = config.files_first
+
+
+    def move_root(self, root_dir: Path) -> None:
+        """
+        Start the walk from a dir under the current root dir instead.
+
+        Args:
+            root_dir (Path): The new root dir, resolved
+        """
+
+        self.root_dir = root_dir
+        self.roots = PathTrie(self.given_paths + [root_dir])
+        self.selected = PathTrie(self.given_paths + [root_dir] + self.include_paths)
+
+
+    def root_cursor(self) -> "PlanCursor":
+        """
+        Get the cursor for the root dir of the walk.
+        """
+
+        return PlanCursor(self.roots.cursor(self.root_dir), self.selected.cursor(self.root_dir),
+            self.excluded.cursor(self.root_dir), self.given.cursor(self.root_dir),
+            self.root_globs.cursor(self.root_dir), self.include_globs.cursor(self.root_dir),
+            self.exclude_globs.cursor(self.root_dir))
+
+
+class PlanCursor:
+    """
+    The position of a dir in all the tries and glob matchers of a SelectionPlan.
+    """
+
+    __slots__ = ("roots", "selected", "excluded", "given",
+        "root_globs", "include_globs", "exclude_globs")
+
+    def __init__(self, roots: TrieCursor, selected: TrieCursor, excluded: TrieCursor,
+        given: TrieCursor, root_globs: GlobCursor, include_globs: GlobCursor,
+        exclude_globs: GlobCursor) -> None:
+        self.roots = roots
+        self.selected = selected
+        self.excluded = excluded
+        self.given = given
+        self.root_globs = root_globs
+        self.include_globs = include_globs
+        self.exclude_globs = exclude_globs
+
+
+    def child(self, name: str, is_dir: bool) -> "PlanCursor":
+        """
+        Move all the cursors to a child of the current dir.
+
+        Args:
+            name (str): Name of the child entry
+            is_dir (bool): Whether the child is a dir
+
+        Returns:
+            PlanCursor: The cursor for the child
+        """
+
+        return PlanCursor(self.roots.child(name), self.selected.child(name),
+            self.excluded.child(name), self.given.child(name),
+            self.root_globs.child(name, is_dir), self.include_globs.child(name, is_dir),
+            self.exclude_globs.child(name, is_dir))
+
+
+    @property
+    def is_root(self) -> bool:
+        """ True if this path is a given path or matches a root glob pattern """
+        return self.roots.exact or self.root_globs.matched
+
+
+    @property
+    def leads_to_root(self) -> bool:
+        """ True if this path or a path under it is known to be a root """
+        return self.roots.has_descendants or self.root_globs.matched
+
+
+    @property
+    def may_lead_to_root(self) -> bool:
+        """ True if a root glob pattern can still match a path under this dir """
+        return self.root_globs.alive
+
+
+    @property
+    def is_selected(self) -> bool:
+        """ True if this path is under a root or an --include path/pattern """
+        return self.selected.covered or self.root_globs.covered or self.include_globs.covered
+
+
+    @property
+    def is_excluded(self) -> bool:
+        """ True if this path is under an --exclude path/pattern """
+        return self.excluded.covered or self.exclude_globs.covered
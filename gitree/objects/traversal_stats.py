@@ -0,0 +1,70 @@
+# gitree/objects/traversal_stats.py
+
+"""
+Code file for housing TraversalStats class.
+"""
+
+
+class TraversalStats:
+    """
+    Counters collected by the items selection walk, logged with --verbose.
+
+    - A pruned dir is one rejected by the hidden, include/exclude or gitignore
+      rules. It is never listed, so nothing under it costs anything.
+    - A skipped dir is a selected one that is shown but not walked: a symlinked
+      dir, a dir walked already or a dir on another file system.
+    """
+
+    __slots__ = ("dirs_listed", "entries_scanned", "dirs_pruned", "files_pruned",
+        "dirs_skipped")
+
+    def __init__(self) -> None:
+        self.dirs_listed = 0
+        self.entries_scanned = 0
+        self.dirs_pruned = 0
+        self.files_pruned = 0
+        self.dirs_skipped = 0
+
+
+    def listed(self, entries: int) -> None:
+        """
+        Count a listed dir and the entries in it.
+
+        Args:
+            entries (int): Number of entries in the dir
+        """
+
+        self.dirs_listed += 1
+        self.entries_scanned += entries
+
+
+    def prune(self, is_dir: bool) -> None:
+        """
+        Count an entry rejected by the selection rules.
+
+        Args:
+            is_dir (bool): Whether the entry is a dir
+        """
+
+        if is_dir:
+            self.dirs_pruned += 1
+        else:
+            self.files_pruned += 1
+
+
+    def skip(self) -> None:
+        """
+        Count a selected dir that is not walked.
+        """
+
+        self.dirs_skipped += 1
+
+
+    def summary(self) -> str:
+        """
+        Get the counters as a single log line.
+        """
+
+        return (f"Traversal listed {self.dirs_listed} dirs, scanned {self.entries_scanned} "
+            f"entries, pruned {self.dirs_pruned} dirs and {self.files_pruned} files, "
+            f"skipped {self.dirs_skipped} dirs")
@@ -0,0 +1,132 @@
+# gitree/objects/tree_node.py
+
+"""
+Code file for housing TreeNode and DirNode classes.
+"""
+
+# Default libs
+import os
+from pathlib import Path
+from typing import Any
+
+
+# Flags of a node, stored in a single int
+FLAG_DIR = 1
+FLAG_HIDDEN = 2
+FLAG_SYMLINK = 4
+
+
+class TreeNode:
+    """
+    A file in the resolved tree.
+
+    - Stores only its name and a link to its parent dir; the full path is built
+      from the parents when it is asked for, so a tree of a million entries
+      does not hold a million Path objects.
+    - Works wherever a file Path of the resolved tree was used: str(), os.fspath(),
+      as_posix() and Path(node) all give the full path.
+    """
+
+    __slots__ = ("name", "parent", "flags", "size", "mtime")
+
+    def __init__(self, name: str, parent: "DirNode | None", flags: int = 0,
+        size: int | None = None, mtime: float | None = None) -> None:
+        """
+        Args:
+            name (str): Name of the entry, or the full path for the root
+            parent (DirNode | None): The parent dir, None for the root
+            flags (int): FLAG_DIR, FLAG_HIDDEN and FLAG_SYMLINK bits
+            size (int | None): Size in bytes, if known
+            mtime (float | None): Modification time, if known
+        """
+
+        self.name = name
+        self.parent = parent
+        self.flags = flags
+        self.size = size
+        self.mtime = mtime
+
+
+    @property
+    def path(self) -> Path:
+        """ The full path of the node """
+        return Path(str(self))
+
+
+    @property
+    def is_dir(self) -> bool:
+        return bool(self.flags & FLAG_DIR)
+
+
+    @property
+    def is_hidden(self) -> bool:
+        return bool(self.flags & FLAG_HIDDEN)
+
+
+    @property
+    def is_symlink(self) -> bool:
+        return bool(self.flags & FLAG_SYMLINK)
+
+
+    def as_posix(self) -> str:
+        return self.path.as_posix()
+
+
+    def __str__(self) -> str:
+        if self.parent is None:
+            return self.name
+
+        names = [self.name]
+        node = self.parent
+        while node.parent is not None:
+            names.append(node.name)
+            node = node.parent
+        names.append(node.name)
+
+        return os.path.join(*reversed(names))
+
+
+    def __fspath__(self) -> str:
+        return str(self)
+
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({str(self)!r})"
+
+
+class DirNode(TreeNode):
+    """
+    A dir in the resolved tree, holding its children in the same order as the walk.
+
+    - Also reads like the {"self": Path, "children": [...]} dict the services
+      used to get, through get() and [].
+    """
+
+    __slots__ = ("children",)
+
+    def __init__(self, name: str, parent: "DirNode | None", flags: int = FLAG_DIR,
+        size: int | None = None, mtime: float | None = None) -> None:
+        super().__init__(name, parent, flags | FLAG_DIR, size, mtime)
+        self.children: list[TreeNode] = []
+
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Read the node like a resolved tree dict.
+
+        Args:
+            key (str): "self" for the path of the dir, "children" for its items
+            default (Any): Returned for any other key
+        """
+
+        if key == "self":
+            return self.path
+        if key == "children":
+            return self.children
+        return default
+
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in ("self", "children"):
+            raise KeyError(key)
+        return self.get(key)
@@ -0,0 +1,157 @@
+# gitree/objects/walk_frame.py
+
+"""
+Code file for housing WalkFrame class.
+"""
+
+# Default libs
+from collections import deque
+from pathlib import Path
+
+# Deps from this project
+from ..constants.constant import ENTER_DIR, FILE_ITEM, LEAVE_DIR
+from .entry_budget import EntryBudget
+from .tree_node import FLAG_DIR
+
+
+class WalkFrame:
+    """
+    A dir being filled by the items selection walk.
+
+    - Every item added to the dir is appended to the shared events queue as an
+      (event, path, last, flags) tuple, which the walk yields to its consumer.
+    - Tracks the items added to the dir for --max-items, and takes every item
+      from the shared EntryBudget for --max-entries.
+    - A dir the walk enters only because a glob pattern may match under it is
+      not charged up front. It is added to its parent when the first item is
+      added to it, so dirs without any matches never show up or cost an entry.
+    - Holds the selected items of the dir that are still to be walked, so the
+      walk keeps its open dirs on a stack of frames instead of recursing.
+    - The events come in the order the items are drawn. The files are always
+      selected first, but with dirs first (no --files-first) their events are
+      held until the dir is left, and then come with their "last" known.
+    """
+
+    __slots__ = ("path", "parent", "events", "charged", "items_added", "max_items", "last",
+        "flags", "depth", "pending", "certain_after", "has_gitignore", "real_path",
+        "dev", "files_first", "held_files")
+
+    def __init__(self, path: Path, parent: "WalkFrame | None", max_items: int | None,
+        events: deque | None = None, last: bool | None = None, flags: int = FLAG_DIR,
+        real_path: str | None = None, files_first: bool = False) -> None:
+        """
+        Args:
+            path (Path): Path of the dir
+            parent (WalkFrame | None): The frame of the parent dir, None for the root
+            max_items (int | None): Max items per dir, None for no limit
+            events (deque | None): The events queue, shared with the parent by default
+            last (bool | None): Whether the dir is known to be the last item of its
+                parent, None if it is not known yet. Passed on with its enter event
+            flags (int): The TreeNode flags of the dir
+            real_path (str | None): The resolved POSIX path of the dir, the path
+                itself if not given (only for a path that is already resolved)
+            files_first (bool): Whether the files are drawn before the dirs, taken
+                from the parent if there is one
+        """
+
+        self.path = path
+        self.parent = parent
+        self.events: deque = events if events is not None else parent.events
+        self.charged = False
+        self.items_added = 0
+        self.max_items = max_items
+        self.last = last
+        self.flags = flags
+
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.pending: deque = deque()       # Selected items still to be walked
+        self.certain_after = 0              # Certain items among the pending ones
+        self.has_gitignore = False          # Whether the dir pushed a .gitignore
+        self.real_path = real_path if real_path is not None else path.as_posix()
+        self.dev: int | None = None         # Device of the dir, if it was checked
+        self.files_first = parent.files_first if parent is not None else files_first
+        self.held_files: list[tuple[Path, int]] = []    # Drawn after the dirs
+
+
+    @property
+    def full(self) -> bool:
+        """ True if no more items can be added to this dir """
+        return self.max_items is not None and self.items_added >= self.max_items
+
+
+    @property
+    def blocked(self) -> bool:
+        """ True if this dir is not charged yet and a parent has no room left for it """
+        frame = self
+        while not frame.charged and frame.parent is not None:
+            if frame.parent.full:
+                return True
+            frame = frame.parent
+        return False
+
+
+    def add_file(self, path: Path, flags: int, budget: EntryBudget) -> bool:
+        """
+        Add a file to this dir, adding the dir itself to its parents first if needed.
+
+        Args:
+            path (Path): Path of the file
+            flags (int): The TreeNode flags of the file
+            budget (EntryBudget): The --max-entries budget of the walk
+
+        Returns:
+            bool: True if the file was added, False if a limit was reached
+        """
+
+        if not self._take(budget):
+            return False
+
+        if self.files_first:
+            self.events.append((FILE_ITEM, path, None, flags))
+        else:
+            self.held_files.append((path, flags))
+        return True
+
+
+    def charge(self, budget: EntryBudget) -> bool:
+        """
+        Make sure this dir is in the output, by adding it to its parent.
+        The root of the walk is free, its entry is taken up front.
+
+        Args:
+            budget (EntryBudget): The --max-entries budget of the walk
+
+        Returns:
+            bool: True if the dir is in the output, False if a limit was reached
+        """
+
+        if not self.charged:
+            self.charged = self.parent is None or self.parent._take(budget)
+            if self.charged:
+                self.events.append((ENTER_DIR, self.path, self.last, self.flags))
+
+        return self.charged
+
+
+    def leave(self) -> None:
+        """
+        Close this dir, once the walk is done with it.
+        """
+
+        if self.charged:
+            for i, (path, flags) in enumerate(self.held_files, 1):
+                self.events.append((FILE_ITEM, path, i == len(self.held_files), flags))
+            self.held_files = []
+            self.events.append((LEAVE_DIR, self.path, None, self.flags))
+
+
+    def _take(self, budget: EntryBudget) -> bool:
+        """
+        Take a slot of this dir and an entry of the budget for a new item.
+        """
+
+        if not self.charge(budget) or self.full or not budget.take():
+            return False
+
+        self.items_added += 1
+        return True
@@ -6,6 +6,9 @@ Code file for housing CopyService Class.
 Static methods; copies exported output to clipboard
 """
 
+# Default libs
+import io
+
 # Dependencies
 import pyperclip
 
@@ -44,8 +47,14 @@ class CopyService:
         elif fmt == "json":
             lines = ExportService._export_json(ctx, config, tree_data)
 
+        elif fmt == "ndjson":
+            lines = ExportService._export_ndjson(ctx, config, tree_data)
+
+        text = io.StringIO()
+        ExportService._write_lines(text, lines)
+
         try:
-            pyperclip.copy("\n".join(lines))
+            pyperclip.copy(text.getvalue())
         except Exception as e:
             ctx.logger.log(Logger.ERROR, f"Failed to copy to clipboard: {e}")
 
@@ -7,15 +7,20 @@ Static methods; draws into the output_buffer in AppContext
 """
 
 # Default libs
-from typing import Any
-import json
+from typing import Any, Callable, Iterable, Iterator
+from pathlib import Path
 
 # Deps from this project
 from ..constants.constant import (FILE_EMOJI, NORMAL_DIR_EMOJI, EMPTY_DIR_EMOJI,
-    BRANCH, LAST, VERT, SPACE)
+    BRANCH, LAST, VERT, SPACE, ENTER_DIR, FILE_ITEM, LEAVE_DIR)
 from ..objects.app_context import AppContext
 from ..objects.config import Config
+from ..objects.flat_tree import FlatTree
+from ..objects.tree_node import TreeNode, DirNode
 from ..utilities.color_utility import Color
+from ..utilities.json_stream_utility import JsonStreamWriter
+from ..utilities.ndjson_stream_utility import NdjsonStreamWriter
+from ..utilities.tree_stream_utility import TreeStreamWriter
 
 
 class DrawingService:
@@ -44,80 +49,130 @@ class DrawingService:
         elif config.format == "json":
             DrawingService._draw_json(ctx, config, tree_data)
 
+        elif config.format == "ndjson":
+            DrawingService._draw_ndjson(ctx, config, tree_data)
+
 
     @staticmethod
-    def _draw_tree(ctx: AppContext, config: Config, tree_data: dict[str, Any]) -> None:
+    def can_stream(config: Config) -> bool:
         """
-        Draw the resolved tree structure in the "tree" format.
+        Check if the output can be streamed to the terminal while the items are
+        selected, instead of being drawn from the resolved tree dict afterwards.
+
+        Returns:
+            bool: True for every format, when the tree is only printed
+        """
+
+        return (config.format in ("tree", "md", "json", "ndjson") and not config.no_printing
+            and not (config.copy or config.export or config.zip or config.interactive))
+
+
+    @staticmethod
+    def stream(ctx: AppContext, config: Config, 
+        events: Iterable[tuple[str, Path, bool | None, int]]) -> None:
+        """
+        Draw the events of ItemsSelectionService.iter_items into the output_buffer,
+        line by line as they become final. Gives the same output as draw().
 
         Args:
             ctx (AppContext): The application context
             config (Config): The application configuration
-            tree_data (dict[str, Any]): The resolved tree dict to draw
+            events (Iterable[tuple[str, Path, bool | None, int]]): The events of the walk
         """
 
-        def _p(x: Any) -> str:
-            return x.as_posix() if hasattr(x, "as_posix") else str(x)
+        write = ctx.output_buffer.write
 
-        def _name(p: str) -> str:
-            s = p.rstrip("/\\")
-            return s.split("/")[-1].split("\\")[-1] if s else s
+        if config.format == "json":
+            json_writer = JsonStreamWriter(write, compact=config.compact)
+            for event, path, _, _ in events:
+                json_writer.feed(event, path.as_posix())
+            json_writer.close()
+            return
 
-        def _is_dir(node: Any) -> bool:
-            return isinstance(node, dict)
-
-        def _emoji_for(node: Any) -> str:
-            if not config.emoji:
-                return ""
-            if _is_dir(node):
-                ch = node.get("children", [])
-                return EMPTY_DIR_EMOJI if len(ch) == 0 else NORMAL_DIR_EMOJI
-            return FILE_EMOJI
-
-        def _children_sorted(children: list[Any]) -> list[Any]:
-            if config.files_first:
-                return sorted(children, key=lambda c: (0 if not _is_dir(c) else 1, _name(_p(c.get("self") if _is_dir(c) else c)).lower()))
-            return sorted(children, key=lambda c: (0 if _is_dir(c) else 1, _name(_p(c.get("self") if _is_dir(c) else c)).lower()))
-
-        def _write_line(prefix: str, connector: str, node: Any) -> None:
-            p = _p(node.get("self") if _is_dir(node) else node)
-            label = _name(p)
-            em = _emoji_for(node)
-
-            if config.no_color:
-                color = Color.default
-            elif DrawingService._is_hidden(p):
-                color = Color.grey
-            elif _is_dir(node):
-                color = Color.cyan
-            else:
-                color = Color.default
+        if config.format == "ndjson":
+            ndjson_writer = NdjsonStreamWriter(write)
+            for event, path, _, _ in events:
+                ndjson_writer.feed(event, path.as_posix())
+            return
 
-            if em:
-                ctx.output_buffer.write(f"{prefix}{connector}{em} {color(label)}")
-            else:
-                ctx.output_buffer.write(f"{prefix}{connector}{color(label)}")
+        writer = DrawingService._stream_writer(config, write)
+        if config.format == "md":
+            write("```text")
 
-        root_path = _p(tree_data.get("self"))
-        root_label = _name(root_path)
-        root_emoji = _emoji_for(tree_data)
+        for event, path, last, flags in events:
+            writer.feed(event, path, last, flags)
+        writer.close()
 
-        if root_emoji:
-            ctx.output_buffer.write(f"{root_emoji} "
-                f"{Color.cyan(root_label) if not config.no_color else root_label}")
-        else:
-            ctx.output_buffer.write(f"{Color.cyan(root_label) if not config.no_color else root_label}")
+        if config.format == "md":
+            write("```")
+
+
+    @staticmethod
+    def _stream_writer(config: Config, write: Callable[[str], None]) -> TreeStreamWriter:
+        """
+        Get a TreeStreamWriter drawing with the labels of this service.
+        """
+
+        return TreeStreamWriter(write, emoji=config.emoji,
+            format_root=lambda path, empty: DrawingService._format_root(config, path, empty),
+            format_item=lambda path, is_dir, empty, hidden: DrawingService._format_item(
+                config, path, is_dir, empty, hidden),
+            root_hidden=lambda path: DrawingService._is_hidden(DrawingService._p(path)))
+
+
+    @staticmethod
+    def _draw_tree(ctx: AppContext, config: Config, tree_data: dict[str, Any]) -> None:
+        """
+        Draw the resolved tree structure in the "tree" format.
+
+        The children of every dir are already in the order they are drawn (see
+        ItemsSelectionService.iter_items), so this is a single pass over the tree.
+
+        Args:
+            ctx (AppContext): The application context
+            config (Config): The application configuration
+            tree_data (dict[str, Any]): The resolved tree dict or FlatTree to draw
+        """
 
-        def _rec(node: dict[str, Any], prefix: str) -> None:
-            kids = _children_sorted(node.get("children", []))
-            for i, child in enumerate(kids):
-                connector = LAST if i == len(kids) - 1 else BRANCH
-                _write_line(prefix, connector, child)
-                if _is_dir(child):
-                    next_prefix = prefix + (SPACE if connector == LAST else VERT)
-                    _rec(child, next_prefix)
+        # A FlatTree is already in walk order, with every "last" known
+        if isinstance(tree_data, FlatTree):
+            writer = DrawingService._stream_writer(config, ctx.output_buffer.write)
+            for event, path, last, flags in tree_data.events():
+                writer.feed(event, path, last, flags)
+            writer.close()
+            return
 
-        _rec(tree_data, "")
+        def _is_dir(node: Any) -> bool:
+            return isinstance(node, (dict, DirNode))
+
+        root_path = tree_data.get("self")
+        ctx.output_buffer.write(DrawingService._format_root(config, root_path,
+            len(tree_data.get("children", [])) == 0))
+
+        # Draw depth first with a stack of (children, next index, prefix, hidden),
+        # so deep trees don't hit the recursion limit
+        # NOTE: a node is labelled by its name, its full path is never built
+        root_hidden = DrawingService._is_hidden(DrawingService._p(root_path))
+        stack = [(tree_data.get("children", []), 0, "", root_hidden)]
+        while stack:
+            kids, i, prefix, parent_hidden = stack.pop()
+            if i >= len(kids):
+                continue
+
+            stack.append((kids, i + 1, prefix, parent_hidden))
+            child = kids[i]
+            is_dir = _is_dir(child)
+            item = child if isinstance(child, TreeNode) or not is_dir else child.get("self")
+            hidden = parent_hidden or DrawingService._item_name(item).startswith(".")
+            connector = LAST if i == len(kids) - 1 else BRANCH
+
+            label = DrawingService._format_item(config, item, is_dir,
+                is_dir and len(child.get("children", [])) == 0, hidden)
+            ctx.output_buffer.write(f"{prefix}{connector}{label}")
+
+            if is_dir:
+                next_prefix = prefix + (SPACE if connector == LAST else VERT)
+                stack.append((child.get("children", []), 0, next_prefix, hidden))
 
 
     @staticmethod
@@ -138,24 +193,155 @@ class DrawingService:
     @staticmethod
     def _draw_json(ctx: AppContext, config: Config, tree_data: dict[str, Any]) -> None:
         """
-        Draw the resolved tree structure in the "json" format.
+        Draw the resolved tree structure in the "json" format, piece by piece,
+        without building a copy of the tree.
 
         Args:
             ctx (AppContext): The application context
             config (Config): The application configuration
-            tree_data (dict[str, Any]): The resolved tree dict to draw
+            tree_data (dict[str, Any]): The resolved tree dict or FlatTree to draw
+        """
+
+        writer = JsonStreamWriter(ctx.output_buffer.write, compact=config.compact)
+
+        if isinstance(tree_data, FlatTree):
+            for event, path, _, _ in tree_data.events():
+                writer.feed(event, path.as_posix())
+        else:
+            for event, path in DrawingService._dict_events(tree_data):
+                writer.feed(event, path)
+
+        writer.close()
+
+
+    @staticmethod
+    def _draw_ndjson(ctx: AppContext, config: Config, tree_data: dict[str, Any]) -> None:
+        """
+        Draw the resolved tree structure in the "ndjson" format, one record per line.
+
+        Args:
+            ctx (AppContext): The application context
+            config (Config): The application configuration
+            tree_data (dict[str, Any]): The resolved tree dict or FlatTree to draw
+        """
+
+        writer = NdjsonStreamWriter(ctx.output_buffer.write)
+
+        if isinstance(tree_data, FlatTree):
+            for event, path, _, _ in tree_data.events():
+                writer.feed(event, path.as_posix())
+        else:
+            for event, path in DrawingService._dict_events(tree_data):
+                writer.feed(event, path)
+
+
+    @staticmethod
+    def _dict_events(tree_data: dict[str, Any]) -> Iterator[tuple[str, str]]:
+        """
+        Walk a resolved tree dict as (event, path) tuples, in the order of its
+        children. Uses a stack, so deep trees don't hit the recursion limit.
+
+        Args:
+            tree_data (dict[str, Any]): The resolved tree dict
+
+        Returns:
+            Iterator[tuple[str, str]]: The events, with the POSIX path of every item
+        """
+
+        if not tree_data:
+            return
+
+        _p = DrawingService._p
+        yield ENTER_DIR, _p(tree_data.get("self"))
+        stack = [iter(tree_data.get("children", []))]
+
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                yield LEAVE_DIR, ""
+            elif isinstance(child, (dict, DirNode)):
+                yield ENTER_DIR, _p(child.get("self"))
+                stack.append(iter(child.get("children", [])))
+            else:
+                yield FILE_ITEM, _p(child)
+
+
+    @staticmethod
+    def _format_root(config: Config, path: Path | None, empty: bool) -> str:
+        """
+        Format the label of the root dir of the tree.
+
+        Args:
+            config (Config): The application configuration
+            path (Path | None): Path of the root, None if nothing was resolved
+            empty (bool): Whether the root has no items
+
+        Returns:
+            str: The label, with emoji and color if enabled
+        """
+
+        root_label = DrawingService._name(DrawingService._p(path))
+        root_label = Color.cyan(root_label) if not config.no_color else root_label
+
+        if config.emoji:
+            return f"{EMPTY_DIR_EMOJI if empty else NORMAL_DIR_EMOJI} {root_label}"
+        return root_label
+
+
+    @staticmethod
+    def _format_item(config: Config, path: Path, is_dir: bool, empty: bool,
+        hidden: bool | None = None) -> str:
+        """
+        Format the label of an item of the tree, without the prefix and connector.
+
+        Args:
+            config (Config): The application configuration
+            path (Path): Path of the item
+            is_dir (bool): Whether the item is a dir
+            empty (bool): Whether the dir has no items
+            hidden (bool | None): Whether the item or a dir above it is hidden, found
+                from the path if not given
+
+        Returns:
+            str: The label, with emoji and color if enabled
         """
 
-        def _norm(node: Any) -> Any:
-            if isinstance(node, dict):
-                s = node.get("self")
-                return {
-                    "self": s.as_posix() if hasattr(s, "as_posix") else str(s),
-                    "children": [_norm(c) for c in node.get("children", [])],
-                }
-            return node.as_posix() if hasattr(node, "as_posix") else str(node)
+        label = DrawingService._item_name(path)
+        if hidden is None:
+            hidden = DrawingService._is_hidden(DrawingService._p(path))
 
-        ctx.output_buffer.write(json.dumps(_norm(tree_data), indent=2))
+        if config.no_color:
+            color = Color.default
+        elif hidden:
+            color = Color.grey
+        elif is_dir:
+            color = Color.cyan
+        else:
+            color = Color.default
+
+        if not config.emoji:
+            return color(label)
+
+        em = (EMPTY_DIR_EMOJI if empty else NORMAL_DIR_EMOJI) if is_dir else FILE_EMOJI
+        return f"{em} {color(label)}"
+
+
+    @staticmethod
+    def _p(x: Any) -> str:
+        return x.as_posix() if hasattr(x, "as_posix") else str(x)
+
+
+    @staticmethod
+    def _item_name(x: Any) -> str:
+        return x.name if isinstance(x, (Path, TreeNode)) else DrawingService._name(
+            DrawingService._p(x))
+
+
+    @staticmethod
+    def _name(p: str) -> str:
+        s = p.rstrip("/\\")
+        return s.split("/")[-1].split("\\")[-1] if s else s
 
 
     @staticmethod
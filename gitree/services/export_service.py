@@ -5,12 +5,20 @@ Code file for housing ExportService Class
 """
 
 # Default libs
+import mmap, os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 # Deps from this project
+from ..constants.constant import EXPORT_READ_JOBS, EXPORT_READ_BUDGET, MMAP_READ_THRESHOLD
 from ..objects.app_context import AppContext
 from ..objects.config import Config
+from ..objects.file_content import FileContent
+from ..objects.flat_tree import FlatTree
+from ..objects.tree_node import DirNode
+from ..utilities.ndjson_stream_utility import NdjsonStreamWriter
 
 
 class ExportService:
@@ -33,66 +41,64 @@ class ExportService:
         elif fmt == "json":
             lines = ExportService._export_json(ctx, config, tree_data)
 
+        elif fmt == "ndjson":
+            lines = ExportService._export_ndjson(ctx, config, tree_data)
+
         else:
             return
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text("\n".join(lines), encoding="utf-8")
+        with open(output_path, "w", encoding="utf-8") as f:
+            ExportService._write_lines(f, lines)
 
         ctx.output_buffer.clear()
 
 
     @staticmethod
-    def _export_txt(ctx: AppContext, config: Config, tree_data: dict[str, Any]) -> list[str]:
-        structure = ctx.output_buffer.get_value()
-        out: list[str] = []
-
-        out.extend(structure)
-        out.append("")
-        out.append("==== FILE CONTENTS ====")
+    def _export_txt(ctx: AppContext, config: Config,
+        tree_data: dict[str, Any]) -> Iterator[str | Iterator[str]]:
+        # The structure is read back from the output_buffer as it is written out
+        yield from ctx.output_buffer.iter_lines()
+        yield ""
+        yield "==== FILE CONTENTS ===="
 
-        for fp in ExportService._iter_files(tree_data):
-            out.append("")
-            out.append(f"FILE: {fp}")
-            out.append("-" * (6 + len(str(fp))))
-            out.append(ExportService._read_text(fp, config.max_file_size).rstrip("\n"))
-
-        return out
+        for fp, content in ExportService._iter_contents(config, ExportService._iter_files(tree_data)):
+            yield ""
+            yield f"FILE: {fp}"
+            yield "-" * (6 + len(str(fp)))
+            yield content.iter_text(strip_newlines=True)
 
 
     @staticmethod
-    def _export_md(ctx: AppContext, config: Config, tree_data: dict[str, Any]) -> list[str]:
-        structure = ctx.output_buffer.get_value()
-        out: list[str] = []
-
-        out.append("## Project Structure")
-        out.extend(structure)       # Assuming structure is already in md format
-        out.append("## Files")
-        out.append("")
-
-        for fp in ExportService._iter_files(tree_data):
-            out.append(f"### File: {fp}")
-            out.append("")
-            out.append("```text")
-            out.append(ExportService._read_text(fp, config.max_file_size).rstrip("\n"))
-            out.append("```")
-            out.append("")
-
-        return out
+    def _export_md(ctx: AppContext, config: Config,
+        tree_data: dict[str, Any]) -> Iterator[str | Iterator[str]]:
+        yield "## Project Structure"
+        yield from ctx.output_buffer.iter_lines()     # Assuming structure is already in md format
+        yield "## Files"
+        yield ""
+
+        for fp, content in ExportService._iter_contents(config, ExportService._iter_files(tree_data)):
+            yield f"### File: {fp}"
+            yield ""
+            yield "```text"
+            yield content.iter_text(strip_newlines=True)
+            yield "```"
+            yield ""
 
 
     @staticmethod
     def _export_json(ctx: AppContext, config: Config, tree_data: dict[str, Any]) -> list[str]:
         import json
 
-        structure = ctx.output_buffer.get_value()
+        # The drawn JSON is kept as one string, the way it was drawn
+        structure = ["\n".join(ctx.output_buffer.iter_lines())]
 
         files = [
             {
                 "path": str(fp),
-                "content": ExportService._read_text(fp, config.max_file_size),
+                "content": content.text(),
             }
-            for fp in ExportService._iter_files(tree_data)
+            for fp, content in ExportService._iter_contents(config, ExportService._iter_files(tree_data))
         ]
 
         payload = {
@@ -103,73 +109,166 @@ class ExportService:
         return [json.dumps(payload, indent=2, ensure_ascii=False)]
 
 
+    @staticmethod
+    def _export_ndjson(ctx: AppContext, config: Config, tree_data: dict[str, Any]) -> Iterator[str]:
+        # The structure records, then one "content" record per file
+        yield from ctx.output_buffer.iter_lines()
+
+        for fp, content in ExportService._iter_contents(config, ExportService._iter_files(tree_data)):
+            yield NdjsonStreamWriter.record(fp.as_posix(), "content", content=content.text())
+
+
+    @staticmethod
+    def _write_lines(f: Any, lines: Iterable[str | Iterator[str]]) -> None:
+        """
+        Write lines to a text file, joined by newlines, without holding them all.
+
+        Args:
+            f (Any): The text file to write to
+            lines (Iterable[str | Iterator[str]]): The lines to write, a line given
+                in pieces (e.g. a file content being decoded) is an iterator
+        """
+
+        sep = ""
+        for line in lines:
+            f.write(sep)
+            if isinstance(line, str):
+                f.write(line)
+            else:
+                for piece in line:
+                    f.write(piece)
+            sep = "\n"
+
+
     @staticmethod
     def _iter_files(tree_data: Any) -> list[Path]:
         """
-        Flatten the resolved tree dict into a list of file Paths.
+        Flatten the resolved tree dict into a list of file Paths, in pre-order.
 
         Args:
-            tree_data (Any): A resolved tree dict with "self" and "children"
+            tree_data (Any): A resolved tree dict with "self" and "children", or a FlatTree
 
         Returns:
             list[Path]: A list of file paths
         """
 
-        if not isinstance(tree_data, dict):
+        if isinstance(tree_data, FlatTree):
+            return list(tree_data.iter_files())
+
+        if not isinstance(tree_data, (dict, DirNode)):
             return []
 
         out: list[Path] = []
+        stack = [iter(tree_data.get("children", []))]
+
+        # Walk with a stack of children iterators, so deep trees don't hit the recursion limit
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+            elif isinstance(child, (dict, DirNode)):
+                stack.append(iter(child.get("children", [])))
+            else:
+                out.append(child if isinstance(child, Path) else Path(str(child)))
 
-        def rec(node: dict[str, Any]) -> None:
-            for child in node.get("children", []):
-                if isinstance(child, dict):
-                    rec(child)
-                else:
-                    p = child if isinstance(child, Path) else Path(str(child))
-                    out.append(p)
-
-        rec(tree_data)
         return out
 
 
     @staticmethod
-    def _read_text(path: Path, max_size_mb: float = 1.0) -> str:
+    def _iter_contents(config: Config, files: Iterable[Path]) -> Iterator[tuple[Path, FileContent]]:
         """
-        Read a file as text with size limit and binary detection.
+        Read the files with a thread pool, and yield their contents in the given order.
+
+        - Reads ahead of the file being yielded with --jobs threads, or
+          EXPORT_READ_JOBS if --jobs is not given, since the reads are I/O bound.
+          --jobs 1 reads the files one at a time.
+        - A read in flight may hold up to --max-file-size, so only as many are
+          started as fit in EXPORT_READ_BUDGET (always at least one).
+
+        Args:
+            config (Config): The application configuration
+            files (Iterable[Path]): The files to read, in the output order
+
+        Returns:
+            Iterator[tuple[Path, FileContent]]: Every file with its content, see _read_content
+        """
+
+        jobs = config.jobs or EXPORT_READ_JOBS
+        max_size = config.max_file_size
+        max_bytes = max(int(max_size * 1024 * 1024), 1)
+        max_in_flight = max(1, min(4 * jobs, EXPORT_READ_BUDGET // max_bytes))
+
+        in_flight: deque[tuple[Path, Future]] = deque()
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            for fp in files:
+                if len(in_flight) >= max_in_flight:
+                    done, future = in_flight.popleft()
+                    yield done, future.result()
+                in_flight.append((fp, pool.submit(ExportService._read_content, fp, max_size)))
+
+            while in_flight:
+                done, future = in_flight.popleft()
+                yield done, future.result()
+
+
+    @staticmethod
+    def _read_content(path: Path, max_size_mb: float = 1.0) -> FileContent:
+        """
+        Read a file with size limit and binary detection, opening it only once.
+        Files of MMAP_READ_THRESHOLD bytes or more are memory-mapped instead of
+        read, and the pages are requested from the OS right away.
 
         Args:
             path (Path): The file path to read
             max_size_mb (float): Maximum file size in MB (default: 1.0)
 
         Returns:
-            str: File content, or placeholder for binary/large/inaccessible files
+            FileContent: File content, or placeholder for binary/large/inaccessible files
         """
-        p = path if isinstance(path, Path) else Path(str(path))
+
+        try:
+            fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        except PermissionError:
+            return FileContent(placeholder="[permission denied]")
+        except Exception as e:
+            return FileContent(placeholder=f"[error reading file: {str(e)}]")
 
         try:
             # Check file size
-            size_bytes = p.stat().st_size
+            size_bytes = os.fstat(fd).st_size
             size_mb = size_bytes / (1024 * 1024)
 
             if size_mb > max_size_mb:
-                return f"[file too large: {size_mb:.2f}mb]"
+                return FileContent(placeholder=f"[file too large: {size_mb:.2f}mb]")
+
 
+            # Map or read the whole file
+            if size_bytes >= MMAP_READ_THRESHOLD:
+                data = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+                if hasattr(mmap, "MADV_WILLNEED"):
+                    data.madvise(mmap.MADV_WILLNEED)
+            else:
+                chunks = []
+                while chunk := os.read(fd, max(size_bytes, 8192)):
+                    chunks.append(chunk)
+                data = b"".join(chunks) if len(chunks) != 1 else chunks[0]
 
-            # Check if binary (read first 8KB)
-            with open(p, 'rb') as f:
-                chunk = f.read(min(8192, size_bytes))
-                if b'\x00' in chunk:  # Null byte indicates binary
-                    return "[binary file]"
 
+            # Check if binary (first 8KB)
+            if data.find(b"\x00", 0, 8192) != -1:  # Null byte indicates binary
+                if isinstance(data, mmap.mmap):
+                    data.close()
+                return FileContent(placeholder="[binary file]")
 
-            # Read as text
-            return p.read_text(encoding="utf-8", errors="ignore")
+            return FileContent(data)
 
 
         except PermissionError:
-            return "[permission denied]"
+            return FileContent(placeholder="[permission denied]")
         except Exception as e:
-            return f"[error reading file: {str(e)}]"
+            return FileContent(placeholder=f"[error reading file: {str(e)}]")
+        finally:
+            os.close(fd)
 
 
     @staticmethod
@@ -21,6 +21,7 @@ from prompt_toolkit.styles import Style
 # Deps from this project
 from ..objects.app_context import AppContext
 from ..objects.config import Config
+from ..objects.tree_node import DirNode
 
 
 class InteractiveSelectionService:
@@ -277,7 +278,7 @@ class InteractiveSelectionService:
 
         children = resolved_root.get("children", [])
         for child in children:
-            if isinstance(child, dict):
+            if isinstance(child, (dict, DirNode)):
                 child_index = len(tree)
                 folder_to_subdirs[folder_index].append(child_index)
                 InteractiveSelectionService._build_tree(
@@ -324,7 +325,7 @@ class InteractiveSelectionService:
         new_children: List[Any] = []
 
         for child in children:
-            if isinstance(child, dict):
+            if isinstance(child, (dict, DirNode)):
                 filtered_child = InteractiveSelectionService._filter_resolved_root(child, selected_files)
                 if filtered_child.get("children"):
                     new_children.append(filtered_child)
@@ -5,16 +5,32 @@ Code file for the ItemsSelectionService class.
 """
 
 # default libs
-from typing import Any
-import os, glob, time
+from typing import Iterator
+from collections import deque
+import os, time
 from pathlib import Path
 
 # Deps from this project
+from ..constants.constant import (ENTER_DIR, FILE_ITEM, LISTING_CACHE_MAX_ENTRIES,
+    ASYNC_LISTING_JOBS)
 from ..objects.app_context import AppContext
 from ..objects.config import Config
+from ..objects.entry_budget import EntryBudget
+from ..objects.flat_tree import FlatTree
+from ..objects.git_index import GitIndex
 from ..objects.gitignore import GitIgnore
+from ..objects.glob_matcher import GlobMatcher, GlobCursor
+from ..objects.selection_plan import SelectionPlan, PlanCursor
+from ..objects.traversal_stats import TraversalStats
+from ..objects.tree_node import TreeNode, DirNode, FLAG_DIR, FLAG_HIDDEN, FLAG_SYMLINK
+from ..objects.walk_frame import WalkFrame
 from ..utilities.logging_utility import Logger
 from ..utilities.gitignore_utility import GitIgnoreMatcher
+from ..utilities.git_utility import find_git_dir, exclude_files
+from ..utilities.gitignore_cache_utility import GitIgnoreCache
+from ..utilities.listing_cache_utility import ListingCache
+from ..utilities.listing_utility import (DirectoryLister, ThreadedDirectoryLister,
+    AsyncDirectoryLister, IndexDirectoryLister)
 
 
 class ItemsSelectionService:
@@ -22,7 +38,7 @@ class ItemsSelectionService:
     Static class for resolving the args and forming an items dict.
     """
 
-    def resolve_items(ctx: AppContext, config: Config, start_time: float) -> dict[str, Any]:
+    def resolve_items(ctx: AppContext, config: Config, start_time: float) -> DirNode | dict:
         """
         Resolves the items to include in the output using the config object.
 
@@ -30,130 +46,506 @@ class ItemsSelectionService:
             start_time (float): relative time value to log performance of the service
 
         Returns:
-            dict: A dict of the resolved items
+            DirNode: The resolved root, which reads like a {"self": Path, "children": [...]}
+                dict. An empty dict if no paths were found
         """
 
-        # Resolve all the root paths first
-        # NOTE: the root path is appended at the end of the list of resolved paths
-        resolved_root_paths = ItemsSelectionService._resolve_given_paths(
-            ctx, config, config.paths)
-        resolved_include_paths = ItemsSelectionService._resolve_given_paths(
-            ctx, config, config.include)
-        resolved_exclude_paths = ItemsSelectionService._resolve_given_paths(
-            ctx, config, config.exclude)
+        resolved_root: DirNode | dict = {}
+        stack: list[DirNode] = []
+
+        # Build the tree from the events of the walk, storing only the names
+        for event, path, _, flags in ItemsSelectionService.iter_items(ctx, config, start_time):
+            if event == ENTER_DIR:
+                if stack:
+                    node = DirNode(path.name, stack[-1], flags)
+                    stack[-1].children.append(node)
+                else:
+                    node = resolved_root = DirNode(str(path), None, flags)
+                stack.append(node)
+
+            elif event == FILE_ITEM:
+                stack[-1].children.append(TreeNode(path.name, stack[-1], flags))
+
+            else:
+                stack.pop()
+
+        return resolved_root
+
+
+    def resolve_flat_items(ctx: AppContext, config: Config, 
+        start_time: float) -> FlatTree | dict:
+        """
+        Resolves the items like resolve_items, into a FlatTree instead of nodes.
+        Used when the tree is not edited afterwards, since it is much smaller for
+        large trees and has no limit on their depth.
+
+        Args:
+            start_time (float): relative time value to log performance of the service
+
+        Returns:
+            FlatTree: The resolved tree, in the pre-order of the walk. An empty dict
+                if no paths were found
+        """
+
+        tree = FlatTree()
+        stack: list[int] = []
+
+        for event, path, _, flags in ItemsSelectionService.iter_items(ctx, config, start_time):
+            if event == ENTER_DIR:
+                stack.append(tree.add(path.name if stack else str(path), 
+                    stack[-1] if stack else -1, flags))
+
+            elif event == FILE_ITEM:
+                tree.add(path.name, stack[-1], flags)
+
+            else:
+                tree.close(stack.pop())
+
+        return tree.finish() if len(tree) else {}
+
+
+    def iter_items(ctx: AppContext, config: Config, 
+        start_time: float) -> Iterator[tuple[str, Path, bool | None, int]]:
+        """
+        Resolves the items to include in the output using the config object, and
+        yields them as soon as they are selected, as (event, path, last, flags) tuples:
+
+        - (ENTER_DIR, dir_path, last, flags) when a dir is added, before its items
+        - (FILE_ITEM, file_path, None, flags) for a file in the last entered dir
+        - (LEAVE_DIR, dir_path, None, flags) once all the items of the dir were yielded
+
+        The items come in the order they are drawn: in every dir the dirs come before
+        the files (the files first with --files-first), each sorted by name, so the
+        resolved tree needs no sorting afterwards. last tells if the item is known to
+        be the last of its parent, None if not known yet. flags are the TreeNode
+        flags of the item. Nothing is yielded if no paths were found.
+
+        Args:
+            start_time (float): relative time value to log performance of the service
+        """
+
+        # Resolve all the given paths once, the walk only uses this plan
+        plan = ItemsSelectionService._build_plan(ctx, config)
         ctx.logger.log(Logger.INFO, 
             f"Selected roots, includes, excludes at: {round((time.time()-start_time)*1000, 2)} ms")
         
 
-        # Safety check to avoid crashes on no paths found
-        if not resolved_root_paths:
+        # Safety check to avoid crashes on no paths given
+        if plan is None:
             ctx.logger.log(Logger.ERROR, "No included paths were found matching given args")
-            return {}
+            return
+
+
+        # NOTE: with --cache, only the dirs that changed since the last run are listed,
+        # and only the .gitignore files that changed are compiled again
+        use_cache = config.cache and not config.no_cache
+        cache = ListingCache(Config._get_user_cache_dir() / "listing.json", 
+            LISTING_CACHE_MAX_ENTRIES) if use_cache else None
+        gitignore_cache = GitIgnoreCache(
+            Config._get_user_cache_dir() / "gitignore.json" if use_cache else None)
+
+
+        # With --source=index, list the tracked files from the git index instead
+        lister: DirectoryLister | None = None
+        if config.source == "index":
+            index = ItemsSelectionService._read_index(ctx, plan, 
+                Config._get_user_cache_dir() if use_cache else None)
+            if index is not None:
+                lister = IndexDirectoryLister(index, config.untracked, cache)
+
+                # Tracked files are never ignored, so the .gitignore files are only
+                # needed for the untracked ones
+                if not config.untracked:
+                    plan.no_gitignore = True
+
+
+        # Else use the threaded lister if --jobs is used, or the asyncio one if asked
+        # for, they give the same result
+        if lister is None:
+            if config.backend == "asyncio":
+                lister = AsyncDirectoryLister(config.jobs or ASYNC_LISTING_JOBS, cache)
+            elif (config.jobs or 1) > 1:
+                lister = ThreadedDirectoryLister(config.jobs, cache)
+            else:
+                lister = DirectoryLister(cache)
+
+
+        # Start from the parent dir and keep adding items, depth first
+        # includes resolving hidden_files, gitignore, include, exclude and glob patterns
+        # NOTE: the root itself takes one entry of the budget. With only glob patterns
+        # given, the root is added with its first match (or up front if it is a match
+        # itself), so no match means no output
+        stats = TraversalStats()
+        budget = EntryBudget(plan.max_entries, used=1)
+
+        with lister:
+            gitignore_matcher = GitIgnoreMatcher(ItemsSelectionService._load_excludes(
+                ctx, config, plan, gitignore_cache))
+            if plan.root_globs:
+                ItemsSelectionService._narrow_root(ctx, config, plan,
+                    gitignore_matcher=gitignore_matcher, gitignore_cache=gitignore_cache,
+                    lister=lister)
+
+            root_frame = WalkFrame(plan.root_dir, parent=None, max_items=plan.max_items,
+                events=deque(), last=True, files_first=plan.files_first)
+            if plan.given_paths or plan.root_cursor().root_globs.matched:
+                root_frame.charge(budget)
+
+            yield from ItemsSelectionService._walk(ctx, config, plan, 
+                root_frame=root_frame, budget=budget, gitignore_matcher=gitignore_matcher,
+                gitignore_cache=gitignore_cache, lister=lister, visited=set(), stats=stats)
+
+        ctx.logger.log(Logger.INFO, stats.summary())
+        gitignore_cache.save()
+        if cache is not None:
+            cache.save()
+            ctx.logger.log(Logger.INFO, 
+                f"Listing cache had {cache.hits} hits and {cache.misses} misses")
+
+
+        # The glob patterns are matched during the walk, so only now it is known
+        # which of them matched nothing (unless the walk was cut short)
+        if not budget.exhausted:
+            for globs in (plan.root_globs, plan.include_globs, plan.exclude_globs):
+                for pattern in globs.unmatched():
+                    ctx.logger.log(Logger.WARNING, 
+                        f"No matches found for glob pattern '{pattern}'")
 
+        if not root_frame.charged:
+            ctx.logger.log(Logger.ERROR, "No included paths were found matching given args")
 
-        # Start from the parent dir and keep adding items recursively
-        # includes resolving hidden_files, gitignore, include and exclude
-        resolved_items, _ = ItemsSelectionService._resolve_items_rec(ctx, config, 
-            resolved_paths=resolved_root_paths, curr_depth=0, curr_entries=1,
-            gitignore_matcher=GitIgnoreMatcher(),
-            curr_dir=resolved_root_paths[-1], include_paths=resolved_include_paths[:-1], 
-            exclude_paths=resolved_exclude_paths[:-1])
 
-        return resolved_items
+    @staticmethod
+    def _build_plan(ctx: AppContext, config: Config) -> SelectionPlan | None:
+        """
+        Resolve the roots, includes and excludes given in the CLI args into a
+        SelectionPlan for the walk.
+
+        Returns:
+            SelectionPlan | None: The plan, or None if no root paths were given
+        """
+
+        given_paths, root_globs = ItemsSelectionService._resolve_given_paths(
+            ctx, config, config.paths)
+        if not given_paths and not root_globs:
+            return None
+
+        include_paths, include_globs = ItemsSelectionService._resolve_given_paths(
+            ctx, config, config.include)
+        exclude_paths, exclude_globs = ItemsSelectionService._resolve_given_paths(
+            ctx, config, config.exclude)
+
+        return SelectionPlan(config, given_paths, root_globs, 
+            include_paths, include_globs, exclude_paths, exclude_globs)
+
+
+    @staticmethod
+    def _load_excludes(ctx: AppContext, config: Config, plan: SelectionPlan,
+        gitignore_cache: GitIgnoreCache) -> list[GitIgnore]:
+        """
+        Load the ignore rules git reads besides the .gitignore files: the repo's
+        .git/info/exclude and the user's global excludes file. They are loaded once
+        for the whole walk, rooted at the top of the checkout.
+
+        Returns:
+            list[GitIgnore]: The loaded files, from highest to lowest precedence.
+                Empty if the walk root is not in a git checkout
+        """
+
+        if plan.no_gitignore:
+            return []
+
+        found = find_git_dir(plan.root_dir)
+        if found is None:
+            return []
+
+        worktree, git_dir = found
+        excludes = [GitIgnore(ctx, config, gitignore_path=path, cache=gitignore_cache,
+            root=worktree) for path in exclude_files(git_dir)]
+
+        ctx.logger.log(Logger.INFO, f"Loaded {len(excludes)} exclude files of {worktree}")
+        return excludes
+
+
+    @staticmethod
+    def _read_index(ctx: AppContext, plan: SelectionPlan, 
+        cache_dir: Path | None) -> GitIndex | None:
+        """
+        Read the git index of the checkout the walk root is in, for --source=index.
+
+        Returns:
+            GitIndex | None: The index, or None (logged) to list the disk instead
+        """
+
+        try:
+            index = GitIndex.find(plan.root_dir, cache_dir)
+        except (OSError, ValueError) as e:
+            ctx.logger.log(Logger.WARNING, f"Could not read the git index ({e}), "
+                "listing the disk instead")
+            return None
+
+        if index is None:
+            ctx.logger.log(Logger.WARNING, f"No git index found for {plan.root_dir}, "
+                "listing the disk instead")
+            return None
+
+        ctx.logger.log(Logger.INFO, f"Read {len(index)} entries from the git index")
+        return index
 
 
     @staticmethod
-    def _resolve_given_paths(ctx: AppContext, config: Config, attr: list[str]) -> list[Path]:
+    def _resolve_given_paths(ctx: AppContext, config: Config, 
+        attr: list[str]) -> tuple[list[Path], GlobMatcher]:
         """
-        Resolve the given paths in the CLI args. Handles glob patterns, simple paths,
-        and common-parent-search.
+        Resolve the given paths in the CLI args. Handles glob patterns and simple paths.
+
+        Glob patterns are not expanded here, they are compiled and matched during the
+        walk, so any number of them costs one walk and ignored dirs are never expanded.
 
         Args:
             attr (list[str]): An attr to resolve the matching paths for
 
         Returns:
-            list[Path]: A list of paths to be added, with the parent appended at the end
+            list[Path]: The resolved simple paths
+            GlobMatcher: The compiled glob patterns
         """
 
-        calculated_paths: list[Path] = []
+        given_paths: list[Path] = []
+        patterns: list[str] = []
         base_path = Path(os.getcwd())          # This is needed to resolve paths later
 
 
-        if not attr:        # Safety check
-            return [base_path]
-
-
         # Separately resolve for glob patterns and proper paths
         # Handles for *, ?, [] based patterns
-        for path_str in attr:
+        for path_str in attr or []:
 
             # If a glob pattern is provided
             if ItemsSelectionService._isglob(path_str):
-
-                # Include underlying and hidden items as well
-                matched_paths = glob.glob(path_str, recursive=True, include_hidden=True)
-
-                # If the glob could not be resolved
-                if not matched_paths:
-                    ctx.logger.log(Logger.WARNING, 
-                        f"No matches found for glob pattern '{path_str}'")
-                    
-                # Append the matches to the calculated paths
-                for path_str in matched_paths:
-                    calculated_paths.append(Path(path_str).resolve(strict=False))
+                patterns.append(path_str)
                 
             else:
                 path = Path(path_str)
                 resolved_path = (base_path / path).resolve(strict=False)
-                calculated_paths.append(resolved_path)
+                given_paths.append(resolved_path)
+
+        return given_paths, GlobMatcher(patterns, base_path)
+    
+
+    @staticmethod
+    def _narrow_root(ctx: AppContext, config: Config, plan: SelectionPlan, *,
+        gitignore_matcher: GitIgnoreMatcher, gitignore_cache: GitIgnoreCache,
+        lister: DirectoryLister) -> None:
+        """
+        Move the root of the walk down to the common parent of the root glob matches
+        and the given paths, the same root as for the expanded patterns.
+
+        The walk would start from the literal dir before the first wildcard, which
+        for a pattern like "s?c/**/*.py" is the current dir. So the bases of the
+        patterns that match nothing are left out first. Then while a single item
+        of the root leads to a match and that item is a dir, the root moves into it,
+        down to a matched dir at most. The items that may lead to a match are probed
+        with _has_glob_match. The .gitignore files of the dirs moved through still
+        apply to the walk.
+        """
 
+        first_root = plan.root_dir
+        if len(plan.root_paths) > 1:
+            roots = plan.given_paths + [base for p, base in enumerate(plan.root_globs.bases)
+                if ItemsSelectionService._has_glob_match(lister,
+                    plan.root_globs.cursor(base, pattern=p), base, TraversalStats())]
+            if roots and Path(os.path.commonpath(roots)) != plan.root_dir:
+                plan.move_root(Path(os.path.commonpath(roots)))
+
+        root, cursor = plan.root_dir, plan.root_cursor()
+        while not (cursor.given.covered or cursor.root_globs.matched):
+            frame = WalkFrame(root, parent=None, max_items=None, events=deque())
+            opened = ItemsSelectionService._open_dir(ctx, config, plan, frame=frame,
+                budget=EntryBudget(None), cursor=cursor, gitignore_matcher=gitignore_matcher,
+                gitignore_cache=gitignore_cache, lister=lister, visited=set(),
+                stats=TraversalStats())
+
+            # NOTE: the frame is charged if a match in the dir itself was pruned, and
+            # --max-items may have left some items out
+            leading: list[tuple] = []
+            if opened and not frame.charged and not (plan.max_items is not None
+                and frame.certain_after >= plan.max_items):
+                for item in frame.pending:
+                    item_path, is_dir, flags, item_cursor, certain = item
+                    if certain or ((plan.follow_symlinks or not flags & FLAG_SYMLINK) and
+                        ItemsSelectionService._has_glob_match(lister,
+                            item_cursor.root_globs, item_path, TraversalStats())):
+                        leading.append(item)
+                        if len(leading) > 1: break
+
+            if len(leading) != 1 or not leading[0][1] or leading[0][2] & FLAG_SYMLINK:
+                if frame.has_gitignore:
+                    gitignore_matcher.pop()
+                break
 
-        # Replace the placeholder for the parent path in the calculated paths
-        if calculated_paths:
-            calculated_paths.append(Path(os.path.commonpath(calculated_paths)))
+            root, cursor = leading[0][0], leading[0][3]
+
+        if root != plan.root_dir:
+            plan.move_root(root)
+        if root != first_root:
+            ctx.logger.log(Logger.INFO, f"Moved the root down to the common parent "
+                f"of the glob matches: {root}")
 
-        return calculated_paths
-    
 
     @staticmethod
-    def _resolve_items_rec(ctx: AppContext, config: Config, *,
-        resolved_paths: list[Path], curr_dir: Path, curr_depth: int, curr_entries: int,
-        include_paths: list[Path], exclude_paths: list[Path], 
-        gitignore_matcher: GitIgnoreMatcher) -> tuple[dict[str, Any], int]:
+    def _walk(ctx: AppContext, config: Config, plan: SelectionPlan, *,
+        root_frame: WalkFrame, budget: EntryBudget, gitignore_matcher: GitIgnoreMatcher,
+        gitignore_cache: GitIgnoreCache, lister: DirectoryLister,
+        visited: set[tuple[int, int]],
+        stats: TraversalStats) -> Iterator[tuple[str, Path, bool | None, int]]:
         """
-        Resolve the paths recursively.
+        Walk the dirs depth first, yielding the events of the selected items.
 
-        Returns:
-            dict[str, Any]: A dict of the resolved root and a list of children paths
-            int: current entries to keep track of the number of entries during recursion
+        The open dirs are kept on a stack of frames, each holding its selected items
+        that are still to be walked, so the depth of the tree is not limited by the
+        Python recursion limit. The budget is shared by the whole walk, once it is
+        exhausted nothing else is listed. With --follow-symlinks, visited holds the
+        (device, inode) of every walked dir, so symlink loops are walked only once.
         """
 
-        resolved_root: dict[str, Any] = {
-            "self": curr_dir,
-            "children": []
-        }
+        # Without any limits, a dir followed by a certain item is known not to be last
+        unlimited = plan.max_items is None and budget.limit is None
+
+        stack: list[WalkFrame] = []
+        if ItemsSelectionService._open_dir(ctx, config, plan, frame=root_frame, 
+            budget=budget, cursor=plan.root_cursor(), gitignore_matcher=gitignore_matcher,
+            gitignore_cache=gitignore_cache, lister=lister, visited=visited, stats=stats):
+            stack.append(root_frame)
+        yield from ItemsSelectionService._drain(root_frame.events)
+
+
+        while stack:
+            frame = stack[-1]
+
+            # Close the dir once all its items are walked, or if reached --max-items
+            # or --max-entries
+            if not frame.pending or frame.full or budget.exhausted:
+                if frame.has_gitignore:
+                    gitignore_matcher.pop()
+
+                stack.pop()
+                frame.leave()
+                yield from ItemsSelectionService._drain(frame.events)
+                continue
+
+            item_path, is_dir, flags, item_cursor, certain = frame.pending.popleft()
+            frame.certain_after -= certain
+
 
-        # Implementation for --max-depth
-        if curr_depth > config.max_depth - 1:
-            return resolved_root, curr_entries
+            # If the item is a file then add directly, else open the dir for it
+            # NOTE: adding an item to a dir that is not charged yet adds the dir first
+            if not is_dir:
+                if not frame.add_file(item_path, flags, budget): 
+                    frame.pending.clear()
+                yield from ItemsSelectionService._drain(frame.events)
+                continue
+
+            # NOTE: with dirs first, the files of the dir are drawn after its dirs
+            last = False if frame.held_files else True if not frame.pending else \
+                False if unlimited and frame.certain_after else None
+
+            # A dir walked only because of a glob pattern is charged on its first match
+            child_frame = WalkFrame(item_path, parent=frame, max_items=plan.max_items,
+                last=last, flags=flags, real_path=ItemsSelectionService._real_path(
+                    frame, item_path.name, flags & FLAG_SYMLINK))
+            if certain and not child_frame.charge(budget): 
+                frame.pending.clear()
+                continue
+
+            if ItemsSelectionService._open_dir(ctx, config, plan, frame=child_frame, 
+                budget=budget, cursor=item_cursor, gitignore_matcher=gitignore_matcher,
+                gitignore_cache=gitignore_cache, lister=lister, visited=visited, stats=stats):
+                stack.append(child_frame)
+            yield from ItemsSelectionService._drain(child_frame.events)
+
+
+    @staticmethod
+    def _open_dir(ctx: AppContext, config: Config, plan: SelectionPlan, *,
+        frame: WalkFrame, budget: EntryBudget, cursor: PlanCursor,
+        gitignore_matcher: GitIgnoreMatcher, gitignore_cache: GitIgnoreCache,
+        lister: DirectoryLister, visited: set[tuple[int, int]],
+        stats: TraversalStats) -> bool:
+        """
+        List the frame's dir and select the items to walk in it, into frame.pending.
+
+        The cursor points at the frame's dir in the tries of the selection plan. Every
+        child is checked against the rules before it is walked, so a rejected dir is
+        pruned and never listed.
+
+        Returns:
+            bool: True if the dir was opened, False if it was closed right away
+        """
+
+        curr_dir = frame.path
+        curr_depth = frame.depth
+
+        # Implementation for --max-depth, and stop the walk if --max-entries is reached
+        # or if nothing found in this dir could be added anymore
+        if curr_depth > plan.max_depth - 1 or budget.exhausted or frame.blocked:
+
+            # A dir walked only because of a glob pattern is still shown at the depth
+            # limit if a match is under it, like the dirs leading to any other match
+            if not (frame.charged or budget.exhausted or frame.blocked) and \
+                cursor.may_lead_to_root and ItemsSelectionService._has_glob_match(
+                    lister, cursor.root_globs, curr_dir, stats):
+                frame.charge(budget)
+
+            frame.leave()
+            return False
+
+        # Symlinked dirs are only walked with --follow-symlinks, and a dir walked
+        # already or on another file system is shown, but not walked
+        if not ItemsSelectionService._may_enter(plan, frame, visited):
+            stats.skip()
+            frame.leave()
+            return False
         
 
         # Get the dir's children, sorted order, and files first
-        children_to_add = sorted(curr_dir.iterdir(), key=lambda p: (p.is_dir(), p.name.lower()))
+        # NOTE: the entries come from os.scandir, so is_dir() does not hit the disk again
+        children_to_add = lister.list(curr_dir)
+        stats.listed(len(children_to_add))
 
 
         # Setup gitignore object for this dir (if there is a .gitignore)
-        if curr_depth <= config.gitignore_depth and (curr_dir / ".gitignore").is_file():
-            gitignore_matcher.add_gitignore(
-                GitIgnore(ctx, config, gitignore_path=(curr_dir / ".gitignore")))
+        # NOTE: it is popped again when leaving this dir, so siblings don't check it
+        frame.has_gitignore = (not plan.no_gitignore and curr_depth <= plan.gitignore_depth 
+            and any(entry.name == ".gitignore" and entry.is_file() for entry in children_to_add))
+        if frame.has_gitignore:
+            gitignore_matcher.push(
+                GitIgnore(ctx, config, gitignore_path=Path(frame.real_path, ".gitignore"),
+                    cache=gitignore_cache, root=Path(frame.real_path)))
+
+
+        # At most this many children can be added to this dir, since --max-items
+        # caps the dir and every child costs at least one of the remaining entries
+        selection_cap = min(
+            plan.max_items if plan.max_items is not None else len(children_to_add),
+            budget.remaining if budget.remaining is not None else len(children_to_add))
 
 
-        items_added = 0
-        # Now traverse the dir and add items
-        for item_path in children_to_add:
+        certain_items = 0
+        matches = 0             # Children matching a glob pattern, even if dropped
+        # Filter the children of this dir, without walking into them
+        for entry in children_to_add:
+            if certain_items >= selection_cap: break
+
+            is_dir = entry.is_dir()
 
             # If --no-files is used, then skip files
-            if item_path.is_file() and config.no_files: continue
+            # NOTE: a skipped file matching a glob pattern still shows this dir
+            if not is_dir and plan.no_files:
+                matches += (not frame.charged and cursor.may_lead_to_root
+                    and cursor.root_globs.child(entry.name, is_dir=False).matched)
+                continue
+
+            item_cursor = cursor.child(entry.name, is_dir)
+            matches += item_cursor.root_globs.matched
+            certain = True
 
 
             # NOTE: this whole if-elif block bellow basically solves the problem of
@@ -162,73 +554,152 @@ class ItemsSelectionService:
 
 
             # If current dir path is not given
-            if not ItemsSelectionService._dir_path_under_given_paths(config, curr_dir):
+            if not cursor.given.covered:
                 
-                # If it is a file and it is not is resolved paths
-                # and if the current dir we are working for, is not given in paths
-                if (item_path.is_file() and not item_path in resolved_paths):
+                # If it is a file and it is not in the given paths or glob matches
+                if (not is_dir and not item_cursor.is_root):
                     continue
 
-                # If it is a dir and it has no file under it that is in resolved_paths
-                elif (item_path.is_dir() and 
-                    not any(ItemsSelectionService._isunder(t, [item_path]) for t in resolved_paths)):
-                    continue
+                # If it is a dir and it has no given path or glob match under it,
+                # it is walked anyway if a glob pattern may match under it
+                elif (is_dir and not item_cursor.leads_to_root):
+                    if not item_cursor.may_lead_to_root:
+                        continue
+                    certain = False
 
 
-            # If reached --max-items or --max-entries, then exit
-            # NOTE: This is ok for now, but needs to be corrected later
-            if (not config.no_max_items and items_added >= config.max_items or
-                not config.no_max_entries and curr_entries >= config.max_entries): 
-                break
+            # Prune the item if any of the rules rejects it, cheapest checks first
+            # Check if it is a hidden file/dir and hidden-items flag is not used
+            if not plan.hidden_items and ItemsSelectionService._ishidden(entry.name):
+                stats.prune(is_dir)
+                continue
 
+            # Check if the item is not in resolved paths or include paths,
+            # or if it is under an exclude path or pattern
+            if not item_cursor.is_selected or item_cursor.is_excluded:
+                stats.prune(is_dir)
+                continue
 
-            # NOTE: DANGEROUS IF-STATEMENT AHEAD!
+            flags = ((FLAG_DIR if is_dir else 0) | (FLAG_SYMLINK if entry.is_symlink() else 0) |
+                (FLAG_HIDDEN if ItemsSelectionService._ishidden(entry.name) else 0))
 
-            # Check if it is not a hidden file/dir or hidden-items flag is used
-            # Check if the item is in resolved paths, or in include paths
-            # Check if the item is defined by an include pattern
-            # Or if there is a gitignore that says it is excluded
-            if ((config.hidden_items or not ItemsSelectionService._ishidden(item_path)) and
-                ItemsSelectionService._isunder(item_path, resolved_paths + include_paths) and 
-                not ItemsSelectionService._isunder(item_path, exclude_paths) and 
-                (not curr_depth > config.gitignore_depth and 
-                not gitignore_matcher.excluded(item_path))):  
+            # Check if there is a gitignore that says it is excluded
+            # NOTE: files tracked by git are never ignored. The path is built from the
+            # resolved path of this dir, so the check does not touch the disk
+            if (curr_depth > plan.gitignore_depth or (not lister.is_tracked(entry) and
+                gitignore_matcher.excluded(ItemsSelectionService._real_path(
+                    frame, entry.name, flags & FLAG_SYMLINK), is_dir=is_dir))):
+                stats.prune(is_dir)
+                continue
 
+            frame.pending.append((Path(entry.path), is_dir, flags, item_cursor, certain))
+            certain_items += certain
 
-                    items_added += 1
-                    curr_entries += 1  
-                    
-                    
-                    # If the item is a file then append directly, else resolve for it
-                    if item_path.is_file():
-                        resolved_root["children"].append(item_path)
+        frame.certain_after = certain_items
 
-                    else:      
-                        resolved_dir, curr_entries = ItemsSelectionService._resolve_items_rec(
-                            ctx, config, resolved_paths=resolved_paths, 
-                            curr_entries=curr_entries, curr_dir=item_path, include_paths=include_paths, gitignore_matcher=gitignore_matcher,
-                            exclude_paths=exclude_paths, curr_depth=curr_depth+1)
-                            
-                        resolved_root["children"].append(resolved_dir)
-                        
+        # The dirs leading to a glob match are shown, even if the match itself is
+        # pruned by a rule, the same as when the patterns were expanded up front
+        # NOTE: so the dir is only charged here if a match was dropped
+        if matches and matches > sum(item[3].root_globs.matched for item in frame.pending):
+            frame.charge(budget)
 
-        return resolved_root, curr_entries
+
+        # Start listing the selected dirs in the background (if --jobs is used)
+        lister.prefetch(item_path for item_path, is_dir, flags, _, _ in frame.pending
+            if is_dir and (plan.follow_symlinks or not flags & FLAG_SYMLINK))
+        return True
 
 
     @staticmethod
-    def _dir_path_under_given_paths(config: Config, dir_path: Path) -> bool:
-        """ 
-        Check if the dir path was given by the user
+    def _has_glob_match(lister: DirectoryLister, cursor: GlobCursor, dir_path: Path,
+        stats: TraversalStats) -> bool:
         """
+        Check if a root glob pattern matches a path under a dir, without selecting
+        anything. Like the expanded patterns, hidden and ignored paths count too.
+        Only the dirs a pattern can still match under are listed, symlinked dirs are
+        not followed, and the search stops at the first match.
 
-        given_paths: list[Path] = []
+        Returns:
+            bool: True if a path under the dir matches a root glob pattern
+        """
 
-        for path_str in config.paths:
-            if not ItemsSelectionService._isglob(path_str): 
-                given_paths.append(Path(path_str).resolve(strict=False))
+        stack: list[tuple[str | Path, GlobCursor]] = [(dir_path, cursor)]
+        while stack:
+            curr_dir, curr_cursor = stack.pop()
+            entries = lister.list(curr_dir)
+            stats.listed(len(entries))
+
+            for entry in entries:
+                is_dir = entry.is_dir()
+                child = curr_cursor.child(entry.name, is_dir)
+                if child.matched:
+                    return True
+                if is_dir and child.alive and not entry.is_symlink():
+                    stack.append((entry.path, child))
+
+        return False
+
+
+    @staticmethod
+    def _may_enter(plan: SelectionPlan, frame: WalkFrame, 
+        visited: set[tuple[int, int]]) -> bool:
+        """
+        Check if the frame's dir may be walked, for --follow-symlinks and
+        --one-file-system. The dir is only stat'ed if one of them is used.
+
+        Returns:
+            bool: False if the dir is a symlink not to follow, was walked already,
+                or is on another file system than its parent
+        """
+
+        if frame.flags & FLAG_SYMLINK and not plan.follow_symlinks:
+            return False
+
+        if not plan.follow_symlinks and not plan.one_file_system:
+            return True
+
+        try:
+            st = os.stat(frame.path)
+        except OSError:
+            return True         # Listing it fails the same way, and gives no items
+
+        frame.dev = st.st_dev
+        if plan.one_file_system and frame.parent is not None and \
+            frame.parent.dev is not None and st.st_dev != frame.parent.dev:
+            return False
+
+        if plan.follow_symlinks:
+            key = (st.st_dev, st.st_ino)
+            if key in visited:
+                return False
+            visited.add(key)
+
+        return True
+
+
+    @staticmethod
+    def _real_path(frame: WalkFrame, name: str, is_symlink: bool) -> str:
+        """
+        Get the resolved POSIX path of an item of the frame's dir. Only a symlink is
+        resolved on the disk, any other item is the resolved dir path plus its name.
+        """
+
+        if is_symlink:
+            return Path(frame.real_path, name).resolve(strict=False).as_posix()
+
+        return frame.real_path + name if frame.real_path.endswith("/") \
+            else frame.real_path + "/" + name
+
+
+    @staticmethod
+    def _drain(events: deque) -> Iterator[tuple[str, Path, bool | None, int]]:
+        """
+        Yield and remove the queued events of the walk.
+        """
+
+        while events:
+            yield events.popleft()
 
-        return ItemsSelectionService._isunder(dir_path, given_paths)
-    
 
     @staticmethod
     def _isglob(path_str: str) -> bool:
@@ -236,10 +707,5 @@ class ItemsSelectionService:
     
 
     @staticmethod
-    def _ishidden(item_path: Path) -> bool:
-        return item_path.name.startswith(".")
-    
-    
-    @staticmethod
-    def _isunder(path: Path, parents: list[Path]) -> bool:
-        return any(path == p or path.is_relative_to(p) for p in parents)
+    def _ishidden(name: str) -> bool:
+        return name.startswith(".")
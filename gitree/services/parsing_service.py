@@ -12,7 +12,7 @@ import argparse
 from pathlib import Path
 
 # Imports from this project
-from ..utilities.functions_utility import max_items_int, max_entries_int
+from ..utilities.functions_utility import max_items_int, max_entries_int, jobs_int
 from ..objects.config import Config
 from ..objects.app_context import AppContext
 
@@ -82,7 +82,8 @@ class ParsingService:
         if getattr(args, "export", None) is not None:
             args.export = ParsingService._fix_output_path(
                 ctx, args.export,
-                default_extensions={"tree": ".txt", "json": ".json", "md": ".md"},
+                default_extensions={"tree": ".txt", "json": ".json", "md": ".md",
+                    "ndjson": ".ndjson"},
                 format_str=args.format
             )
 
@@ -205,9 +206,13 @@ class ParsingService:
     def _add_listing_flags(ctx: AppContext, ap: argparse.ArgumentParser):
         listing = ap.add_argument_group("listing options")
 
-        listing.add_argument("--format", choices=["tree", "json", "md"], 
+        listing.add_argument("--format", choices=["tree", "json", "md", "ndjson"], 
             default="tree", help="Format output only")
 
+        listing.add_argument("--compact", action="store_true", 
+            default=argparse.SUPPRESS, 
+            help="Write the json format on one line, without indentation")
+
         listing.add_argument("--max-items", type=max_items_int, 
             default=argparse.SUPPRESS, 
             help="Limit items to be selected per directory")
@@ -220,10 +225,46 @@ class ParsingService:
             default=argparse.SUPPRESS, 
             help="Maximum depth to traverse when selecting files")
         
+        listing.add_argument("-j", "--jobs", type=jobs_int, 
+            default=argparse.SUPPRESS, 
+            help="Number of threads used to list directories concurrently. Helps on"
+                " network mounts and cold caches (default: 1). Also the number of"
+                " threads reading files for --export and --copy (default: 8)")
+        
+        listing.add_argument("--backend", choices=["scandir", "asyncio"], 
+            default=argparse.SUPPRESS, 
+            help="How directories are listed: scandir lists them one at a time (or in"
+                " --jobs threads), asyncio keeps many listings in flight and reads ahead,"
+                " for high-latency filesystems (default: scandir)")
+        
+        listing.add_argument("--source", choices=["disk", "index"], 
+            default=argparse.SUPPRESS, 
+            help="Where the items are listed from: the disk, or the git index for only"
+                " the tracked files, which is much faster on big checkouts (default: disk)")
+        
+        listing.add_argument("--untracked", action="store_true", 
+            default=argparse.SUPPRESS, 
+            help="With --source=index, also add the untracked files that are not ignored")
+        
+        listing.add_argument("--cache", action="store_true", 
+            default=argparse.SUPPRESS, 
+            help="Cache the listing of every dir, the compiled .gitignore rules and the"
+                " parsed git index in the user's cache dir (~/.cache/gitree/), so later"
+                " runs only redo the ones that changed")
+        
         listing.add_argument("--gitignore-depth", type=int, 
             default=argparse.SUPPRESS, 
             help="Limit depth to look for during .gitignore processing")
         
+        listing.add_argument("--follow-symlinks", action="store_true", 
+            default=argparse.SUPPRESS, 
+            help="Walk into symlinked directories, every physical directory is still"
+                " walked only once")
+        
+        listing.add_argument("--one-file-system", action="store_true", 
+            default=argparse.SUPPRESS, 
+            help="Do not walk into directories on other file systems (mount points)")
+        
         listing.add_argument("--hidden-items", action="store_true", 
             default=argparse.SUPPRESS, help="Show hidden files and directories")
         
@@ -283,6 +324,10 @@ class ParsingService:
         listing_control.add_argument("--no-max-items", action="store_true", 
             default=argparse.SUPPRESS, help="Disable --max-items limit")
         
+        listing_control.add_argument("--no-cache", action="store_true", 
+            default=argparse.SUPPRESS, help="Do not use the listing cache, even if"
+                " enabled in config.json")
+        
         listing_control.add_argument("--no-gitignore", action="store_true", 
             default=argparse.SUPPRESS, help="Do not use .gitignore rules")
         
@@ -14,6 +14,8 @@ import zipfile
 # Deps from this project
 from ..objects.app_context import AppContext
 from ..objects.config import Config
+from ..objects.flat_tree import FlatTree
+from ..objects.tree_node import DirNode
 
 
 class ZippingService:
@@ -58,23 +60,29 @@ class ZippingService:
         Collect all file paths from the resolved tree dict.
 
         Args:
-            tree_data (dict[str, Any]): A resolved tree dict with "self" and "children"
+            tree_data (dict[str, Any]): A resolved tree dict with "self" and "children",
+                or a FlatTree
 
         Returns:
             list[Path]: A list of file Paths found in the tree
         """
-        out: list[Path] = []
 
-        def rec(node: dict[str, Any]) -> None:
-            children = node.get("children", [])
-            for child in children:
-                if isinstance(child, dict):
-                    rec(child)
-                else:
-                    p = child if isinstance(child, Path) else Path(str(child))
-                    out.append(p)
+        if isinstance(tree_data, FlatTree):
+            return list(tree_data.iter_files())
+
+        out: list[Path] = []
+        stack = [iter(tree_data.get("children", []))]
+
+        # Walk with a stack of children iterators, so deep trees don't hit the recursion limit
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+            elif isinstance(child, (dict, DirNode)):
+                stack.append(iter(child.get("children", [])))
+            else:
+                out.append(child if isinstance(child, Path) else Path(str(child)))
 
-        rec(tree_data)
         return out
 
 
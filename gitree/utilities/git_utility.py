@@ -0,0 +1,199 @@
+# gitree/utilities/git_utility.py
+
+"""
+Code file for housing the helpers that read the files of a git repo, without
+running git.
+"""
+
+# Default libs
+import os
+from pathlib import Path
+
+
+def find_git_dir(path: Path) -> tuple[Path, Path] | None:
+    """
+    Find the git checkout the given path is in.
+
+    Args:
+        path (Path): A resolved path
+
+    Returns:
+        tuple[Path, Path] | None: The top dir of the checkout and its git dir,
+            None if the path is not in a checkout
+    """
+
+    for worktree in (path, *path.parents):
+        git_path = worktree / ".git"
+        if git_path.is_dir():
+            return worktree, git_path
+
+        if git_path.is_file():
+            git_dir = _read_gitdir_file(git_path)
+            if git_dir is not None:
+                return worktree, git_dir
+
+    return None
+
+
+def common_dir(git_dir: Path) -> Path:
+    """
+    Get the dir holding the files shared by all the worktrees of a repo (config,
+    info/exclude), which is the git dir itself unless it is a linked worktree.
+    """
+
+    common = git_dir / "commondir"
+    if not common.is_file():
+        return git_dir
+
+    try:
+        rel = common.read_text(encoding="utf-8").strip()
+    except OSError:
+        return git_dir
+
+    return Path(rel) if os.path.isabs(rel) else git_dir / rel
+
+
+def config_value(git_dir: Path | None, section: str, key: str,
+    include_global: bool = True) -> str | None:
+    """
+    Get a value of the git config, from the global config files and the config
+    of the repo, the repo one winning like in git. "[include]" is not followed.
+
+    Args:
+        git_dir (Path | None): The git dir of the repo, None for only the global config
+        section (str): The section of the value, e.g. "core"
+        key (str): The name of the value, e.g. "excludesFile"
+        include_global (bool): Whether to also read the global config files
+
+    Returns:
+        str | None: The value, None if it is not set
+    """
+
+    value = None
+    for config_path in (*(_global_config_paths() if include_global else ()),
+        *((common_dir(git_dir) / "config",) if git_dir is not None else ())):
+        found = _read_config_value(config_path, section.lower(), key.lower())
+        if found is not None:
+            value = found
+
+    return value
+
+
+def exclude_files(git_dir: Path) -> list[Path]:
+    """
+    Get the files with the ignore rules of a repo that are not .gitignore files,
+    from highest to lowest precedence: the repo's info/exclude, then the user's
+    global excludes file (core.excludesFile, or git's default one).
+
+    Args:
+        git_dir (Path): The git dir of the repo
+
+    Returns:
+        list[Path]: The files that exist
+    """
+
+    excludes_file = config_value(git_dir, "core", "excludesFile")
+    if excludes_file is not None:
+        global_excludes = Path(os.path.expanduser(excludes_file))
+    else:
+        global_excludes = _xdg_config_home() / "git" / "ignore"
+
+    return [path for path in (common_dir(git_dir) / "info" / "exclude", global_excludes)
+        if path.is_file()]
+
+
+def _global_config_paths() -> list[Path]:
+    """
+    Get the global git config files, in the order git reads them.
+    """
+
+    if os.environ.get("GIT_CONFIG_GLOBAL"):
+        return [Path(os.path.expanduser(os.environ["GIT_CONFIG_GLOBAL"]))]
+
+    return [_xdg_config_home() / "git" / "config", Path.home() / ".gitconfig"]
+
+
+def _xdg_config_home() -> Path:
+    """
+    Get the user config dir git uses, $XDG_CONFIG_HOME or ~/.config.
+    """
+
+    xdg = os.environ.get("XDG_CONFIG_HOME")
+    return Path(xdg) if xdg else Path.home() / ".config"
+
+
+def _read_config_value(config_path: Path, section: str, key: str) -> str | None:
+    """
+    Read the last value of a key in one git config file.
+
+    Args:
+        config_path (Path): The config file
+        section (str): The lowercase section name
+        key (str): The lowercase key name
+
+    Returns:
+        str | None: The value, None if the file does not set it
+    """
+
+    try:
+        config = config_path.read_text(encoding="utf-8", errors="ignore")
+    except OSError:
+        return None
+
+    value = None
+    current = ""
+    for line in config.splitlines():
+        line = line.strip()
+        if line.startswith("["):
+            current = line[1:line.find("]")].strip().lower() if "]" in line else ""
+            continue
+
+        if current != section or "=" not in line:
+            continue
+
+        name, found = (part.strip() for part in line.split("=", 1))
+        if name.lower() == key:
+            value = _unquote(found)
+
+    return value
+
+
+def _unquote(value: str) -> str:
+    """
+    Strip the comment and the quotes off a git config value.
+    """
+
+    out: list[str] = []
+    quoted = False
+    i = 0
+    while i < len(value):
+        char = value[i]
+        if char == '"':
+            quoted = not quoted
+        elif char in "#;" and not quoted:
+            break
+        elif char == "\\" and i + 1 < len(value):
+            i += 1
+            out.append({"n": "\n", "t": "\t"}.get(value[i], value[i]))
+        else:
+            out.append(char)
+        i += 1
+
+    return "".join(out).strip()
+
+
+def _read_gitdir_file(git_file: Path) -> Path | None:
+    """
+    Follow a ".git" file, as used by linked worktrees and submodules.
+    """
+
+    try:
+        content = git_file.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+    if not content.startswith("gitdir:"):
+        return None
+
+    git_dir = Path(content[len("gitdir:"):].strip())
+    return git_dir if git_dir.is_absolute() else (git_file.parent / git_dir)
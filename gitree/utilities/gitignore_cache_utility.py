@@ -0,0 +1,243 @@
+# gitree/utilities/gitignore_cache_utility.py
+
+"""
+Code file for housing GitIgnoreCache.
+"""
+
+# Default libs
+import hashlib, json, os, re, time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+
+# Format version of the cache file
+_VERSION = 2
+
+# A file changed less than this long before it was read may change again within
+# the same mtime tick without it showing, so it is always read and hashed
+_RACY_NS = 2_000_000_000
+
+# Number of distinct .gitignore contents kept compiled in memory and on disk
+_MAX_RULES = 256
+
+
+class GitIgnoreCache:
+    """
+    Compiled .gitignore rules, keyed by the hash of the file contents.
+
+    - In memory, the compiled rules are shared by every GitIgnore of the process,
+      so identical .gitignore files are compiled once (LRU of _MAX_RULES contents).
+    - With a cache file, the translated regex source of every content is also
+      stored on disk as JSON, along with the path, size and mtime of every
+      .gitignore it came from. An unchanged file is then neither read nor
+      translated again in later runs, its regex is compiled from the stored source.
+    - The cache file is plain data and is checked when it is loaded, anything
+      unexpected in it is dropped and compiled from the file again.
+    """
+
+    # Shared by all the instances: content hash -> (regex, ignores)
+    _compiled: OrderedDict = OrderedDict()
+
+
+    def __init__(self, path: Path | None = None) -> None:
+        """
+        Args:
+            path (Path | None): The cache file, loaded if it exists. None to only
+                use the in-memory cache
+        """
+
+        self.path = path
+
+        # path -> [size, mtime_ns, content hash]
+        self._files: dict[str, list] = {}
+        # content hash -> [source, ignores, last used run]
+        self._rules: dict[str, list] = {}
+        self._run = 0
+        self._dirty = False
+
+        if path is not None:
+            self._load()
+
+
+    def load(self, gitignore_path: Path,
+        translate: Callable[[list[str]], tuple[str | None, list[bool]]]
+        ) -> tuple[re.Pattern | None, list[bool]]:
+        """
+        Get the compiled rules of a .gitignore file, compiling them only if needed.
+
+        Args:
+            gitignore_path (Path): The resolved path of the .gitignore file
+            translate (Callable): Turns the lines of a file into the source of its
+                regex and whether each rule ignores, like GitIgnore._translate
+
+        Returns:
+            re.Pattern | None: The compiled regex, None if the file has no rules
+            list[bool]: Whether each rule ignores, in the order of the regex groups
+        """
+
+        key = os.fspath(gitignore_path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            return None, []
+
+        # An unchanged file has the same contents as last time, no need to read it
+        known = self._files.get(key)
+        if known and known[:2] == [st.st_size, st.st_mtime_ns]:
+            compiled = self._get(known[2])
+            if compiled is not None:
+                return compiled
+
+        try:
+            with open(key, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None, []
+
+        digest = hashlib.sha1(data).hexdigest()
+        if self.path is not None and st.st_mtime_ns <= time.time_ns() - _RACY_NS:
+            self._files[key] = [st.st_size, st.st_mtime_ns, digest]
+            self._dirty = True
+
+        compiled = self._get(digest)
+        if compiled is not None:
+            return compiled
+
+        lines = data.decode("utf-8", errors="ignore").splitlines()
+        return self._compile(digest, *translate(lines))
+
+
+    def save(self) -> None:
+        """
+        Write the cache file if anything was added, evicting the contents used least
+        recently. Errors are ignored, the cache is only a speedup.
+        """
+
+        if self.path is None or not self._dirty:
+            return
+
+        if len(self._rules) > _MAX_RULES:
+            by_use = sorted(self._rules, key=lambda digest: self._rules[digest][2])
+            for digest in by_use[:len(self._rules) - _MAX_RULES]:
+                del self._rules[digest]
+        self._files = {key: known for key, known in self._files.items()
+            if known[2] in self._rules}
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": _VERSION, "run": self._run,
+                    "files": self._files, "rules": self._rules}, f, separators=(",", ":"))
+
+            # Replace the old file in one step, so a concurrent run never reads half of it
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except (OSError, ValueError):
+            pass
+
+
+    def _compile(self, digest: str, source: str | None,
+        ignores: list[bool]) -> tuple[re.Pattern | None, list[bool]]:
+        """
+        Compile the regex of a content seen for the first time, and store it.
+        """
+
+        regex = re.compile(source) if source is not None else None
+        self._remember(digest, regex, ignores)
+
+        if self.path is not None:
+            self._rules[digest] = [source, ignores, self._run]
+            self._dirty = True
+
+        return regex, ignores
+
+
+    def _get(self, digest: str) -> tuple[re.Pattern | None, list[bool]] | None:
+        """
+        Get compiled rules from memory, or compile them from the source stored in
+        the cache file. None if they are not known, or the stored source is not valid.
+        """
+
+        compiled = self._compiled.get(digest)
+        if compiled is not None:
+            self._compiled.move_to_end(digest)
+
+        elif digest in self._rules:
+            source, ignores, _ = self._rules[digest]
+            try:
+                regex = re.compile(source) if source is not None else None
+            except (re.error, RecursionError, OverflowError):
+                regex = None
+
+            # Every rule is a group named after its index in ignores
+            if source is not None and (regex is None or
+                set(regex.groupindex) != {f"r{i}" for i in range(len(ignores))}):
+                del self._rules[digest]
+                return None
+            compiled = self._remember(digest, regex, ignores)
+
+        else:
+            return None
+
+        if digest in self._rules:
+            self._rules[digest][2] = self._run
+        return compiled
+
+
+    def _remember(self, digest: str, regex: re.Pattern | None,
+        ignores: list[bool]) -> tuple[re.Pattern | None, list[bool]]:
+        """
+        Keep compiled rules in memory, dropping the least recently used ones.
+        """
+
+        compiled = self._compiled[digest] = (regex, ignores)
+        if len(self._compiled) > _MAX_RULES:
+            self._compiled.popitem(last=False)
+        return compiled
+
+
+    def _load(self) -> None:
+        """
+        Read the cache file. A missing, unreadable or outdated file gives an empty
+        cache, and the entries that are not valid are left out.
+        """
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError, RecursionError):
+            return
+
+        if not isinstance(data, dict) or data.get("version") != _VERSION:
+            return
+
+        files, rules, run = data.get("files"), data.get("rules"), data.get("run")
+        if not isinstance(files, dict) or not isinstance(rules, dict) or type(run) is not int:
+            return
+
+        self._rules = {digest: rule for digest, rule in rules.items() if _valid_rule(rule)}
+        self._files = {key: known for key, known in files.items()
+            if _valid_file(known) and known[2] in self._rules}
+        self._run = run + 1
+
+
+def _valid_rule(rule) -> bool:
+    """
+    Check a [source, ignores, last used run] entry read from the cache file.
+    """
+
+    return (isinstance(rule, list) and len(rule) == 3
+        and (rule[0] is None or isinstance(rule[0], str))
+        and isinstance(rule[1], list) and all(type(i) is bool for i in rule[1])
+        and type(rule[2]) is int)
+
+
+def _valid_file(known) -> bool:
+    """
+    Check a [size, mtime_ns, content hash] entry read from the cache file.
+    """
+
+    return (isinstance(known, list) and len(known) == 3
+        and type(known[0]) is int and type(known[1]) is int and isinstance(known[2], str))
@@ -4,28 +4,101 @@
 Code file for housing GitIgnoreMatcher.
 """
 
-# Default libs
-from pathlib import Path
-
 # Deps from this project
 from ..objects.gitignore import GitIgnore
-from ..objects.app_context import AppContext
-from ..objects.config import Config
 
 
 class GitIgnoreMatcher:
+    """
+    Matches paths against the .gitignore files of the dirs a walk is in.
+
+    - Works as a scope stack: the walker pushes a dir's .gitignore when it
+      enters the dir and pops it when it leaves, so only the .gitignore files
+      of the current dir and its parents are ever checked.
+    - Follows git's precedence: the rules of a deeper .gitignore override the
+      rules of the ones above it, and within a file the last matching rule wins.
+      Every file is one compiled regex, so a lookup is a single pass from the
+      deepest scope up, stopping at the first file with a matching rule.
+    - The base files (.git/info/exclude, then the global excludes file) are loaded
+      once for the whole walk, and are checked last, since any .gitignore
+      overrides them.
+    """
+
+    def __init__(self, base: list[GitIgnore] | None = None):
+        """
+        Args:
+            base (list[GitIgnore] | None): The ignore files that apply to the whole
+                walk, from highest to lowest precedence
+        """
+
+        self._scopes: list[tuple[str, GitIgnore]] = []
+        self._base: list[tuple[str, GitIgnore]] = [
+            (GitIgnoreMatcher._prefix(gitignore), gitignore) for gitignore in base or []]
+
+
+    def push(self, gitignore: GitIgnore) -> None:
+        """
+        Enter the scope of a .gitignore, when the walk enters its dir.
+        """
+
+        self._scopes.append((GitIgnoreMatcher._prefix(gitignore), gitignore))
+
+
+    def pop(self) -> None:
+        """
+        Leave the scope of the last pushed .gitignore, when the walk leaves its dir.
+        """
+
+        self._scopes.pop()
+
+
+    def __len__(self) -> int:
+        """
+        Return the number of active .gitignore scopes.
+        """
 
-    def __init__(self):
-        self.gitignores: list[GitIgnore] = []
+        return len(self._scopes)
 
-    
-    def add_gitignore(self, gitignore: GitIgnore):
-        self.gitignores.append(gitignore)
 
-    
-    def excluded(self, item_path: Path) -> bool:
-        for gitignore in self.gitignores:
-            if gitignore.excluded(item_path):
-                return True
-            
+    def excluded(self, real_path: str, is_dir: bool) -> bool:
+        """
+        Check whether a path is ignored by the active .gitignore scopes. Only works
+        on strings, so it never touches the disk.
+
+        Args:
+            real_path (str): The resolved POSIX path of the item
+            is_dir (bool): Whether the item is a dir
+
+        Returns:
+            bool: True if the path is ignored
+        """
+
+        if not self._scopes and not self._base:
+            return False
+
+        path_str = real_path + "/" if is_dir else real_path
+
+        # The scopes are the dirs the walk is in, from shallow to deep;
+        # check the deepest first, and the base files after all of them
+        for prefix, gitignore in (*reversed(self._scopes), *self._base):
+            if not path_str.startswith(prefix):
+                continue
+
+            result = gitignore.match(path_str[len(prefix):])
+            if result is not None:
+                return result
+
         return False
+
+
+    @staticmethod
+    def _prefix(gitignore: GitIgnore) -> str:
+        """
+        Get the path prefix of the paths the rules of a file apply to.
+        """
+
+        prefix = gitignore.root.as_posix()
+        if not prefix.endswith("/"):
+            prefix += "/"
+
+        return prefix
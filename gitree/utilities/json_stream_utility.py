@@ -0,0 +1,97 @@
+# gitree/utilities/json_stream_utility.py
+
+"""
+Code file for housing JsonStreamWriter class.
+"""
+
+# Default libs
+import json
+from typing import Callable
+
+# Deps from this project
+from ..constants.constant import ENTER_DIR, FILE_ITEM
+
+
+class JsonStreamWriter:
+    """
+    Renders the events of ItemsSelectionService.iter_items in the "json" format,
+    writing every piece as soon as the event is fed.
+
+    - A dir is {"self": path, "children": [...]} and a file is its path, the same
+      as json.dumps() of the nested dicts, with the same indentation.
+    - Only the open dirs are tracked, so the memory is bound by the depth of
+      the tree, not by its size.
+    - The compact mode writes the whole tree on one line, without whitespace.
+    """
+
+    def __init__(self, write: Callable[[str, str], None], compact: bool = False) -> None:
+        """
+        Args:
+            write (Callable[[str, str], None]): Called with every piece of JSON and
+                the text to end it with, "\\n" for the last one
+            compact (bool): Whether to leave out the indentation and whitespace
+        """
+
+        self._write = write
+        self._compact = compact
+        self._sep = ":" if compact else ": "
+        self._open: list[bool] = []         # Whether each open dir has children yet
+        self._started = False
+
+
+    def feed(self, event: str, path: str) -> None:
+        """
+        Render one event of the walk.
+
+        Args:
+            event (str): ENTER_DIR, FILE_ITEM or LEAVE_DIR
+            path (str): The POSIX path of the item
+        """
+
+        if event == ENTER_DIR:
+            self._started = True
+            depth = len(self._open)
+            self._write(self._next_child() + (self._nl(4 * depth) if depth else "") + "{"
+                + self._nl(4 * depth + 2) + '"self"' + self._sep + json.dumps(path) + ","
+                + self._nl(4 * depth + 2) + '"children"' + self._sep + "[", "")
+            self._open.append(False)
+
+        elif event == FILE_ITEM:
+            self._write(self._next_child() + self._nl(4 * len(self._open)) + json.dumps(path), "")
+
+        else:
+            depth = len(self._open) - 1
+            has_children = self._open.pop()
+            self._write((self._nl(4 * depth + 2) if has_children else "") + "]"
+                + self._nl(4 * depth) + "}", "" if self._open else "\n")
+
+
+    def close(self) -> None:
+        """
+        Finish the output, once all the events were fed. Writes an empty object
+        if nothing was resolved.
+        """
+
+        if not self._started:
+            self._write("{}", "\n")
+
+
+    def _next_child(self) -> str:
+        """
+        Count a new child of the innermost open dir, and get the comma before it.
+        """
+
+        if not self._open:
+            return ""
+
+        comma = "," if self._open[-1] else ""
+        self._open[-1] = True
+        return comma
+
+
+    def _nl(self, indent: int) -> str:
+        """
+        Get the line break and indentation before a piece, nothing when compact.
+        """
+
+        return "" if self._compact else "\n" + " " * indent
@@ -0,0 +1,213 @@
+# gitree/utilities/listing_cache_utility.py
+
+"""
+Code file for housing ListingCache and CachedEntry.
+"""
+
+# Default libs
+import json, os, threading, time
+from pathlib import Path
+
+
+# Kind bits of a cached entry
+_DIR = 1
+_FILE = 2
+_SYMLINK = 4
+
+# Format version of the cache file, a file with another version is discarded
+_VERSION = 1
+
+# A dir changed less than this long before it was listed may change again within
+# the same mtime tick without it showing, so its listing is not cached
+_RACY_NS = 2_000_000_000
+
+
+class CachedEntry:
+    """
+    A dir entry read from the listing cache. Answers the same calls as the
+    os.DirEntry objects of a fresh listing.
+    """
+
+    __slots__ = ("name", "path", "_kind")
+
+    def __init__(self, name: str, path: str, kind: int) -> None:
+        self.name = name
+        self.path = path
+        self._kind = kind
+
+
+    def is_dir(self) -> bool:
+        return bool(self._kind & _DIR)
+
+
+    def is_file(self) -> bool:
+        return bool(self._kind & _FILE)
+
+
+    def is_symlink(self) -> bool:
+        return bool(self._kind & _SYMLINK)
+
+
+    def __fspath__(self) -> str:
+        return self.path
+
+
+class ListingCache:
+    """
+    The sorted listings of dirs from earlier runs, stored in one file.
+
+    - Every listing is stored with the mtime and inode of its dir. A dir is only
+      listed again if one of them changed, which happens whenever an entry is
+      added, removed or renamed in it. Changes inside the entries do not matter,
+      since only their names and kinds are stored.
+    - Capped at max_entries entries in total: the dirs used least recently are
+      evicted first. The file is only written when a listing was added, so runs
+      that hit the cache for every dir don't rewrite it.
+    - The cache file is plain data and is checked when it is loaded, a record
+      that does not fit is dropped and its dir is listed again.
+    """
+
+    def __init__(self, path: Path, max_entries: int) -> None:
+        """
+        Args:
+            path (Path): The cache file, loaded if it exists
+            max_entries (int): Max number of entries stored over all the dirs
+        """
+
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        # dir path -> [mtime_ns, inode, last used run, names, kinds]
+        self._dirs: dict[str, list] = {}
+        self._run = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+
+    def get(self, dir_path: str) -> tuple[list[CachedEntry] | None, tuple[int, int] | None]:
+        """
+        Get the cached listing of a dir, if the dir did not change since.
+
+        Args:
+            dir_path (str): The dir to get the listing for
+
+        Returns:
+            list[CachedEntry] | None: The sorted entries, None if not cached or stale
+            tuple[int, int] | None: The (mtime_ns, inode) stamp of the dir, to pass to
+                put() after listing it. None if it could not be read
+        """
+
+        try:
+            st = os.stat(dir_path)
+        except OSError:
+            return None, None
+
+        stamp = (st.st_mtime_ns, st.st_ino)
+        record = self._dirs.get(dir_path)
+        if record is None or (record[0], record[1]) != stamp:
+            self.misses += 1
+            return None, stamp
+
+        self.hits += 1
+        record[2] = self._run
+        names, kinds = record[3], record[4]
+        return [CachedEntry(name, os.path.join(dir_path, name), kind)
+            for name, kind in zip(names, kinds)], stamp
+
+
+    def put(self, dir_path: str, stamp: tuple[int, int] | None,
+        entries: list[os.DirEntry]) -> None:
+        """
+        Store the fresh listing of a dir.
+
+        Args:
+            dir_path (str): The listed dir
+            stamp (tuple[int, int] | None): The stamp get() gave before listing it
+            entries (list[os.DirEntry]): The sorted entries of the dir
+        """
+
+        if stamp is None or stamp[0] > time.time_ns() - _RACY_NS:
+            return
+
+        kinds = [(_DIR if entry.is_dir() else 0) | (_FILE if entry.is_file() else 0) |
+            (_SYMLINK if entry.is_symlink() else 0) for entry in entries]
+        with self._lock:
+            self._dirs[dir_path] = [stamp[0], stamp[1], self._run,
+                [entry.name for entry in entries], kinds]
+            self._dirty = True
+
+
+    def save(self) -> None:
+        """
+        Write the cache file if a listing was added, evicting the dirs used least
+        recently if it is over max_entries. Errors are ignored, the cache is only
+        a speedup.
+        """
+
+        if not self._dirty:
+            return
+
+        total = sum(len(record[3]) for record in self._dirs.values())
+        if total > self.max_entries:
+            for dir_path, record in sorted(self._dirs.items(), key=lambda item: item[1][2]):
+                if total <= self.max_entries:
+                    break
+                total -= len(record[3])
+                del self._dirs[dir_path]
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": _VERSION, "run": self._run, "dirs": self._dirs}, f,
+                    separators=(",", ":"), ensure_ascii=False)
+
+            # Replace the old file in one step, so a concurrent run never reads half of it
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except (OSError, ValueError):
+            pass
+
+
+    def _load(self) -> None:
+        """
+        Read the cache file. A missing, unreadable or outdated file gives an empty
+        cache, and the records that are not valid are left out.
+        """
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if not isinstance(data, dict) or data.get("version") != _VERSION:
+            return
+
+        dirs, run = data.get("dirs"), data.get("run")
+        if not isinstance(dirs, dict) or type(run) is not int:
+            return
+
+        self._dirs = {dir_path: record for dir_path, record in dirs.items()
+            if _valid_record(record)}
+        self._run = run + 1
+
+
+def _valid_record(record) -> bool:
+    """
+    Check a [mtime_ns, inode, last used run, names, kinds] record read from the
+    cache file. The names must be plain entry names, one kind for each.
+    """
+
+    if not (isinstance(record, list) and len(record) == 5
+        and all(type(value) is int for value in record[:3])
+        and isinstance(record[3], list) and isinstance(record[4], list)
+        and len(record[3]) == len(record[4])):
+        return False
+
+    return all(isinstance(name, str) and name not in ("", ".", "..")
+        and "/" not in name and os.sep not in name for name in record[3]) \
+        and all(type(kind) is int for kind in record[4])
@@ -0,0 +1,421 @@
+# gitree/utilities/listing_utility.py
+
+"""
+Code file for housing DirectoryLister, ThreadedDirectoryLister, AsyncDirectoryLister
+and IndexDirectoryLister.
+"""
+
+# Default libs
+import asyncio, itertools, os, threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable
+
+# Deps from this project
+from ..objects.git_index import GitIndex, IndexEntry
+from .listing_cache_utility import ListingCache
+
+
+class DirectoryLister:
+    """
+    Lists directories with os.scandir.
+
+    The returned DirEntry objects cache the file type reported by the OS
+    while listing, so callers can use entry.is_dir() as often as they like
+    without paying for another stat call.
+
+    With a ListingCache, a dir that did not change since an earlier run is
+    not listed again; its entries come from the cache instead.
+    """
+
+    def __init__(self, cache: ListingCache | None = None) -> None:
+        """
+        Args:
+            cache (ListingCache | None): The listing cache to use, if any
+        """
+        self.cache = cache
+
+
+    def list(self, dir_path: str | os.PathLike) -> list[os.DirEntry]:
+        """
+        List a directory, sorted with files first and then by lowercase name.
+
+        Args:
+            dir_path (str | os.PathLike): The directory to list
+
+        Returns:
+            list[os.DirEntry]: The sorted entries, or an empty list if the
+                directory could not be read
+        """
+
+        if self.cache is not None:
+            cached, stamp = self.cache.get(os.fspath(dir_path))
+            if cached is not None:
+                return cached
+
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError:
+            return []
+
+        entries.sort(key=lambda e: (e.is_dir(), e.name.lower()))
+        if self.cache is not None:
+            self.cache.put(os.fspath(dir_path), stamp, entries)
+        return entries
+
+
+    def is_tracked(self, entry: os.DirEntry) -> bool:
+        """
+        Check if an entry is tracked by git, so no .gitignore applies to it.
+        Not known when listing the disk.
+        """
+        return False
+
+
+    def prefetch(self, dir_paths: Iterable[str | os.PathLike]) -> None:
+        """
+        Hint that the given dirs will be listed soon. No-op for the serial lister.
+        """
+        pass
+
+
+    def close(self) -> None:
+        """
+        Release any resources held by the lister. No-op for the serial lister.
+        """
+        pass
+
+
+    def __enter__(self) -> "DirectoryLister":
+        return self
+
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class ThreadedDirectoryLister(DirectoryLister):
+    """
+    Lister that lists prefetched dirs concurrently in a bounded thread pool.
+
+    The walker still consumes listings one dir at a time and in order, so
+    the resolved tree is exactly the same as with the serial lister. Only
+    the waiting on the filesystem overlaps.
+    """
+
+    def __init__(self, jobs: int, cache: ListingCache | None = None) -> None:
+        """
+        Args:
+            jobs (int): Maximum number of dirs listed at the same time
+            cache (ListingCache | None): The listing cache to use, if any
+        """
+        super().__init__(cache)
+        self._executor = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="gitree-list")
+        self._pending: dict[str, Future] = {}
+
+
+    def list(self, dir_path: str | os.PathLike) -> list[os.DirEntry]:
+        """
+        Return the listing of a dir, waiting for it if it was prefetched.
+        """
+
+        future = self._pending.pop(os.fspath(dir_path), None)
+        if future is None:
+            return super().list(dir_path)
+        return future.result()
+
+
+    def prefetch(self, dir_paths: Iterable[str | os.PathLike]) -> None:
+        """
+        Start listing the given dirs in the thread pool.
+        """
+
+        for dir_path in dir_paths:
+            key = os.fspath(dir_path)
+            if key not in self._pending:
+                self._pending[key] = self._executor.submit(super().list, key)
+
+
+    def close(self) -> None:
+        """
+        Drop listings that were never consumed and stop the thread pool.
+        """
+
+        self._pending.clear()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class AsyncDirectoryLister(DirectoryLister):
+    """
+    Lister for high-latency filesystems (network mounts, FUSE), that keeps many
+    listings in flight with an asyncio event loop running in a background thread.
+
+    - The listings run in a bounded thread pool, fed by worker coroutines from a
+      priority queue: a dir the walker waits for comes first, then the dirs it
+      prefetched, then the read-ahead ones.
+    - Read-ahead: once a prefetched dir is listed, its subdirs are listed too, up
+      to read_ahead levels below it, without waiting for the walker to select
+      them. So the walk is not slowed down by one round trip per level.
+    - A read-ahead listing the walker turns out not to need (a pruned dir) is
+      dropped with everything read ahead under it. At most max_pending listings
+      are kept waiting for the walker.
+    - The walker still consumes listings one dir at a time and in order, so the
+      resolved tree is exactly the same as with the serial lister.
+
+    NOTE: all the state is only touched from the event loop thread.
+    """
+
+    # NOTE: "list" is a method of the class, so the annotations after it are quoted
+
+    # Queue priorities, lower is listed first
+    _NEEDED = 0
+    _PREFETCHED = 1
+    _READ_AHEAD = 2
+
+    def __init__(self, jobs: int, cache: ListingCache | None = None,
+        read_ahead: int = 2, max_pending: int = 4096) -> None:
+        """
+        Args:
+            jobs (int): Maximum number of dirs listed at the same time
+            cache (ListingCache | None): The listing cache to use, if any
+            read_ahead (int): Levels of subdirs listed ahead below a prefetched dir
+            max_pending (int): Max number of listings kept waiting for the walker
+        """
+        super().__init__(cache)
+        self.read_ahead = read_ahead
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="gitree-list")
+
+        self._futures: dict[str, asyncio.Future] = {}   # Listings not consumed yet
+        self._depth: dict[str, int] = {}                # Read-ahead level of each dir
+        self._read_ahead_of: dict[str, list[str]] = {}  # Dir -> subdirs read ahead
+        self._started: set[str] = set()
+        self._last_listed: str | None = None
+        self._order = itertools.count()
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+            name="gitree-list-loop", daemon=True)
+        self._thread.start()
+        self._queue: asyncio.PriorityQueue = self._call(self._start_workers(jobs))
+
+
+    def list(self, dir_path: str | os.PathLike) -> list[os.DirEntry]:
+        """
+        Return the listing of a dir, waiting for it if it is still in flight.
+        """
+
+        return self._call(self._take(os.fspath(dir_path)))
+
+
+    def prefetch(self, dir_paths: Iterable[str | os.PathLike]) -> None:
+        """
+        Start listing the given dirs, the selected subdirs of the dir listed last.
+        Does not wait for the event loop.
+        """
+
+        self._loop.call_soon_threadsafe(self._prefetch, [os.fspath(p) for p in dir_paths])
+
+
+    def close(self) -> None:
+        """
+        Drop listings that were never consumed, and stop the loop and the thread pool.
+        """
+
+        if not self._thread.is_alive():
+            return
+
+        self._call(self._stop_workers())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+    def _call(self, coro):
+        """
+        Run a coroutine on the event loop and wait for its result.
+        """
+
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+
+    async def _start_workers(self, jobs: int) -> asyncio.PriorityQueue:
+        queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._workers = [asyncio.ensure_future(self._work(queue)) for _ in range(jobs)]
+        return queue
+
+
+    async def _stop_workers(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._futures.clear()
+
+
+    async def _work(self, queue: asyncio.PriorityQueue) -> None:
+        """
+        List the queued dirs one at a time in the thread pool, forever.
+        """
+
+        loop = asyncio.get_running_loop()
+        while True:
+            _, key = await queue.get()
+            future = self._futures.get(key)
+            if future is None or future.done() or key in self._started:
+                continue        # Dropped, or queued again with a higher priority
+
+            self._started.add(key)
+            try:
+                entries = await loop.run_in_executor(self._executor, super().list, key)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                continue
+
+            if not future.done():
+                future.set_result(entries)
+            if self._futures.get(key) is future:
+                self._read_ahead(key, entries)
+
+
+    def _schedule(self, key: str, priority: int, depth: int) -> None:
+        """
+        Queue a dir to be listed, or raise the priority of a queued one.
+        """
+
+        if key not in self._futures:
+            self._futures[key] = self._loop.create_future()
+            self._depth[key] = depth
+        self._queue.put_nowait(((priority, next(self._order)), key))
+
+
+    async def _take(self, key: str) -> "list[os.DirEntry]":
+        """
+        Get the listing of a dir for the walker, listing it first if needed.
+        """
+
+        self._last_listed = key
+        if key not in self._futures or not self._futures[key].done():
+            self._schedule(key, self._NEEDED, 0)
+
+        future = self._futures[key]
+        try:
+            return await future
+        finally:
+            self._futures.pop(key, None)
+            self._depth.pop(key, None)
+            self._started.discard(key)
+
+
+    def _prefetch(self, keys: "list[str]") -> None:
+        """
+        Queue the selected subdirs of the dir listed last, and drop the subdirs
+        read ahead for it that were not selected.
+        """
+
+        selected = set(keys)
+        for key in self._read_ahead_of.pop(self._last_listed, []):
+            if key not in selected:
+                self._drop(key)
+
+        for key in keys:
+            read_ahead_only = key in self._futures and self._depth.get(key, 0) > 0
+            self._schedule(key, self._PREFETCHED, 0)
+
+            # A dir that was read ahead is now prefetched, so read ahead below it
+            self._depth[key] = 0
+            future = self._futures[key]
+            if read_ahead_only and future.done() and not future.exception() and \
+                key not in self._read_ahead_of:
+                self._read_ahead(key, future.result())
+
+
+    def _read_ahead(self, key: str, entries: "list[os.DirEntry]") -> None:
+        """
+        Queue the subdirs of a listed dir, if it is less than read_ahead levels
+        below a prefetched dir. Symlinked dirs are never read ahead.
+        """
+
+        depth = self._depth.get(key)
+        if depth is None or depth >= self.read_ahead:
+            return
+
+        subdirs = []
+        for entry in entries:
+            if len(self._futures) >= self.max_pending:
+                break
+            if entry.is_dir() and not entry.is_symlink() and entry.path not in self._futures:
+                self._schedule(entry.path, self._READ_AHEAD + depth, depth + 1)
+                subdirs.append(entry.path)
+
+        self._read_ahead_of[key] = subdirs
+
+
+    def _drop(self, key: str) -> None:
+        """
+        Forget a dir read ahead for nothing, and all the dirs read ahead under it.
+        """
+
+        future = self._futures.pop(key, None)
+        if future is not None and not future.done():
+            future.cancel()
+
+        self._depth.pop(key, None)
+        self._started.discard(key)
+        for subdir in self._read_ahead_of.pop(key, []):
+            self._drop(subdir)
+
+
+class IndexDirectoryLister(DirectoryLister):
+    """
+    Lister that lists dirs from the git index instead of the disk, for --source=index.
+
+    - Listing a dir is a lookup in the index, no matter how big the dir is on
+      disk, and the tracked entries are never checked against .gitignore files.
+    - With untracked, the dir is also listed on disk, adding the entries that are
+      not tracked. Those are still checked against the .gitignore files.
+    - Dirs outside the checkout are listed on disk.
+    """
+
+    def __init__(self, index: GitIndex, untracked: bool,
+        cache: ListingCache | None = None) -> None:
+        """
+        Args:
+            index (GitIndex): The index of the checkout
+            untracked (bool): Whether to add the untracked entries from the disk
+            cache (ListingCache | None): The listing cache to use for the disk, if any
+        """
+        super().__init__(cache)
+        self.index = index
+        self.untracked = untracked
+
+
+    def list(self, dir_path: str | os.PathLike) -> list[os.DirEntry]:
+        """
+        List a dir from the index, sorted like DirectoryLister.list.
+        """
+
+        rel = os.path.relpath(dir_path, self.index.worktree)
+        if rel == os.pardir or rel.startswith(os.pardir + os.sep):
+            return super().list(dir_path)
+
+        children = self.index.children("" if rel == os.curdir else rel.replace(os.sep, "/"))
+        if children is None:
+            return []       # A submodule, its files are in its own index
+
+        dir_str = os.fspath(dir_path)
+        entries: list = [IndexEntry(name, os.path.join(dir_str, name), kind)
+            for name, kind in children]
+
+        if self.untracked:
+            tracked = {entry.name for entry in entries}
+            entries.extend(entry for entry in super().list(dir_path)
+                if entry.name not in tracked and entry.name != ".git")
+
+        entries.sort(key=lambda e: (e.is_dir(), e.name.lower()))
+        return entries
+
+
+    def is_tracked(self, entry: os.DirEntry) -> bool:
+        return isinstance(entry, IndexEntry)
@@ -4,6 +4,12 @@
 Code file for housing Logger and OutputBuffer classes.
 """
 
+# Default libs
+import codecs, os, sys, tempfile
+from typing import BinaryIO, Iterator
+
+# Deps from this project
+from ..constants.constant import OUTPUT_HIGH_WATER
 from ..utilities.color_utility import Color
 
 
@@ -130,47 +136,190 @@ class Logger:
         return f"{colored_label} {message}"
 
 
-class OutputBuffer(Logger):
+class OutputBuffer:
     """
-    A custom output buffer to capture stdout writes. A wrapper around Logger.
+    Holds the rendered output of the app, encoded to UTF-8 once as it is written.
+
+    - With replay (the default), the lines are kept for get_value() and iter_lines()
+      and only go to the sink on flush(). Up to the high-water mark they are held
+      in memory, past it they are spilled to a temp file.
+    - Without replay, the lines are written through to the sink every time the
+      high-water mark is reached, so the memory stays bounded for any tree size.
+      A terminal gets every line as soon as it is written.
+    - The sink is stdout by default, or any binary file (a file, a BytesIO).
     """
 
-    def __init__(self):
+    def __init__(self, sink: BinaryIO | None = None, replay: bool = True,
+        high_water: int = OUTPUT_HIGH_WATER) -> None:
         """
-        Initialize the output buffer with a reference to a Logger.
+        Args:
+            sink (BinaryIO | None): Where the output goes, None for stdout
+            replay (bool): Whether to keep the lines for get_value() and iter_lines()
+            high_water (int): Bytes held in memory before they are written out
+                or spilled to disk
         """
-        super().__init__()
+
+        self._sink = sink
+        self._replay = replay
+        self._high_water = high_water
+        self._pending = bytearray()
+        self._spill: BinaryIO | None = None     # Temp file with the lines past the mark
+        self._lines = 0
+        self._tty: bool | None = None           # Whether the sink is a terminal, once checked
 
 
-    def write(self, message: str) -> None:
+    def write(self, message: str, end: str = "\n") -> None:
         """
-        Write a message to the logger's output storage.
+        Write a message to the output, as one or more lines.
 
         Args:
             message: The message to write
+            end: Written after the message, "" to continue the line with the next one
         """
-        super().log(level=None, message=message)
+
+        self._pending += message.encode("utf-8")
+        if end:
+            self._pending += end.encode("utf-8")
+        self._lines += 1
+
+        if len(self._pending) >= self._high_water or (
+            end and not self._replay and self._is_tty()):
+            self._drain()
 
 
     def get_value(self) -> list[str]:
         """
-        Get the entire contents of the output buffer as a list of strings.
+        Get the entire contents of the output buffer as a list of lines. Only the
+        lines kept for replay are there; prefer iter_lines() for big outputs.
 
         Returns:
-            str: The contents of the output buffer
+            list[str]: The lines of the output buffer
         """
-        return super().get_logs()
-    
+
+        return list(self.iter_lines())
+
+
+    def iter_lines(self) -> Iterator[str]:
+        """
+        Read back the lines kept for replay, from the temp file and then from memory.
+
+        Returns:
+            Iterator[str]: The lines of the output buffer
+        """
+
+        # A line may go on from the temp file into memory
+        carry = ""
+        if self._spill is not None:
+            self._spill.seek(0)
+            for raw in self._spill:
+                line = raw.decode("utf-8")
+                if not line.endswith("\n"):
+                    carry = line
+                    break
+                yield line[:-1]
+
+        text = carry + self._pending.decode("utf-8")
+        if text:
+            yield from text.removesuffix("\n").split("\n")
+
 
     def flush(self) -> None:
-        """ 
-        A modification for the parent class flush() function. Flushes the
-        buffer to the terminal.
+        """
+        Write the output to the sink. The lines kept for replay stay in the buffer.
         """
 
-        if super().empty():
+        if self.empty():
             return      # Do not print anything
 
-        for message in self.get_value():
-            print(message)
-    
\ No newline at end of file
+        if self._spill is not None:
+            self._spill.seek(0)
+            while chunk := self._spill.read(self._high_water):
+                self._write_out(chunk)
+
+        if self._pending:
+            self._write_out(self._pending)
+            if not self._replay:
+                self._pending.clear()
+
+        (self._sink or sys.stdout).flush()
+
+
+    def clear(self) -> None:
+        """
+        Drop the output without writing it.
+        """
+
+        self._pending.clear()
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+        self._lines = 0
+
+
+    def empty(self) -> bool:
+        """
+        Check if nothing was written to the buffer since it was last cleared.
+        """
+
+        return len(self) == 0
+
+
+    def __len__(self) -> int:
+        """
+        Return the number of messages written since the buffer was last cleared.
+        """
+
+        return self._lines
+
+
+    def _drain(self) -> None:
+        """
+        Move the lines held in memory to the temp file, or to the sink without replay.
+        """
+
+        if self._replay:
+            if self._spill is None:
+                self._spill = tempfile.TemporaryFile()
+            self._spill.seek(0, os.SEEK_END)
+            self._spill.write(self._pending)
+        else:
+            self._write_out(self._pending)
+
+        self._pending.clear()
+
+
+    def _is_tty(self) -> bool:
+        """
+        Check once whether the sink is a terminal.
+        """
+
+        if self._tty is None:
+            sink = self._sink or sys.stdout
+            self._tty = hasattr(sink, "isatty") and sink.isatty()
+
+        return self._tty
+
+
+    def _write_out(self, data: bytes | bytearray) -> None:
+        """
+        Write UTF-8 encoded lines to the sink. For stdout, they are written to its
+        binary buffer, in the encoding and with the line endings print() would use.
+        """
+
+        if self._sink is not None:
+            self._sink.write(data)
+            return
+
+        sys.stdout.flush()      # Keep the order with what was printed before
+        out = getattr(sys.stdout, "buffer", None)
+        if out is None:         # stdout was replaced by a text stream
+            sys.stdout.write(bytes(data).decode("utf-8"))
+            return
+
+        encoding = codecs.lookup(sys.stdout.encoding or "utf-8").name
+        if encoding != "utf-8":
+            data = bytes(data).decode("utf-8").encode(encoding, errors="replace")
+        if os.linesep != "\n":
+            data = bytes(data).replace(b"\n", os.linesep.encode())
+
+        out.write(data)
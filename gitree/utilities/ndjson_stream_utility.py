@@ -0,0 +1,85 @@
+# gitree/utilities/ndjson_stream_utility.py
+
+"""
+Code file for housing NdjsonStreamWriter class.
+"""
+
+# Default libs
+import json, os
+from typing import Callable
+
+# Deps from this project
+from ..constants.constant import ENTER_DIR, FILE_ITEM
+
+
+class NdjsonStreamWriter:
+    """
+    Renders the events of ItemsSelectionService.iter_items in the "ndjson" format
+    (JSON Lines): one compact JSON record per line, written as soon as the event
+    is fed.
+
+    - Every item is a {"path", "type", "depth", "size"} record, where the type is
+      "dir" or "file", the depth of the root is 0 and the size is in bytes for a
+      file (null for a dir, or a file that can not be read).
+    - The records come in the order the items are drawn, so the output can be
+      consumed while it is written, or split between workers at any line.
+    """
+
+    def __init__(self, write: Callable[[str], None]) -> None:
+        """
+        Args:
+            write (Callable[[str], None]): Called with every record line
+        """
+
+        self._write = write
+        self._depth = 0
+
+
+    def feed(self, event: str, path: str) -> None:
+        """
+        Render one event of the walk.
+
+        Args:
+            event (str): ENTER_DIR, FILE_ITEM or LEAVE_DIR
+            path (str): The POSIX path of the item
+        """
+
+        if event == ENTER_DIR:
+            self._write(NdjsonStreamWriter.record(path, "dir", depth=self._depth, size=None))
+            self._depth += 1
+
+        elif event == FILE_ITEM:
+            self._write(NdjsonStreamWriter.record(path, "file", depth=self._depth,
+                size=NdjsonStreamWriter._size(path)))
+
+        else:
+            self._depth -= 1
+
+
+    @staticmethod
+    def record(path: str, record_type: str, **fields) -> str:
+        """
+        Encode one record as a line of compact JSON.
+
+        Args:
+            path (str): The POSIX path of the item
+            record_type (str): The "type" field of the record
+            **fields: The other fields of the record
+
+        Returns:
+            str: The record, without a line break
+        """
+
+        return json.dumps({"path": path, "type": record_type, **fields}, separators=(",", ":"))
+
+
+    @staticmethod
+    def _size(path: str) -> int | None:
+        """
+        Get the size of a file in bytes, None if it can not be read.
+        """
+
+        try:
+            return os.stat(path).st_size
+        except OSError:
+            return None
@@ -0,0 +1,234 @@
+# gitree/utilities/tree_stream_utility.py
+
+"""
+Code file for housing TreeStreamWriter class.
+"""
+
+# Default libs
+from pathlib import Path
+from typing import Callable
+
+# Deps from this project
+from ..constants.constant import BRANCH, LAST, VERT, SPACE, ENTER_DIR, FILE_ITEM
+from ..objects.tree_node import FLAG_HIDDEN
+
+
+class _Level:
+    """
+    A dir open in the TreeStreamWriter.
+    """
+
+    __slots__ = ("path", "parent", "connector", "hidden", "line_out", "has_children",
+        "closed", "held", "pending_file", "open_child")
+
+    def __init__(self, path: Path, parent: "_Level | None", connector: str | None,
+        hidden: bool) -> None:
+        self.path = path
+        self.parent = parent
+        self.connector = connector          # LAST/BRANCH, None until it is known
+        self.hidden = hidden                # Whether the dir or a parent is hidden
+        self.line_out = False               # Whether the line of this dir was written
+        self.has_children = False
+        self.closed = False
+        self.held: list[str] = []           # Lines of the items under it, until line_out
+        # Last file and whether it is hidden, until its connector is known
+        self.pending_file: tuple[Path, bool] | None = None
+        self.open_child: _Level | None = None   # Last child dir, until its connector is known
+
+
+    @property
+    def column(self) -> str:
+        """ The prefix this dir adds to the lines of the items under it """
+        if self.parent is None:
+            return ""
+        return SPACE if self.connector == LAST else VERT
+
+
+class TreeStreamWriter:
+    """
+    Renders the events of ItemsSelectionService.iter_items in the "tree" format,
+    writing every line as soon as it is final.
+
+    - The events come in the order the items are drawn, so this is a single pass
+      with no sorting, and the labels are never parsed back from the paths.
+    - A line is final once its connector is known, i.e. once it is known whether
+      more items follow in the same dir. Until then, the line of a dir and the
+      lines under it are held; the "last" hints of the walk avoid most of that.
+    - Gives the exact same lines as DrawingService._draw_tree on the same tree.
+    """
+
+    def __init__(self, write: Callable[[str], None], emoji: bool,
+        format_root: Callable[[Path, bool], str],
+        format_item: Callable[[Path, bool, bool, bool], str],
+        root_hidden: Callable[[Path], bool]) -> None:
+        """
+        Args:
+            write (Callable[[str], None]): Called with every finished line
+            emoji (bool): Whether the labels depend on a dir being empty
+            format_root (Callable[[Path, bool], str]): Label for the root, given
+                its path and whether it is empty
+            format_item (Callable[[Path, bool, bool, bool], str]): Label for an item,
+                given its path, whether it is a dir, whether it is empty and whether
+                it or a dir above it is hidden
+            root_hidden (Callable[[Path], bool]): Whether the path of the root has
+                a hidden part, checked once
+        """
+
+        self._write = write
+        self._emoji = emoji
+        self._format_root = format_root
+        self._format_item = format_item
+        self._root_hidden = root_hidden
+        self._top: _Level | None = None
+        self._started = False
+
+
+    def feed(self, event: str, path: Path, last: bool | None, flags: int = 0) -> None:
+        """
+        Render one event of the walk.
+
+        Args:
+            event (str): ENTER_DIR, FILE_ITEM or LEAVE_DIR
+            path (Path): Path of the item
+            last (bool | None): Whether the item is known to be the last of its parent
+            flags (int): The TreeNode flags of the item
+        """
+
+        if event == ENTER_DIR:
+            self._enter(path, last, bool(flags & FLAG_HIDDEN))
+        elif event == FILE_ITEM:
+            self._file(path, last, bool(flags & FLAG_HIDDEN))
+        else:
+            self._leave()
+
+
+    def close(self) -> None:
+        """
+        Finish the output, once all the events were fed. Draws the same "None"
+        root as DrawingService._draw_tree does for an empty tree.
+        """
+
+        if not self._started:
+            self._write(self._format_root(None, True))
+
+
+    def _enter(self, path: Path, last: bool | None, hidden: bool) -> None:
+        parent = self._top
+        if parent is None:
+            self._started = True
+            self._top = _Level(path, None, "", self._root_hidden(path))
+            self._open(self._top)
+            return
+
+        self._add_child(parent)
+        self._settle(parent)
+
+        connector = None if last is None else (LAST if last else BRANCH)
+        level = _Level(path, parent, connector, parent.hidden or hidden)
+        parent.open_child = level
+        self._top = level
+        self._open(level)
+
+
+    def _file(self, path: Path, last: bool | None, hidden: bool) -> None:
+        level = self._top
+        self._add_child(level)
+        self._settle(level)
+
+        if last is None:
+            level.pending_file = (path, level.hidden or hidden)
+            return
+
+        self._emit(level, (LAST if last else BRANCH) + 
+            self._format_item(path, False, False, level.hidden or hidden))
+
+
+    def _leave(self) -> None:
+        level = self._top
+        level.closed = True
+        self._top = level.parent
+
+        # Whichever item is still waiting is the last one
+        if level.open_child is not None and level.open_child.connector is None:
+            level.open_child.connector = LAST
+            self._open(level.open_child)
+
+        if level.pending_file is not None:
+            self._emit_pending_file(level, LAST)
+
+        self._open(level)
+
+
+    def _settle(self, level: _Level) -> None:
+        """
+        A new item in a dir means the items waiting in it were not the last.
+        """
+
+        if level.pending_file is not None:
+            self._emit_pending_file(level, BRANCH)
+
+        if level.open_child is not None and level.open_child.connector is None:
+            level.open_child.connector = BRANCH
+            self._open(level.open_child)
+
+
+    def _emit_pending_file(self, level: _Level, connector: str) -> None:
+        """
+        Write the line of the file waiting in a dir, once its connector is known.
+        """
+
+        path, hidden = level.pending_file
+        level.pending_file = None
+        self._emit(level, connector + self._format_item(path, False, False, hidden))
+
+
+    def _add_child(self, level: _Level) -> None:
+        """
+        Mark a dir as not empty, which may make its line final.
+        """
+
+        if not level.has_children:
+            level.has_children = True
+            self._open(level)
+
+
+    def _open(self, level: _Level) -> None:
+        """
+        Write the line of a dir and the lines held under it, if it is final.
+        """
+
+        if level.line_out or level.connector is None:
+            return
+        if self._emoji and not (level.has_children or level.closed):
+            return      # The emoji tells if the dir is empty
+
+        level.line_out = True
+        if level.parent is None:
+            self._write(self._format_root(level.path, not level.has_children))
+        else:
+            self._emit(level.parent, level.connector + self._format_item(
+                level.path, True, not level.has_children, level.hidden))
+
+        held, level.held = level.held, []
+        for line in held:
+            self._emit(level, line)
+
+
+    def _emit(self, level: _Level, line: str) -> None:
+        """
+        Write a line under a dir, or hold it until the dirs above it are final.
+
+        Args:
+            level (_Level): The dir the line is under
+            line (str): The line, relative to the dir
+        """
+
+        while level.line_out:
+            if level.parent is None:
+                self._write(line)
+                return
+
+            line = level.column + line
+            level = level.parent
+
+        level.held.append(line)
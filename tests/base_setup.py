@@ -9,6 +9,7 @@ import unittest
 import tempfile
 import subprocess
 import sys
+import os
 from pathlib import Path
 
 
@@ -28,6 +29,10 @@ class BaseCLISetup(unittest.TestCase):
         self._tmpdir = tempfile.TemporaryDirectory()
         self.root = Path(self._tmpdir.name)
 
+        # The per-user caches go to their own temporary dir, not the user's
+        self._cachedir = tempfile.TemporaryDirectory()
+        self.user_cache = Path(self._cachedir.name, "gitree")
+
         # Vars to be used for all other tests
         self.base_call = "gitree "
 
@@ -38,6 +43,7 @@ class BaseCLISetup(unittest.TestCase):
         """
 
         self._tmpdir.cleanup()
+        self._cachedir.cleanup()
 
 
     def run_gitree(self, *args):
@@ -55,6 +61,8 @@ class BaseCLISetup(unittest.TestCase):
             capture_output=True,
             text=True,
             encoding="utf-8",
+            env=dict(os.environ, XDG_CACHE_HOME=self._cachedir.name,
+                LOCALAPPDATA=self._cachedir.name),
         )
 
 
@@ -1,6 +1,11 @@
 # tests/test_io_flags.py
-import zipfile
+import io, json, sys, threading, types, unittest, zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
 
+from gitree.services.export_service import ExportService
+from gitree.utilities.logging_utility import OutputBuffer
 from tests.base_setup import BaseCLISetup
 
 
@@ -49,3 +54,175 @@ class TestIOFlags(BaseCLISetup):
         content = out_path.read_text()
         self.assertIn("CONTENTS", content)
 
+
+
+    def test_streamed_tree_matches_export(self):
+        """
+        Verify that the tree streamed to the terminal is the same as the
+        tree drawn for --export.
+        """
+        for d in ("app/core", "app/empty", "docs"):
+            (self.root / d).mkdir(parents=True)
+        for f in ("app/core/main.py", "app/setup.py", "docs/guide.md", "README.md"):
+            (self.root / f).write_text("data")
+
+        out_path = self.root / "tree_export.txt"
+        args = ("--emoji", "--no-max-entries", "--no-max-items")
+        streamed = self.run_gitree("--no-color", *args)
+        exported = self.run_gitree("--export", out_path.name, "--exclude", out_path.name, *args)
+
+        self.assertEqual(streamed.returncode, 0, msg=streamed.stderr)
+        self.assertEqual(exported.returncode, 0, msg=exported.stderr)
+
+        structure = out_path.read_text(encoding="utf-8").split("\n\n==== FILE CONTENTS ====")[0]
+        self.assertEqual(streamed.stdout, structure + "\n")
+
+
+    @unittest.skipIf(sys.platform.startswith("win"), "path too long for Windows")
+    def test_export_deep_tree(self):
+        """
+        Verify that a tree deeper than the Python recursion limit is exported.
+        """
+        depth = 1100
+        deep_dir = self.root
+        for _ in range(depth):
+            deep_dir = deep_dir / "d"
+            deep_dir.mkdir()
+        (deep_dir / "bottom.txt").write_text("bottom")
+
+        out_path = self.root / "deep_export.txt"
+        result = self.run_gitree("--export", out_path.name, "--max-depth", str(depth + 1),
+            "--gitignore-depth", str(depth + 1), "--no-max-entries")
+
+        # Remove the dirs bottom up, the temp dir cleanup would hit the recursion limit too
+        (deep_dir / "bottom.txt").unlink()
+        while deep_dir != self.root:
+            deep_dir.rmdir()
+            deep_dir = deep_dir.parent
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        content = out_path.read_text(encoding="utf-8")
+        self.assertIn("bottom.txt", content)
+        self.assertIn("FILE: ", content)
+
+
+    def test_output_buffer_spills_past_high_water(self):
+        """
+        Verify that the output buffer keeps at most its high-water mark in memory,
+        and still gives back and writes out every line.
+        """
+        lines = [f"├─ line {i}" for i in range(1000)]
+
+        replay = OutputBuffer(sink=io.BytesIO(), high_water=256)
+        through = OutputBuffer(sink=io.BytesIO(), replay=False, high_water=256)
+        for line in lines:
+            replay.write(line)
+            through.write(line)
+
+        self.assertEqual(replay.get_value(), lines)
+        self.assertEqual(through.get_value()[-1], lines[-1])
+        self.assertLess(len(through.get_value()), len(lines))
+
+        for buffer in (replay, through):
+            buffer.flush()
+            self.assertEqual(buffer._sink.getvalue().decode("utf-8"), "\n".join(lines) + "\n")
+
+
+    def test_export_ndjson(self):
+        """
+        Verify that --format ndjson writes one JSON record per line, the items
+        of the tree first and then the content of every file.
+        """
+        (self.root / "src").mkdir()
+        (self.root / "src" / "main.py").write_text("print('hi')\n")
+
+        printed = self.run_gitree("--format", "ndjson")
+        self.assertEqual(printed.returncode, 0, msg=printed.stderr)
+        items = [json.loads(line) for line in printed.stdout.splitlines()]
+        self.assertEqual([(r["type"], r["depth"]) for r in items],
+            [("dir", 0), ("dir", 1), ("file", 2)])
+        self.assertEqual(items[-1]["size"], len("print('hi')\n"))
+
+        out_path = self.root / "tree_export.ndjson"
+        result = self.run_gitree("--export", out_path.name, "--format", "ndjson",
+            "--exclude", out_path.name)
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+
+        records = [json.loads(line) for line in
+            out_path.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual(records[:len(items)], items)
+        self.assertEqual(records[len(items):], [{"path": items[-1]["path"],
+            "type": "content", "content": "print('hi')\n"}])
+
+
+    def test_export_reads_files_in_tree_order(self):
+        """
+        Verify that the files read concurrently for --export are written in
+        the order of the tree, each with its own content.
+        """
+        names = []
+        for d in ("alpha", "beta", "gamma"):
+            (self.root / d).mkdir()
+            for i in range(12):
+                (self.root / d / f"f{i:02}.txt").write_text(f"content of {d}/{i}")
+                names.append(f"{d}/f{i:02}.txt")
+
+        out_path = self.root / "tree_export.txt"
+        result = self.run_gitree("--export", out_path.name, "--exclude", out_path.name,
+            "--no-max-entries", "--no-max-items", "--jobs", "4")
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+
+        blocks = out_path.read_text(encoding="utf-8").split("FILE: ")[1:]
+        exported = [(Path(block.split("\n")[0]).relative_to(self.root.resolve()).as_posix(),
+            block.split("\n")[2].strip()) for block in blocks]
+        self.assertEqual(exported, [(name, "content of " + name.split("/")[0] + "/"
+            + str(int(name[-6:-4]))) for name in names])
+
+
+    def test_export_reads_with_one_thread_for_jobs_1(self):
+        """
+        Verify that --jobs 1 reads the files for the export on a single thread,
+        while not giving --jobs reads them on several.
+        """
+        files = []
+        for i in range(32):
+            (self.root / f"f{i:02}.txt").write_text(f"content {i}")
+            files.append(self.root / f"f{i:02}.txt")
+
+        read_content = ExportService._read_content
+        for jobs, max_threads in ((1, 1), (None, 8)):
+            threads = set()
+            def reading(path, max_size_mb):
+                threads.add(threading.get_ident())
+                return read_content(path, max_size_mb)
+
+            config = types.SimpleNamespace(jobs=jobs, max_file_size=1.0)
+            with mock.patch.object(ExportService, "_read_content", side_effect=reading), \
+                mock.patch("gitree.services.export_service.ThreadPoolExecutor",
+                    wraps=ThreadPoolExecutor) as pool:
+                contents = [(path, content.text())
+                    for path, content in ExportService._iter_contents(config, files)]
+
+            self.assertEqual(pool.call_args.kwargs["max_workers"], max_threads)
+            self.assertLessEqual(len(threads), max_threads)
+            self.assertEqual(contents, [(path, f"content {i}") for i, path in enumerate(files)])
+
+
+    def test_export_file_contents(self):
+        """
+        Verify that --export writes the decoded text of small and memory-mapped
+        files, with universal newlines, and a placeholder for binary files.
+        """
+        (self.root / "crlf.txt").write_bytes(b"one\r\ntwo \xff\r\n\r\n")
+        (self.root / "large.txt").write_bytes(b"x" * (512 << 10) + "é\n".encode())
+        (self.root / "data.bin").write_bytes(b"\x00" * (300 << 10))
+
+        out_path = self.root / "tree_export.txt"
+        result = self.run_gitree("--export", out_path.name, "--exclude", out_path.name)
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+
+        blocks = {Path(block.split("\n")[0]).name: block.split("\n", 2)[2]
+            for block in out_path.read_text(encoding="utf-8").split("FILE: ")[1:]}
+        self.assertEqual(blocks["crlf.txt"].rstrip("\n"), "one\ntwo ")
+        self.assertEqual(blocks["large.txt"].rstrip("\n"), "x" * (512 << 10) + "é")
+        self.assertTrue(blocks["data.bin"].startswith("[binary file]"))
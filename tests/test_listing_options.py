@@ -1,4 +1,7 @@
 # tests/test_listing_flags.py
+import json, os, shutil, subprocess, sys, textwrap, unittest
+from unittest import mock
+
 from gitree.constants.constant import FILE_EMOJI, EMPTY_DIR_EMOJI, NORMAL_DIR_EMOJI
 from tests.base_setup import BaseCLISetup
 
@@ -110,6 +113,43 @@ class TestListingFlags(BaseCLISetup):
         )
 
 
+    def test_json_follows_drawn_order(self):
+        """
+        Verify that the JSON output lists the children in the order the tree
+        draws them, dirs first by default and files first with --files-first.
+        """
+        (self.root / "b_dir").mkdir()
+        (self.root / "b_dir" / "c.txt").write_text("data")
+        (self.root / "a.txt").write_text("data")
+
+        for args, expected in ((("--format", "json"), ["b_dir", "a.txt"]),
+            (("--format", "json", "--files-first"), ["a.txt", "b_dir"])):
+            result = self.run_gitree(*args, "--no-color")
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+
+            children = json.loads(result.stdout)["children"]
+            names = [os.path.basename(child["self"] if isinstance(child, dict) else child)
+                for child in children]
+            self.assertEqual(names, expected)
+
+
+    def test_json_compact(self):
+        """
+        Verify that --compact writes the same JSON tree on a single line.
+        """
+        (self.root / "b_dir" / "empty").mkdir(parents=True)
+        (self.root / "b_dir" / "c.txt").write_text("data")
+        (self.root / "a.txt").write_text("data")
+
+        result_indented = self.run_gitree("--format", "json")
+        result_compact = self.run_gitree("--format", "json", "--compact")
+
+        self.assertEqual(result_compact.returncode, 0, msg=result_compact.stderr)
+        self.assertEqual(result_compact.stdout.count("\n"), 1)
+        self.assertNotIn(" ", result_compact.stdout.replace(str(self.root), ""))
+        self.assertEqual(json.loads(result_compact.stdout), json.loads(result_indented.stdout))
+
+
     def test_include_overrides_gitignore(self):
         """
         Verify that the --include flag can override .gitignore rules,
@@ -121,3 +161,593 @@ class TestListingFlags(BaseCLISetup):
         (self.root / "error.log").write_text("log")
         (self.root / "data.json").write_text("{}")
 
+
+
+    def test_jobs(self):
+        """
+        Verify that the --jobs flag lists directories concurrently
+        without changing the output of the tree.
+        """
+        for d in ("alpha", "beta", "beta/gamma", "delta"):
+            (self.root / d).mkdir()
+            (self.root / d / "file.txt").write_text("data")
+
+        result_serial = self.run_gitree("--no-color")
+        result_jobs = self.run_gitree("--no-color", "--jobs", "4")
+
+        self.assertEqual(result_jobs.returncode, 0, msg=result_jobs.stderr)
+        self.assertIn("gamma", result_jobs.stdout)
+        self.assertEqual(result_serial.stdout, result_jobs.stdout)
+
+
+    def test_backend_asyncio(self):
+        """
+        Verify that the asyncio backend gives the same tree as the serial lister,
+        with dirs pruned by .gitignore after being read ahead, and with a walk
+        stopped early by --max-entries.
+        """
+        (self.root / ".gitignore").write_text("build/\n")
+        for d in ("alpha/one/two", "beta/gamma", "build/out/deep", "delta"):
+            (self.root / d).mkdir(parents=True)
+            (self.root / d / "file.txt").write_text("data")
+
+        for args in ([], ["--max-entries", "4"], ["--no-max-entries", "--max-depth", "9"]):
+            result_serial = self.run_gitree("--no-color", *args)
+            result_async = self.run_gitree("--no-color", "--backend", "asyncio", *args)
+
+            self.assertEqual(result_async.returncode, 0, msg=result_async.stderr)
+            self.assertEqual(result_serial.stdout, result_async.stdout)
+            self.assertNotIn("deep", result_async.stdout)
+
+
+    def test_cache(self):
+        """
+        Verify that --cache reuses the listing of unchanged dirs, and lists
+        a dir again once it changed.
+        """
+        for d in ("alpha", "beta"):
+            (self.root / d).mkdir()
+            (self.root / d / "file.txt").write_text("data")
+            os.utime(self.root / d, ns=(10**18, 10**18))   # Not changed recently
+
+        self.run_gitree("--no-color", "--cache")
+        cached = self.run_gitree("--no-color", "--cache", "--verbose")
+
+        self.assertEqual(cached.returncode, 0, msg=cached.stderr)
+        self.assertTrue((self.user_cache / "listing.json").exists())
+        self.assertFalse((self.root / ".gitree" / "cache" / "listing.json").exists())
+        self.assertRegex(cached.stdout, r"cache had [1-9]\d* hits")
+
+        (self.root / "alpha" / "new.txt").write_text("data")
+        os.utime(self.root / "alpha", ns=(2 * 10**18, 2 * 10**18))
+
+        relisted = self.run_gitree("--no-color", "--cache")
+        uncached = self.run_gitree("--no-color", "--cache", "--no-cache")
+
+        self.assertIn("new.txt", relisted.stdout)
+        self.assertEqual(relisted.stdout, uncached.stdout)
+
+
+    def test_cache_ignores_invalid_listings(self):
+        """
+        Verify that --cache lists the dirs again when the listing cache is not
+        valid, and never reads a listing cache from the working tree.
+        """
+        (self.root / "alpha").mkdir()
+        (self.root / "alpha" / "file.txt").write_text("data")
+        os.utime(self.root / "alpha", ns=(10**18, 10**18))
+        os.utime(self.root, ns=(10**18, 10**18))
+        self.user_cache.mkdir(parents=True)
+
+        root = os.path.realpath(self.root)
+        st = os.stat(root)
+        forged = json.dumps({"version": 1, "run": 0,
+            "dirs": {root: [st.st_mtime_ns, st.st_ino, 0, ["alpha", "zz"], [1, 2]]}})
+
+        # A forged listing in the working tree is not used
+        (self.root / ".gitree" / "cache").mkdir(parents=True)
+        (self.root / ".gitree" / "cache" / "listing.json").write_text(forged)
+        os.utime(self.root, ns=(10**18, 10**18))
+        result = self.run_gitree("--no-color", "--cache")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("file.txt", result.stdout)
+        self.assertNotIn("zz", result.stdout)
+
+        for content in ('{"version": 1, "run": 0, "dirs": {"%s": [1]}}' % root,
+            '{"version": 1, "run": "x", "dirs": {}}', json.dumps({"version": 1, "run": 0,
+            "dirs": {root: [st.st_mtime_ns, st.st_ino, 0, ["alpha", "zz"], [1]]}})):
+            (self.user_cache / "listing.json").write_text(content)
+            result = self.run_gitree("--no-color", "--cache")
+
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            self.assertIn("file.txt", result.stdout)
+            self.assertNotIn("zz", result.stdout)
+
+
+    def test_cache_recompiles_changed_gitignore(self):
+        """
+        Verify that --cache reuses the compiled rules of an unchanged .gitignore,
+        and applies the new rules once it changed.
+        """
+        (self.root / "keep.py").write_text("code")
+        (self.root / "skip.log").write_text("log")
+        (self.root / "skip.tmp").write_text("tmp")
+        gitignore = self.root / ".gitignore"
+        gitignore.write_text("*.log\n")
+        os.utime(gitignore, ns=(10**18, 10**18))   # Not changed recently
+
+        first = self.run_gitree("--no-color", "--cache")
+        second = self.run_gitree("--no-color", "--cache")
+
+        self.assertEqual(second.returncode, 0, msg=second.stderr)
+        self.assertTrue((self.user_cache / "gitignore.json").exists())
+        self.assertFalse((self.root / ".gitree" / "cache" / "gitignore.json").exists())
+        self.assertEqual(first.stdout, second.stdout)
+        self.assertNotIn("skip.log", second.stdout)
+        self.assertIn("skip.tmp", second.stdout)
+
+        gitignore.write_text("*.tmp\n")
+        os.utime(gitignore, ns=(2 * 10**18, 2 * 10**18))
+        changed = self.run_gitree("--no-color", "--cache")
+
+        self.assertIn("skip.log", changed.stdout)
+        self.assertNotIn("skip.tmp", changed.stdout)
+
+
+    def test_cache_ignores_invalid_cache_files(self):
+        """
+        Verify that --cache falls back to reading the files when a cache file
+        is not valid, or holds entries that do not fit.
+        """
+        (self.root / "keep.py").write_text("code")
+        (self.root / "skip.log").write_text("log")
+        gitignore = self.root / ".gitignore"
+        gitignore.write_text("*.log\n")
+        os.utime(gitignore, ns=(10**18, 10**18))
+        self.user_cache.mkdir(parents=True)
+
+        st = gitignore.stat()
+        key = os.path.realpath(gitignore)
+        for content in ("not json", "[]", json.dumps({"version": 2, "run": 0,
+            "files": {key: [st.st_size, st.st_mtime_ns, "bad"]},
+            "rules": {"bad": ["(?P<r0>.*)(", [True], 0]}}), json.dumps({"version": 2,
+            "run": 0, "files": {key: [st.st_size, st.st_mtime_ns, "other"]},
+            "rules": {"other": [".*", [True], 0]}})):
+            (self.user_cache / "gitignore.json").write_text(content)
+            result = self.run_gitree("--no-color", "--cache")
+
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            self.assertIn("keep.py", result.stdout)
+            self.assertNotIn("skip.log", result.stdout)
+
+
+    @unittest.skipIf(shutil.which("git") is None, "git is not installed")
+    def test_source_index(self):
+        """
+        Verify that --source index lists only the files tracked in the git index,
+        even ignored ones, and that --untracked adds the untracked files that
+        are not ignored.
+        """
+        (self.root / "src").mkdir()
+        (self.root / "src" / "tracked.py").write_text("code")
+        (self.root / "forced.log").write_text("log")
+        (self.root / "untracked.txt").write_text("text")
+        (self.root / "ignored.log").write_text("log")
+        (self.root / ".gitignore").write_text("*.log\n")
+
+        git = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        subprocess.run([*git, "init", "-q"], cwd=self.root, check=True)
+        subprocess.run([*git, "add", "src/tracked.py", ".gitignore"], cwd=self.root, check=True)
+        subprocess.run([*git, "add", "-f", "forced.log"], cwd=self.root, check=True)
+
+        tracked = self.run_gitree("--no-color", "--source", "index")
+        self.assertEqual(tracked.returncode, 0, msg=tracked.stderr)
+        self.assertIn("tracked.py", tracked.stdout)
+        self.assertIn("forced.log", tracked.stdout)
+        self.assertNotIn("untracked.txt", tracked.stdout)
+        self.assertNotIn("ignored.log", tracked.stdout)
+
+        with_untracked = self.run_gitree("--no-color", "--source", "index", "--untracked")
+        self.assertEqual(with_untracked.returncode, 0, msg=with_untracked.stderr)
+        self.assertIn("tracked.py", with_untracked.stdout)
+        self.assertIn("forced.log", with_untracked.stdout)
+        self.assertIn("untracked.txt", with_untracked.stdout)
+        self.assertNotIn("ignored.log", with_untracked.stdout)
+
+
+    @unittest.skipIf(shutil.which("git") is None, "git is not installed")
+    def test_source_index_submodule(self):
+        """
+        Verify that --source index shows a submodule as an empty dir, and that
+        --untracked does not list its files as untracked files of the checkout.
+        """
+        (self.root / "sm").mkdir()
+        (self.root / "sm" / "s.txt").write_text("text")
+        (self.root / "tracked.py").write_text("code")
+
+        git = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        subprocess.run([*git, "init", "-q"], cwd=self.root, check=True)
+        subprocess.run([*git, "add", "tracked.py"], cwd=self.root, check=True)
+        subprocess.run([*git, "update-index", "--add", "--cacheinfo",
+            "160000,1111111111111111111111111111111111111111,sm"], cwd=self.root, check=True)
+
+        for args in ((), ("--untracked",)):
+            result = self.run_gitree("--no-color", "--source", "index", *args)
+
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            self.assertIn("sm", result.stdout)
+            self.assertIn("tracked.py", result.stdout)
+            self.assertNotIn("s.txt", result.stdout)
+
+
+    @unittest.skipIf(shutil.which("git") is None, "git is not installed")
+    def test_source_index_cache(self):
+        """
+        Verify that --cache keeps the parsed git index in the user's cache dir,
+        and parses the index again when the cache file is not valid.
+        """
+        (self.root / "src").mkdir()
+        (self.root / "src" / "tracked.py").write_text("code")
+        (self.root / "untracked.txt").write_text("text")
+
+        git = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        subprocess.run([*git, "init", "-q"], cwd=self.root, check=True)
+        subprocess.run([*git, "add", "src/tracked.py"], cwd=self.root, check=True)
+        os.utime(self.root / ".git" / "index", ns=(10**18, 10**18))   # Not changed recently
+
+        first = self.run_gitree("--no-color", "--source", "index", "--cache")
+        self.assertEqual(first.returncode, 0, msg=first.stderr)
+        cache_files = list(self.user_cache.glob("index-*.json"))
+        self.assertEqual(len(cache_files), 1)
+        self.assertFalse((self.root / ".gitree" / "cache" / "index.json").exists())
+
+        key = json.loads(cache_files[0].read_text())["key"]
+        for content in ("not json", "[]", json.dumps({"version": 2, "key": key,
+            "paths": "src/tracked.py"}), json.dumps({"version": 2, "key": key,
+            "paths": "src/tracked.py\0untracked.txt", "modes": [33188, "33188"]})):
+            cache_files[0].write_text(content)
+            result = self.run_gitree("--no-color", "--source", "index", "--cache")
+
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            self.assertEqual(result.stdout, first.stdout)
+            self.assertIn("tracked.py", result.stdout)
+            self.assertNotIn("untracked.txt", result.stdout)
+
+
+    def test_git_exclude_files(self):
+        """
+        Verify that the rules of .git/info/exclude and of the global excludes file
+        (core.excludesFile) are applied, and that a .gitignore overrides them.
+        """
+        (self.root / ".git" / "info").mkdir(parents=True)
+        (self.root / ".git" / "info" / "exclude").write_text("local.txt\nkept.txt\n")
+        (self.root / "global_ignore").write_text("*.cache\n")
+        (self.root / "global_config").write_text(
+            f'[core]\n\texcludesFile = "{(self.root / "global_ignore").as_posix()}"\n')
+        (self.root / ".gitignore").write_text("!kept.txt\n")
+        (self.root / "sub").mkdir()
+        for name in ("local.txt", "kept.txt", "build.cache", "file.txt"):
+            (self.root / "sub" / name).write_text("data")
+
+        with mock.patch.dict(os.environ, {"GIT_CONFIG_GLOBAL": str(self.root / "global_config")}):
+            result = self.run_gitree("--no-color")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("file.txt", result.stdout)
+        self.assertIn("kept.txt", result.stdout)
+        self.assertNotIn("local.txt", result.stdout)
+        self.assertNotIn("build.cache", result.stdout)
+
+
+    def test_gitignore_checks_do_not_stat_entries(self):
+        """
+        Verify that checking the entries against the .gitignore rules does not touch
+        the disk: the number of lstat/readlink calls must not grow with the number
+        of entries walked.
+        """
+        (self.root / ".gitignore").write_text("*.log\n")
+        for i in range(10):
+            (self.root / "src" / f"pkg{i}").mkdir(parents=True)
+            for j in range(20):
+                (self.root / "src" / f"pkg{i}" / f"mod{j}.py").write_text("code")
+                (self.root / "src" / f"pkg{i}" / f"mod{j}.log").write_text("log")
+
+        # Count the calls made by the whole run, through a shim around the os functions
+        shim = textwrap.dedent("""
+            import os, sys
+            counts = {"lstat": 0, "readlink": 0}
+            def counting(name, func):
+                def wrapper(*args, **kwargs):
+                    counts[name] += 1
+                    return func(*args, **kwargs)
+                return wrapper
+            os.lstat = counting("lstat", os.lstat)
+            os.readlink = counting("readlink", os.readlink)
+            sys.argv = ["gitree", "--no-color", "--no-max-entries", "--no-max-items"]
+            from gitree.main import main
+            main()
+            print(counts["lstat"] + counts["readlink"], file=sys.stderr)
+        """)
+        result = subprocess.run([sys.executable, "-c", shim], cwd=self.root,
+            capture_output=True, text=True, encoding="utf-8")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("mod19.py", result.stdout)
+        self.assertNotIn("mod0.log", result.stdout)
+        self.assertLess(int(result.stderr.strip().splitlines()[-1]), 50)
+
+
+    @unittest.skipIf(sys.platform.startswith("win"), "symlinks need extra rights on Windows")
+    def test_follow_symlinks(self):
+        """
+        Verify that symlinked dirs are shown but not walked by default, and that
+        with --follow-symlinks a symlink loop is walked only once.
+        """
+        (self.root / "pkg" / "sub").mkdir(parents=True)
+        (self.root / "pkg" / "sub" / "file.txt").write_text("data")
+        os.symlink(self.root / "pkg", self.root / "pkg" / "sub" / "loop")
+        os.symlink(self.root / "pkg" / "sub", self.root / "link")
+
+        default = self.run_gitree("--no-color", "--no-max-entries", "--max-depth", "50")
+        self.assertEqual(default.returncode, 0, msg=default.stderr)
+        self.assertIn("loop", default.stdout)
+        self.assertIn("link", default.stdout)
+        self.assertEqual(default.stdout.count("file.txt"), 1)
+
+        followed = self.run_gitree("--no-color", "--no-max-entries", "--max-depth", "50",
+            "--follow-symlinks")
+        self.assertEqual(followed.returncode, 0, msg=followed.stderr)
+        self.assertEqual(followed.stdout.count("file.txt"), 1)
+        self.assertEqual(followed.stdout.count("sub"), 1)
+
+
+    @unittest.skipIf(not os.path.ismount("/proc"), "needs a /proc mount")
+    def test_one_file_system(self):
+        """
+        Verify that --one-file-system does not walk into a dir on another file system.
+        """
+        if os.stat("/proc").st_dev == os.stat(self.root).st_dev:
+            self.skipTest("/proc is on the same file system as the temp dir")
+
+        (self.root / "file.txt").write_text("data")
+        os.symlink("/proc", self.root / "proc")
+
+        result = self.run_gitree("--no-color", "--follow-symlinks", "--one-file-system",
+            "--verbose")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("file.txt", result.stdout)
+        self.assertNotIn("cpuinfo", result.stdout)
+        self.assertIn("skipped 1 dirs", result.stdout)
+
+
+    def test_glob_paths(self):
+        """
+        Verify that glob patterns given as paths only select the matched
+        files and the directories leading to them.
+        """
+        for d in ("src/pkg", "src/lib", "src/other", "docs"):
+            (self.root / d).mkdir(parents=True)
+        (self.root / "src" / "pkg" / "mod.py").write_text("code")
+        (self.root / "src" / "lib" / "util.py").write_text("code")
+        (self.root / "src" / "pkg" / "notes.txt").write_text("text")
+        (self.root / "src" / "other" / "data.json").write_text("{}")
+        (self.root / "docs" / "guide.py").write_text("code")
+
+        result = self.run_gitree("src/**/*.py", "--no-color")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("mod.py", result.stdout)
+        self.assertIn("util.py", result.stdout)
+        self.assertIn("pkg", result.stdout)
+        self.assertNotIn("notes.txt", result.stdout)
+        self.assertNotIn("other", result.stdout)
+        self.assertNotIn("guide.py", result.stdout)
+
+
+    def test_glob_paths_rooted_at_matches(self):
+        """
+        Verify that the tree is rooted at the common parent of the glob
+        matches, also when the first part of the pattern has a wildcard.
+        """
+        for d in ("src/lib", "src/pkg/sub", "docs"):
+            (self.root / d).mkdir(parents=True)
+        (self.root / "src" / "lib" / "util.py").write_text("code")
+        (self.root / "src" / "pkg" / "sub" / "mod.py").write_text("code")
+        (self.root / "docs" / "guide.md").write_text("text")
+
+        for pattern in ("src/**/*.py", "sr[c]/**/*.py", "s?c/*/**/*.py"):
+            result = self.run_gitree(pattern, "--format", "json", "--no-color")
+
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            tree = json.loads(result.stdout)
+            self.assertEqual(os.path.basename(tree["self"]), "src", msg=pattern)
+            self.assertEqual([os.path.basename(child["self"]) for child in tree["children"]],
+                ["lib", "pkg"], msg=pattern)
+
+
+    def test_glob_paths_rooted_at_matched_dir(self):
+        """
+        Verify that the tree is rooted at a matched dir when every other match
+        is under it.
+        """
+        (self.root / "tree" / "x" / "c.py" / "in").mkdir(parents=True)
+        (self.root / "tree" / "x" / "c.py" / "in" / "c.py").write_text("code")
+        (self.root / "tree" / "x" / "c.py" / "notes.txt").write_text("text")
+
+        result = self.run_gitree("**/c.py", "--format", "json", "--no-color")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        tree = json.loads(result.stdout)
+        self.assertEqual(os.path.relpath(tree["self"], os.path.realpath(self.root)),
+            os.path.join("tree", "x", "c.py"))
+        self.assertEqual([os.path.basename(child["self"]) for child in tree["children"]],
+            ["in"])
+
+
+    def test_unmatched_glob_does_not_widen_root(self):
+        """
+        Verify that a glob pattern without matches does not move the root of
+        the tree up to its base dir.
+        """
+        (self.root / "a").mkdir()
+        (self.root / "a" / "file.txt").write_text("data")
+        (self.root / "f").mkdir()
+        (self.root / "f" / "notes.txt").write_text("text")
+
+        result = self.run_gitree("a", "f/*.py", "--format", "json", "--no-color")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        tree = json.loads(result.stdout)
+        self.assertEqual(os.path.basename(tree["self"]), "a")
+        self.assertEqual([os.path.basename(child) for child in tree["children"]],
+            ["file.txt"])
+
+
+    def test_glob_paths_with_no_files(self):
+        """
+        Verify that the dirs leading to glob matches are still shown when the
+        matched files are left out with --no-files.
+        """
+        for d in ("src/lib", "src/pkg/sub", "src/other"):
+            (self.root / d).mkdir(parents=True)
+        (self.root / "src" / "lib" / "util.py").write_text("code")
+        (self.root / "src" / "pkg" / "sub" / "mod.py").write_text("code")
+        (self.root / "src" / "other" / "data.json").write_text("{}")
+
+        for patterns in (["src/**/*.py"], ["src/lib/*.py", "src/pkg/**/*.py"]):
+            result = self.run_gitree(*patterns, "--no-files", "--no-color")
+
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            for name in ("src", "lib", "pkg", "sub"):
+                self.assertIn(name, result.stdout)
+            self.assertNotIn("util.py", result.stdout)
+            self.assertNotIn("other", result.stdout)
+
+
+    def test_glob_paths_with_max_depth(self):
+        """
+        Verify that the dirs leading to glob matches are shown down to
+        --max-depth, even when the matches are below it.
+        """
+        for d in ("src/lib", "src/pkg/sub", "src/other"):
+            (self.root / d).mkdir(parents=True)
+        (self.root / "src" / "lib" / "util.py").write_text("code")
+        (self.root / "src" / "pkg" / "sub" / "mod.py").write_text("code")
+        (self.root / "src" / "other" / "data.json").write_text("{}")
+
+        result = self.run_gitree("src/**/*.py", "--max-depth", "1", "--no-color")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("lib", result.stdout)
+        self.assertIn("pkg", result.stdout)
+        self.assertNotIn("util.py", result.stdout)
+        self.assertNotIn("sub", result.stdout)
+        self.assertNotIn("other", result.stdout)
+
+        result = self.run_gitree("src/**/*.py", "--max-depth", "2", "--no-color")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("util.py", result.stdout)
+        self.assertIn("sub", result.stdout)
+        self.assertNotIn("mod.py", result.stdout)
+
+
+    def test_nested_gitignore_overrides_parent(self):
+        """
+        Verify that a nested .gitignore can re-include what a parent
+        .gitignore ignores, since the last matching rule wins like in git.
+        """
+        (self.root / ".gitignore").write_text("*.log\n/build\n")
+        (self.root / "app").mkdir()
+        (self.root / "app" / ".gitignore").write_text("!keep.log\n")
+        (self.root / "app" / "keep.log").write_text("kept")
+        (self.root / "app" / "drop.log").write_text("dropped")
+        (self.root / "app" / "build").mkdir()
+        (self.root / "app" / "build" / "out.txt").write_text("out")
+        (self.root / "build").mkdir()
+        (self.root / "build" / "gen.txt").write_text("gen")
+
+        result = self.run_gitree("--no-color")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("keep.log", result.stdout)
+        self.assertNotIn("drop.log", result.stdout)
+        self.assertIn("out.txt", result.stdout)
+        self.assertNotIn("gen.txt", result.stdout)
+
+
+    def test_sibling_gitignore_does_not_leak(self):
+        """
+        Verify that a .gitignore only applies to its own dir, and not to
+        sibling dirs visited after it.
+        """
+        (self.root / "aaa").mkdir()
+        (self.root / "aaa" / ".gitignore").write_text("*.txt\n")
+        (self.root / "aaa" / "hidden.txt").write_text("hidden")
+        (self.root / "bbb").mkdir()
+        (self.root / "bbb" / "shown.txt").write_text("shown")
+
+        result = self.run_gitree("--no-color")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertNotIn("hidden.txt", result.stdout)
+        self.assertIn("shown.txt", result.stdout)
+
+
+    def test_verbose_reports_pruned_dirs(self):
+        """
+        Verify that dirs rejected by gitignore or hidden rules are pruned,
+        never listed, and that --verbose reports the counters.
+        """
+        (self.root / ".gitignore").write_text("node_modules/\n")
+        (self.root / "node_modules" / "dep").mkdir(parents=True)
+        (self.root / "node_modules" / "dep" / "index.js").write_text("js")
+        (self.root / ".venv").mkdir()
+
+        result = self.run_gitree("--no-color", "--verbose")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertNotIn("index.js", result.stdout)
+        self.assertIn("listed 1 dirs", result.stdout)
+        self.assertRegex(result.stdout, r"pruned [1-9]\d* dirs")
+
+
+    def test_max_entries_stops_walk(self):
+        """
+        Verify that once --max-entries is reached the walk stops, and the
+        remaining dirs are never listed.
+        """
+        for i in range(30):
+            (self.root / f"dir{i:02d}" / "sub").mkdir(parents=True)
+            (self.root / f"dir{i:02d}" / "sub" / "file.txt").write_text("data")
+
+        result = self.run_gitree("--no-color", "--verbose", "--max-entries", "5")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("dir00", result.stdout)
+        self.assertNotIn("dir05", result.stdout)
+        self.assertRegex(result.stdout, r"listed [1-5] dirs")
+
+
+    def test_multiple_glob_paths_respect_gitignore(self):
+        """
+        Verify that several glob patterns are matched in one walk, and that
+        dirs ignored by a .gitignore are not expanded for them.
+        """
+        for d in ("src/pkg", "src/build"):
+            (self.root / d).mkdir(parents=True)
+        (self.root / "src" / ".gitignore").write_text("build/\n")
+        (self.root / "src" / "pkg" / "mod.py").write_text("code")
+        (self.root / "src" / "pkg" / "mod.pyi").write_text("stub")
+        (self.root / "src" / "pkg" / "notes.txt").write_text("text")
+        (self.root / "src" / "build" / "gen.py").write_text("code")
+
+        result = self.run_gitree("src/**/*.py", "src/**/*.pyi", "--no-color")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("mod.py", result.stdout)
+        self.assertIn("mod.pyi", result.stdout)
+        self.assertNotIn("notes.txt", result.stdout)
+        self.assertNotIn("gen.py", result.stdout)